@@ -4,7 +4,17 @@ Data types describing persons.
 
 from __future__ import annotations
 
-from typing import final, Iterable, MutableSequence, Iterator, TYPE_CHECKING
+from typing import (
+    final,
+    Iterable,
+    MutableSequence,
+    Iterator,
+    TYPE_CHECKING,
+    Sequence,
+    Literal,
+    Any,
+)
+from contextlib import suppress
 from urllib.parse import quote
 
 from typing_extensions import override
@@ -36,10 +46,21 @@ if TYPE_CHECKING:
     from betty.ancestry.citation import Citation
     from betty.ancestry.presence import Presence
     from betty.ancestry.gender import Gender
+    from collections.abc import MutableMapping
     from betty.project import Project
     from betty.serde.dump import DumpMapping, Dump
 
 
+class _Lineage(BidirectionalToMany["Person", "Person"]):
+    """
+    A parent-child association that invalidates the affected cached ancestors and descendants when it changes.
+    """
+
+    @override
+    def associates_changed(self, owner: Person) -> None:
+        owner._invalidate_lineage(self.owner_attr_name)
+
+
 @final
 class Person(
     ShorthandPluginBase,
@@ -58,14 +79,14 @@ class Person(
     _plugin_id = "person"
     _plugin_label = _("Person")
 
-    parents = BidirectionalToMany["Person", "Person"](
+    parents = _Lineage(
         "betty.ancestry.person:Person",
         "parents",
         "betty.ancestry.person:Person",
         "children",
         title="Parents",
     )
-    children = BidirectionalToMany["Person", "Person"](
+    children = _Lineage(
         "betty.ancestry.person:Person",
         "children",
         "betty.ancestry.person:Person",
@@ -119,6 +140,13 @@ class Person(
             public=public,
             private=private,
         )
+        self._lineages: MutableMapping[str, Sequence[tuple[Person, int]]] = {}
+        # The people whose cached lineages include this person, and must be invalidated when this person's
+        # relatives change.
+        self._lineage_dependents: MutableMapping[str, MutableMapping[int, Person]] = {
+            "parents": {},
+            "children": {},
+        }
         if children is not None:
             self.children = children
         if parents is not None:
@@ -134,14 +162,32 @@ class Person(
     def plugin_label_plural(cls) -> Localizable:
         return _("People")
 
+    def __getstate__(self) -> Any:
+        # Do not copy cached lineages, which would pull in the people they refer to.
+        return {
+            **self.__dict__,
+            "_lineages": {},
+            "_lineage_dependents": {"parents": {}, "children": {}},
+        }
+
     @property
     def ancestors(self) -> Iterator[Person]:
         """
         All ancestors.
+
+        Each ancestor is yielded once, closest generations first.
         """
-        for parent in self.parents:
-            yield parent
-            yield from parent.ancestors
+        for ancestor, _generation in self.ancestors_by_generation:
+            yield ancestor
+
+    @property
+    def ancestors_by_generation(self) -> Sequence[tuple[Person, int]]:
+        """
+        All ancestors, with the number of generations between them and this person.
+
+        Each ancestor is included once, at the closest generation at which they appear, closest generations first.
+        """
+        return self._lineage("parents")
 
     @property
     def siblings(self) -> Iterator[Person]:
@@ -159,10 +205,60 @@ class Person(
     def descendants(self) -> Iterator[Person]:
         """
         All descendants.
+
+        Each descendant is yielded once, closest generations first.
+        """
+        for descendant, _generation in self.descendants_by_generation:
+            yield descendant
+
+    @property
+    def descendants_by_generation(self) -> Sequence[tuple[Person, int]]:
         """
-        for child in self.children:
-            yield child
-            yield from child.descendants
+        All descendants, with the number of generations between this person and them.
+
+        Each descendant is included once, at the closest generation at which they appear, closest generations first.
+        """
+        return self._lineage("children")
+
+    def _lineage(
+        self, relatives_attr_name: Literal["parents", "children"]
+    ) -> Sequence[tuple[Person, int]]:
+        with suppress(KeyError):
+            return self._lineages[relatives_attr_name]
+
+        # Traverse the lineage breadth-first, so relatives are found at their closest generation, and pedigree
+        # collapse and cycles do not cause anyone to be visited more than once.
+        lineage = []
+        seen = {id(self)}
+        generation_people: Sequence[Person] = [self]
+        generation = 0
+        while generation_people:
+            generation += 1
+            next_generation_people = []
+            for person in generation_people:
+                relatives = (
+                    person.parents
+                    if relatives_attr_name == "parents"
+                    else person.children
+                )
+                for relative in relatives:
+                    if id(relative) in seen:
+                        continue
+                    seen.add(id(relative))
+                    lineage.append((relative, generation))
+                    next_generation_people.append(relative)
+            generation_people = next_generation_people
+        for relative, __ in lineage:
+            relative._lineage_dependents[relatives_attr_name][id(self)] = self
+        self._lineages[relatives_attr_name] = lineage
+        return lineage
+
+    def _invalidate_lineage(self, relatives_attr_name: str) -> None:
+        self._lineages.pop(relatives_attr_name, None)
+        dependents = self._lineage_dependents[relatives_attr_name]
+        for dependent in dependents.values():
+            dependent._lineages.pop(relatives_attr_name, None)
+        dependents.clear()
 
     @override
     @property
@@ -18,9 +18,10 @@ from betty.app.factory import AppDependentFactory
 from betty.assets import AssetRepository
 from betty.cache.file import BinaryFileCache, PickledFileCache
 from betty.cache.no_op import NoOpCache
+from betty.cache.sqlite import SqliteCache
 from betty.concurrent import AsynchronizedLock
 from betty.config import Configurable, assert_configuration_file
-from betty.core import CoreComponent
+from betty.core import CoreComponent, Shutdownable
 from betty.factory import new, TargetFactory
 from betty.fetch import Fetcher, http
 from betty.fetch.static import StaticFetcher
@@ -41,10 +42,37 @@ if TYPE_CHECKING:
 _T = TypeVar("_T")
 
 
+def _new_persistent_cache(app: App) -> Cache[Any]:
+    if app.configuration.cache_backend == "sqlite":
+        return SqliteCache[Any](app.cache_directory_path / "cache.sqlite")
+    return PickledFileCache[Any](app.cache_directory_path)
+
+
+def _new_no_op_cache(app: App) -> Cache[Any]:
+    return NoOpCache()
+
+
+def _new_app(
+    configuration: AppConfiguration,
+    cache_directory_path: Path,
+    cache_factory: Callable[[App], Cache[Any]],
+    fetcher: Fetcher | None,
+) -> App:
+    return App(
+        configuration,
+        cache_directory_path,
+        cache_factory=cache_factory,
+        fetcher=fetcher,
+    )
+
+
 @final
 class App(Configurable[AppConfiguration], TargetFactory[Any], CoreComponent):
     """
     The Betty application.
+
+    Applications can be pickled, e.g. to send them to other processes. Unpickling an application creates a new,
+    unbootstrapped application with the same configuration, cache, and fetcher.
     """
 
     def __init__(
@@ -63,6 +91,7 @@ class App(Configurable[AppConfiguration], TargetFactory[Any], CoreComponent):
         self._localizers: LocalizerRepository | None = None
         self._http_client: aiohttp.ClientSession | None = None
         self._http_client_lock = AsynchronizedLock.threading()
+        self._initial_fetcher = fetcher
         self._fetcher = fetcher
         self._fetcher_lock = AsynchronizedLock.threading()
         self._cache_directory_path = cache_directory_path
@@ -73,6 +102,14 @@ class App(Configurable[AppConfiguration], TargetFactory[Any], CoreComponent):
         self._spdx_licenses: PluginRepository[License] | None = None
         self._spdx_licenses_lock = AsynchronizedLock.threading()
 
+    def __reduce__(self) -> Any:
+        return _new_app, (
+            self.configuration,
+            self._cache_directory_path,
+            self._cache_factory,
+            self._initial_fetcher,
+        )
+
     @classmethod
     @asynccontextmanager
     async def new_from_environment(cls) -> AsyncIterator[Self]:
@@ -87,7 +124,7 @@ class App(Configurable[AppConfiguration], TargetFactory[Any], CoreComponent):
         yield cls(
             configuration,
             Path(environ.get("BETTY_CACHE_DIRECTORY", HOME_DIRECTORY_PATH / "cache")),
-            cache_factory=lambda app: PickledFileCache[Any](app._cache_directory_path),
+            cache_factory=_new_persistent_cache,
         )
 
     @classmethod
@@ -107,7 +144,7 @@ class App(Configurable[AppConfiguration], TargetFactory[Any], CoreComponent):
             yield cls(
                 AppConfiguration(),
                 Path(cache_directory_path_str),
-                cache_factory=lambda app: NoOpCache(),
+                cache_factory=_new_no_op_cache,
                 fetcher=fetcher or StaticFetcher(),
             )
 
@@ -159,7 +196,11 @@ class App(Configurable[AppConfiguration], TargetFactory[Any], CoreComponent):
             if self._http_client is None:
                 self.assert_bootstrapped()
                 self._http_client = aiohttp.ClientSession(
-                    connector=aiohttp.TCPConnector(limit_per_host=5),
+                    connector=aiohttp.TCPConnector(
+                        limit_per_host=5,
+                        # Requests are spread over many hosts, so cache their DNS lookups for longer.
+                        ttl_dns_cache=600,
+                    ),
                     headers={
                         "User-Agent": "Betty (https://betty.readthedocs.io/)",
                     },
@@ -182,11 +223,14 @@ class App(Configurable[AppConfiguration], TargetFactory[Any], CoreComponent):
         async with self._fetcher_lock:
             if self._fetcher is None:
                 self.assert_bootstrapped()
-                self._fetcher = http.HttpFetcher(
+                fetcher = http.HttpFetcher(
                     await self.http_client,
                     self.cache.with_scope("fetch"),
                     self.binary_file_cache.with_scope("fetch"),
+                    stale_while_revalidate=True,
                 )
+                self._shutdown_stack.append(fetcher)
+                self._fetcher = fetcher
         return self._fetcher
 
     @property
@@ -197,8 +241,17 @@ class App(Configurable[AppConfiguration], TargetFactory[Any], CoreComponent):
         if self._cache is None:
             self.assert_bootstrapped()
             self._cache = self._cache_factory(self)
+            if isinstance(self._cache, Shutdownable):
+                self._shutdown_stack.append(self._cache)
         return self._cache
 
+    @property
+    def cache_directory_path(self) -> Path:
+        """
+        The path to the cache directory.
+        """
+        return self._cache_directory_path
+
     @property
     def binary_file_cache(self) -> BinaryFileCache:
         """
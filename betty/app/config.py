@@ -16,13 +16,20 @@ from betty.assertion import (
     assert_setattr,
     assert_locale,
 )
+from betty.assertion.error import AssertionFailed
 from betty.config import Configuration
+from betty.locale.localizable import do_you_mean
 
 if TYPE_CHECKING:
     from betty.serde.dump import Dump, DumpMapping
 
 CONFIGURATION_FILE_PATH = fs.HOME_DIRECTORY_PATH / "app.json"
 
+CACHE_BACKENDS = ("file", "sqlite")
+"""
+The available persistent cache backends.
+"""
+
 
 @final
 class AppConfiguration(Configuration):
@@ -34,9 +41,11 @@ class AppConfiguration(Configuration):
         self,
         *,
         locale: str | None = None,
+        cache_backend: str = "file",
     ):
         super().__init__()
         self._locale: str | None = locale
+        self._cache_backend = self._assert_cache_backend(cache_backend)
 
     @property
     def locale(self) -> str | None:
@@ -49,12 +58,37 @@ class AppConfiguration(Configuration):
     def locale(self, locale: str) -> None:
         self._locale = assert_locale()(locale)
 
+    @property
+    def cache_backend(self) -> str:
+        """
+        The persistent cache backend.
+
+        This is one of :py:const:`betty.app.config.CACHE_BACKENDS`. ``file`` stores each cache item in its own file,
+        and ``sqlite`` stores all cache items in a single SQLite database.
+        """
+        return self._cache_backend
+
+    @cache_backend.setter
+    def cache_backend(self, cache_backend: str) -> None:
+        self._cache_backend = self._assert_cache_backend(cache_backend)
+
+    @staticmethod
+    def _assert_cache_backend(cache_backend: str) -> str:
+        if cache_backend not in CACHE_BACKENDS:
+            raise AssertionFailed(
+                do_you_mean(*(f'"{backend}"' for backend in CACHE_BACKENDS))
+            )
+        return cache_backend
+
     @override
     def load(self, dump: Dump) -> None:
         assert_record(
-            OptionalField("locale", assert_str() | assert_setattr(self, "locale"))
+            OptionalField("locale", assert_str() | assert_setattr(self, "locale")),
+            OptionalField(
+                "cache_backend", assert_str() | assert_setattr(self, "cache_backend")
+            ),
         )(dump)
 
     @override
     def dump(self) -> DumpMapping[Dump]:
-        return {"locale": self.locale}
+        return {"locale": self.locale, "cache_backend": self.cache_backend}
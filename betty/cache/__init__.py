@@ -5,10 +5,23 @@ Provide the Cache API.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from collections.abc import Awaitable, Callable
-from typing import Self, Generic, TypeAlias, AsyncContextManager, overload, Literal
+from collections.abc import Awaitable, Callable, Mapping, Iterable, AsyncIterator
+from contextlib import asynccontextmanager, AsyncExitStack
+from threading import Lock
+from typing import (
+    Self,
+    Generic,
+    TypeAlias,
+    AsyncContextManager,
+    overload,
+    Literal,
+    final,
+)
 
-from typing_extensions import TypeVar
+from typing_extensions import TypeVar, override
+
+from betty.serde.dump import Dumpable, DumpMapping, Dump
+from betty.typing import threadsafe
 
 
 _CacheItemValueT = TypeVar("_CacheItemValueT")
@@ -40,6 +53,118 @@ class CacheItem(Generic[_CacheItemValueCoT], ABC):
 CacheItemValueSetter: TypeAlias = Callable[[_CacheItemValueT], Awaitable[None]]
 
 
+CacheItemValuesSetter: TypeAlias = Callable[
+    [Mapping[str, _CacheItemValueT]], Awaitable[None]
+]
+
+
+@final
+@threadsafe
+class CacheMetrics(Dumpable):
+    """
+    Count how a single cache scope performs.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._sets = 0
+        self._evictions = 0
+        self._bytes_read = 0
+        self._bytes_written = 0
+        self._lock_wait_time = 0.0
+
+    @property
+    def hits(self) -> int:
+        """
+        The number of cache items that were requested and found.
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        The number of cache items that were requested but not found.
+        """
+        return self._misses
+
+    @property
+    def sets(self) -> int:
+        """
+        The number of cache items that were added or updated.
+        """
+        return self._sets
+
+    @property
+    def evictions(self) -> int:
+        """
+        The number of cache items the cache removed by itself, such as to stay within its bounds.
+        """
+        return self._evictions
+
+    @property
+    def bytes_read(self) -> int:
+        """
+        The number of bytes read from storage.
+
+        This is zero for caches that do not serialize values, such as :py:class:`betty.cache.memory.MemoryCache`.
+        """
+        return self._bytes_read
+
+    @property
+    def bytes_written(self) -> int:
+        """
+        The number of bytes written to storage.
+
+        This is zero for caches that do not serialize values, such as :py:class:`betty.cache.memory.MemoryCache`.
+        """
+        return self._bytes_written
+
+    @property
+    def lock_wait_time(self) -> float:
+        """
+        The total time spent waiting for cache items to be unlocked, in seconds.
+        """
+        return self._lock_wait_time
+
+    def record(
+        self,
+        *,
+        hits: int = 0,
+        misses: int = 0,
+        sets: int = 0,
+        evictions: int = 0,
+        bytes_read: int = 0,
+        bytes_written: int = 0,
+        lock_wait_time: float = 0.0,
+    ) -> None:
+        """
+        Add to the counters.
+        """
+        with self._lock:
+            self._hits += hits
+            self._misses += misses
+            self._sets += sets
+            self._evictions += evictions
+            self._bytes_read += bytes_read
+            self._bytes_written += bytes_written
+            self._lock_wait_time += lock_wait_time
+
+    @override
+    def dump(self) -> DumpMapping[Dump]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "sets": self._sets,
+                "evictions": self._evictions,
+                "bytes_read": self._bytes_read,
+                "bytes_written": self._bytes_written,
+                "lock_wait_time": self._lock_wait_time,
+            }
+
+
 class Cache(Generic[_CacheItemValueContraT], ABC):
     """
     Provide a cache.
@@ -126,9 +251,95 @@ class Cache(Generic[_CacheItemValueContraT], ABC):
         """
         pass
 
+    async def get_many(
+        self, cache_item_ids: Iterable[str]
+    ) -> Mapping[str, CacheItem[_CacheItemValueContraT]]:
+        """
+        Get the cache items with the given IDs.
+
+        Implementations SHOULD override this to get the cache items more efficiently than one by one.
+
+        :return: The cache items that could be found, keyed by their IDs.
+        """
+        cache_items = {}
+        for cache_item_id in dict.fromkeys(cache_item_ids):
+            async with self.get(cache_item_id) as cache_item:
+                if cache_item is not None:
+                    cache_items[cache_item_id] = cache_item
+        return cache_items
+
+    async def set_many(
+        self,
+        values: Mapping[str, _CacheItemValueContraT],
+        *,
+        modified: int | float | None = None,
+    ) -> None:
+        """
+        Add or update multiple cache items.
+
+        Implementations SHOULD override this to set the cache items more efficiently than one by one.
+
+        :param values: The cache items' values, keyed by the cache items' IDs.
+        """
+        for cache_item_id, value in values.items():
+            await self.set(cache_item_id, value, modified=modified)
+
+    @asynccontextmanager
+    async def getset_many(
+        self, cache_item_ids: Iterable[str]
+    ) -> AsyncIterator[
+        tuple[
+            Mapping[str, CacheItem[_CacheItemValueContraT]],
+            CacheItemValuesSetter[_CacheItemValueContraT],
+        ]
+    ]:
+        """
+        Get the cache items with the given IDs, and provide a setter to add or update them within the same atomic operation.
+
+        Implementations SHOULD override this to get and set the cache items more efficiently than one by one.
+
+        Return:
+        0. The cache items that could be found, keyed by their IDs.
+        1. An asynchronous setter that takes the values of any of the given cache items, keyed by their IDs.
+        """
+        cache_items = {}
+        setters = {}
+        async with AsyncExitStack() as stack:
+            # Acquire the cache items in a consistent order, so concurrent calls cannot deadlock.
+            for cache_item_id in sorted(set(cache_item_ids)):
+                cache_item, setters[cache_item_id] = await stack.enter_async_context(
+                    self.getset(cache_item_id)
+                )
+                if cache_item is not None:
+                    cache_items[cache_item_id] = cache_item
+
+            async def _setter(values: Mapping[str, _CacheItemValueContraT]) -> None:
+                for cache_item_id, value in values.items():
+                    await setters[cache_item_id](value)
+
+            yield cache_items, _setter
+
+    async def delete_many(self, cache_item_ids: Iterable[str]) -> None:
+        """
+        Delete the cache items with the given IDs.
+
+        Implementations SHOULD override this to delete the cache items more efficiently than one by one.
+        """
+        for cache_item_id in dict.fromkeys(cache_item_ids):
+            await self.delete(cache_item_id)
+
     @abstractmethod
     async def clear(self) -> None:
         """
         Clear all items from the cache.
         """
         pass
+
+    def metrics(self) -> Mapping[str, CacheMetrics]:
+        """
+        Get the metrics for this cache, and for the nested caches created from it.
+
+        :return: The metrics keyed by the scopes relative to this cache, joined by slashes. The metrics for this cache
+            itself are keyed by an empty string. Caches that do not collect metrics return an empty mapping.
+        """
+        return {}
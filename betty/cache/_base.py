@@ -1,11 +1,24 @@
 from abc import abstractmethod
-from collections.abc import Sequence, MutableMapping, AsyncIterator
+from collections.abc import (
+    Sequence,
+    MutableMapping,
+    AsyncIterator,
+    Iterable,
+    Mapping,
+)
 from contextlib import asynccontextmanager
 from datetime import datetime
+from time import perf_counter
 from typing import Generic, Self, overload, AsyncContextManager, Literal, TypeVar
 
-from betty.cache import Cache, CacheItem, CacheItemValueSetter
-from betty.concurrent import AsynchronizedLock, Ledger
+from betty.cache import (
+    Cache,
+    CacheItem,
+    CacheItemValueSetter,
+    CacheItemValuesSetter,
+    CacheMetrics,
+)
+from betty.concurrent import AsynchronizedLock, Ledger, Lock
 from typing_extensions import override
 
 _CacheItemValueCoT = TypeVar("_CacheItemValueCoT", covariant=True)
@@ -43,6 +56,7 @@ class _CommonCacheBase(Cache[_CacheItemValueContraT], Generic[_CacheItemValueCon
         self._scoped_caches: MutableMapping[str, Self] = {}
         self._cache_lock = AsynchronizedLock.threading()
         self._cache_item_lock_ledger = Ledger(self._cache_lock)
+        self._metrics = CacheMetrics()
 
     @override
     def with_scope(self, scope: str) -> Self:
@@ -56,13 +70,57 @@ class _CommonCacheBase(Cache[_CacheItemValueContraT], Generic[_CacheItemValueCon
     def _with_scope(self, scope: str) -> Self:
         pass
 
+    @override
+    def metrics(self) -> Mapping[str, CacheMetrics]:
+        metrics = {"": self._metrics}
+        for scope, scoped_cache in list(self._scoped_caches.items()):
+            for nested_scope, scoped_metrics in scoped_cache.metrics().items():
+                metrics[f"{scope}/{nested_scope}" if nested_scope else scope] = (
+                    scoped_metrics
+                )
+        return metrics
+
+    async def _acquire(self, lock: Lock, *, wait: bool = True) -> bool:
+        started = perf_counter()
+        acquired = await lock.acquire(wait=wait)
+        self._metrics.record(lock_wait_time=perf_counter() - started)
+        return acquired
+
+    @asynccontextmanager
+    async def _ledger(self, cache_item_ids: Iterable[str]) -> AsyncIterator[None]:
+        lock = self._cache_item_lock_ledger.ledger_many(cache_item_ids)
+        await self._acquire(lock)
+        try:
+            yield
+        finally:
+            await lock.release()
+
+    async def _get_measured(
+        self, cache_item_id: str
+    ) -> CacheItem[_CacheItemValueContraT] | None:
+        cache_item = await self._get(cache_item_id)
+        if cache_item is None:
+            self._metrics.record(misses=1)
+        else:
+            self._metrics.record(hits=1)
+        return cache_item
+
+    async def _get_many_measured(
+        self, cache_item_ids: Sequence[str]
+    ) -> Mapping[str, CacheItem[_CacheItemValueContraT]]:
+        cache_items = await self._get_many(cache_item_ids)
+        self._metrics.record(
+            hits=len(cache_items), misses=len(cache_item_ids) - len(cache_items)
+        )
+        return cache_items
+
     @override
     @asynccontextmanager
     async def get(
         self, cache_item_id: str
     ) -> AsyncIterator[CacheItem[_CacheItemValueContraT] | None]:
-        async with self._cache_item_lock_ledger.ledger(cache_item_id):
-            yield await self._get(cache_item_id)
+        async with self._ledger((cache_item_id,)):
+            yield await self._get_measured(cache_item_id)
 
     @abstractmethod
     async def _get(
@@ -78,8 +136,9 @@ class _CommonCacheBase(Cache[_CacheItemValueContraT], Generic[_CacheItemValueCon
         *,
         modified: int | float | None = None,
     ) -> None:
-        async with self._cache_item_lock_ledger.ledger(cache_item_id):
+        async with self._ledger((cache_item_id,)):
             await self._set(cache_item_id, value, modified=modified)
+        self._metrics.record(sets=1)
 
     @abstractmethod
     async def _set(
@@ -123,27 +182,101 @@ class _CommonCacheBase(Cache[_CacheItemValueContraT], Generic[_CacheItemValueCon
         ]
     ]:
         lock = self._cache_item_lock_ledger.ledger(cache_item_id)
-        if await lock.acquire(wait=wait):
+        if await self._acquire(lock, wait=wait):
             try:
 
                 async def _setter(value: _CacheItemValueContraT) -> None:
                     await self._set(cache_item_id, value)
+                    self._metrics.record(sets=1)
 
-                yield await self._get(cache_item_id), _setter
+                yield await self._get_measured(cache_item_id), _setter
                 return
             finally:
                 await lock.release()
         yield None, None
 
+    @override
+    async def get_many(
+        self, cache_item_ids: Iterable[str]
+    ) -> Mapping[str, CacheItem[_CacheItemValueContraT]]:
+        cache_item_ids = tuple(dict.fromkeys(cache_item_ids))
+        async with self._ledger(cache_item_ids):
+            cache_items = await self._get_many_measured(cache_item_ids)
+        return cache_items
+
+    async def _get_many(
+        self, cache_item_ids: Sequence[str]
+    ) -> Mapping[str, CacheItem[_CacheItemValueContraT]]:
+        cache_items = {}
+        for cache_item_id in cache_item_ids:
+            cache_item = await self._get(cache_item_id)
+            if cache_item is not None:
+                cache_items[cache_item_id] = cache_item
+        return cache_items
+
+    @override
+    async def set_many(
+        self,
+        values: Mapping[str, _CacheItemValueContraT],
+        *,
+        modified: int | float | None = None,
+    ) -> None:
+        async with self._ledger(values):
+            await self._set_many(values, modified=modified)
+        self._metrics.record(sets=len(values))
+
+    async def _set_many(
+        self,
+        values: Mapping[str, _CacheItemValueContraT],
+        *,
+        modified: int | float | None = None,
+    ) -> None:
+        for cache_item_id, value in values.items():
+            await self._set(cache_item_id, value, modified=modified)
+
+    @override
+    @asynccontextmanager
+    async def getset_many(
+        self, cache_item_ids: Iterable[str]
+    ) -> AsyncIterator[
+        tuple[
+            Mapping[str, CacheItem[_CacheItemValueContraT]],
+            CacheItemValuesSetter[_CacheItemValueContraT],
+        ]
+    ]:
+        cache_item_ids = tuple(dict.fromkeys(cache_item_ids))
+        async with self._ledger(cache_item_ids):
+
+            async def _setter(values: Mapping[str, _CacheItemValueContraT]) -> None:
+                unknown_cache_item_ids = values.keys() - set(cache_item_ids)
+                if unknown_cache_item_ids:
+                    raise ValueError(
+                        f"Cannot set cache items {', '.join(unknown_cache_item_ids)}, because they were not acquired."
+                    )
+                await self._set_many(values)
+                self._metrics.record(sets=len(values))
+
+            yield await self._get_many_measured(cache_item_ids), _setter
+
     @override
     async def delete(self, cache_item_id: str) -> None:
-        async with self._cache_item_lock_ledger.ledger(cache_item_id):
+        async with self._ledger((cache_item_id,)):
             await self._delete(cache_item_id)
 
     @abstractmethod
     async def _delete(self, cache_item_id: str) -> None:
         pass
 
+    @override
+    async def delete_many(self, cache_item_ids: Iterable[str]) -> None:
+        cache_item_ids = tuple(dict.fromkeys(cache_item_ids))
+        async with self._ledger(cache_item_ids):
+            await self._delete_many(cache_item_ids)
+
+    async def _delete_many(self, cache_item_ids: Sequence[str]) -> None:
+        for cache_item_id in cache_item_ids:
+            await self._delete(cache_item_id)
+
     @override
     async def clear(self) -> None:
         async with self._cache_lock:
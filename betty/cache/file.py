@@ -16,14 +16,14 @@ import aiofiles
 from aiofiles.ospath import getmtime
 from typing_extensions import override
 
-from betty.cache import CacheItem
+from betty.cache import CacheItem, CacheMetrics
 from betty.cache._base import _CommonCacheBase
 from betty.hashid import hashid
 from betty.typing import threadsafe
 
 if TYPE_CHECKING:
     from pathlib import Path
-    from collections.abc import Sequence
+    from collections.abc import Sequence, Mapping
 
 
 _CacheItemValueCoT = TypeVar("_CacheItemValueCoT", covariant=True)
@@ -31,15 +31,17 @@ _CacheItemValueContraT = TypeVar("_CacheItemValueContraT", contravariant=True)
 
 
 class _FileCacheItem(CacheItem[_CacheItemValueCoT], Generic[_CacheItemValueCoT]):
-    __slots__ = "_modified", "_path"
+    __slots__ = "_metrics", "_modified", "_path"
 
     def __init__(
         self,
         modified: int | float,
         path: Path,
+        metrics: CacheMetrics,
     ):
         self._modified = modified
         self._path = path
+        self._metrics = metrics
 
     @override
     @property
@@ -50,6 +52,7 @@ class _FileCacheItem(CacheItem[_CacheItemValueCoT], Generic[_CacheItemValueCoT])
     async def value(self) -> _CacheItemValueCoT:
         async with aiofiles.open(self._path, "rb") as f:
             value_bytes = await f.read()
+        self._metrics.record(bytes_read=len(value_bytes))
         return await self._load_value(value_bytes)
 
     @abstractmethod
@@ -111,10 +114,33 @@ class _FileCache(
             return self._cache_item_cls(
                 await getmtime(cache_item_file_path),
                 cache_item_file_path,
+                self._metrics,
             )
         except OSError:
             return None
 
+    @override
+    async def _get_many(
+        self, cache_item_ids: Sequence[str]
+    ) -> Mapping[str, CacheItem[_CacheItemValueContraT]]:
+        # Check all cache items from a single thread, rather than from a thread per cache item.
+        return await asyncio.to_thread(self._get_many_sync, cache_item_ids)
+
+    def _get_many_sync(
+        self, cache_item_ids: Sequence[str]
+    ) -> Mapping[str, CacheItem[_CacheItemValueContraT]]:
+        cache_items = {}
+        for cache_item_id in cache_item_ids:
+            cache_item_file_path = self._cache_item_file_path(cache_item_id)
+            try:
+                modified = cache_item_file_path.stat().st_mtime
+            except OSError:
+                continue
+            cache_items[cache_item_id] = self._cache_item_cls(
+                modified, cache_item_file_path, self._metrics
+            )
+        return cache_items
+
     @override
     async def _set(
         self,
@@ -139,14 +165,48 @@ class _FileCache(
     ) -> None:
         async with aiofiles.open(cache_item_file_path, "wb") as f:
             await f.write(value)
+        self._metrics.record(bytes_written=len(value))
         if modified is not None:
             await asyncio.to_thread(utime, cache_item_file_path, (modified, modified))
 
+    @override
+    async def _set_many(
+        self,
+        values: Mapping[str, _CacheItemValueContraT],
+        *,
+        modified: int | float | None = None,
+    ) -> None:
+        await asyncio.to_thread(
+            self._write_many,
+            {
+                self._cache_item_file_path(cache_item_id): self._dump_value(value)
+                for cache_item_id, value in values.items()
+            },
+            modified,
+        )
+
+    def _write_many(
+        self, values: Mapping[Path, bytes], modified: int | float | None
+    ) -> None:
+        self._path.mkdir(parents=True, exist_ok=True)
+        for cache_item_file_path, value in values.items():
+            self._metrics.record(bytes_written=cache_item_file_path.write_bytes(value))
+            if modified is not None:
+                utime(cache_item_file_path, (modified, modified))
+
     @override
     async def _delete(self, cache_item_id: str) -> None:
         with suppress(FileNotFoundError):
             await aiofiles.os.remove(self._cache_item_file_path(cache_item_id))
 
+    @override
+    async def _delete_many(self, cache_item_ids: Sequence[str]) -> None:
+        await asyncio.to_thread(self._delete_many_sync, cache_item_ids)
+
+    def _delete_many_sync(self, cache_item_ids: Sequence[str]) -> None:
+        for cache_item_id in cache_item_ids:
+            self._cache_item_file_path(cache_item_id).unlink(missing_ok=True)
+
     @override
     async def _clear(self) -> None:
         with suppress(FileNotFoundError):
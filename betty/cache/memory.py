@@ -4,21 +4,44 @@ Provide caching that stores cache items in volatile memory.
 
 from __future__ import annotations
 
-from collections.abc import MutableMapping, Sequence
-from typing import TypeAlias, Generic, Self, cast, TypeVar, final
+from collections import OrderedDict
+from sys import getsizeof
+from threading import Lock
+from time import time
+from typing import Generic, Self, TypeVar, final, TYPE_CHECKING
 
 from typing_extensions import override
 
-from betty.cache import CacheItem
 from betty.cache._base import _CommonCacheBase, _StaticCacheItem
 from betty.typing import threadsafe
 
+if TYPE_CHECKING:
+    from collections.abc import MutableMapping, Sequence, Mapping
+    from betty.cache import CacheItem
+
 _CacheItemValueContraT = TypeVar("_CacheItemValueContraT", contravariant=True)
 
-_MemoryCacheStore: TypeAlias = MutableMapping[
-    str,
-    "CacheItem[_CacheItemValueContraT] | None | _MemoryCacheStore[_CacheItemValueContraT]",
-]
+
+@final
+class _MemoryCacheStore(Generic[_CacheItemValueContraT]):
+    __slots__ = "items", "lock", "scopes", "size"
+
+    def __init__(self):
+        # Cache items and their sizes, from least to most recently used.
+        self.items: OrderedDict[
+            str, tuple[_StaticCacheItem[_CacheItemValueContraT], int]
+        ] = OrderedDict()
+        self.lock = Lock()
+        self.scopes: MutableMapping[str, _MemoryCacheStore[_CacheItemValueContraT]] = {}
+        self.size = 0
+
+    def clear(self) -> None:
+        with self.lock:
+            self.items.clear()
+            self.size = 0
+            scopes = list(self.scopes.values())
+        for scope in scopes:
+            scope.clear()
 
 
 @final
@@ -28,35 +51,80 @@ class MemoryCache(
 ):
     """
     Provide a cache that stores cache items in volatile memory.
+
+    The cache can be bounded by the number of cache items (``max_entries``), their total size in bytes (``max_size``),
+    and their age in seconds (``ttl``). Once the cache exceeds its bounds, it evicts the least recently used cache
+    items. Expired cache items are evicted when they are retrieved. Each scope has its own bounds.
+
+    Sizes are measured using :py:func:`sys.getsizeof`, and therefore do not include the sizes of any objects that
+    values refer to.
     """
 
     def __init__(
         self,
         *,
         scopes: Sequence[str] | None = None,
+        max_entries: int | None = None,
+        max_size: int | None = None,
+        ttl: int | float | None = None,
         _store: _MemoryCacheStore[_CacheItemValueContraT] | None = None,
     ):
         super().__init__(scopes=scopes)
-        self._store: _MemoryCacheStore[_CacheItemValueContraT] = _store or {}
+        self._max_entries = max_entries
+        self._max_size = max_size
+        self._ttl = ttl
+        self._store: _MemoryCacheStore[_CacheItemValueContraT] = (
+            _store or _MemoryCacheStore()
+        )
 
     @override
     def _with_scope(self, scope: str) -> Self:
+        with self._store.lock:
+            try:
+                store = self._store.scopes[scope]
+            except KeyError:
+                store = self._store.scopes[scope] = _MemoryCacheStore()
         return type(self)(
             scopes=(*self._scopes, scope),
-            _store=cast(
-                "_MemoryCacheStore[_CacheItemValueContraT]",
-                self._store.setdefault(scope, {}),
-            ),
+            max_entries=self._max_entries,
+            max_size=self._max_size,
+            ttl=self._ttl,
+            _store=store,
         )
 
     @override
     async def _get(
         self, cache_item_id: str
     ) -> CacheItem[_CacheItemValueContraT] | None:
-        cache_item = self._store.get(cache_item_id, None)
-        if isinstance(cache_item, CacheItem):
-            return cache_item
-        return None
+        with self._store.lock:
+            return self._get_unlocked(cache_item_id, time())
+
+    @override
+    async def _get_many(
+        self, cache_item_ids: Sequence[str]
+    ) -> Mapping[str, CacheItem[_CacheItemValueContraT]]:
+        cache_items = {}
+        now = time()
+        with self._store.lock:
+            for cache_item_id in cache_item_ids:
+                cache_item = self._get_unlocked(cache_item_id, now)
+                if cache_item is not None:
+                    cache_items[cache_item_id] = cache_item
+        return cache_items
+
+    def _get_unlocked(
+        self, cache_item_id: str, now: float
+    ) -> CacheItem[_CacheItemValueContraT] | None:
+        try:
+            cache_item, _ = self._store.items[cache_item_id]
+        except KeyError:
+            return None
+        if self._ttl is not None and cache_item.modified + self._ttl <= now:
+            self._remove(cache_item_id)
+            self._metrics.record(evictions=1)
+            return None
+        self._store.items.move_to_end(cache_item_id)
+        return cache_item
 
     @override
     async def _set(
@@ -66,11 +134,62 @@ class MemoryCache(
         *,
         modified: int | float | None = None,
     ) -> None:
-        self._store[cache_item_id] = _StaticCacheItem(value, modified)
+        await self._set_many({cache_item_id: value}, modified=modified)
+
+    @override
+    async def _set_many(
+        self,
+        values: Mapping[str, _CacheItemValueContraT],
+        *,
+        modified: int | float | None = None,
+    ) -> None:
+        cache_items = [
+            (
+                cache_item_id,
+                _StaticCacheItem(value, modified),
+                0 if self._max_size is None else getsizeof(value),
+            )
+            for cache_item_id, value in values.items()
+        ]
+        with self._store.lock:
+            for cache_item_id, cache_item, size in cache_items:
+                self._remove(cache_item_id)
+                self._store.items[cache_item_id] = (cache_item, size)
+                self._store.size += size
+            self._evict()
+
+    def _remove(self, cache_item_id: str) -> None:
+        try:
+            _, size = self._store.items.pop(cache_item_id)
+        except KeyError:
+            return
+        self._store.size -= size
+
+    def _evict(self) -> None:
+        evictions = 0
+        while self._store.items and (
+            (
+                self._max_entries is not None
+                and len(self._store.items) > self._max_entries
+            )
+            or (self._max_size is not None and self._store.size > self._max_size)
+        ):
+            _, (_, size) = self._store.items.popitem(last=False)
+            self._store.size -= size
+            evictions += 1
+        if evictions:
+            self._metrics.record(evictions=evictions)
 
     @override
     async def _delete(self, cache_item_id: str) -> None:
-        self._store.pop(cache_item_id, None)
+        with self._store.lock:
+            self._remove(cache_item_id)
+
+    @override
+    async def _delete_many(self, cache_item_ids: Sequence[str]) -> None:
+        with self._store.lock:
+            for cache_item_id in cache_item_ids:
+                self._remove(cache_item_id)
 
     @override
     async def _clear(self) -> None:
@@ -18,12 +18,12 @@ from typing import (
 
 from typing_extensions import override
 
-from betty.cache import CacheItem, Cache, CacheItemValueSetter
+from betty.cache import CacheItem, Cache, CacheItemValueSetter, CacheItemValuesSetter
 from betty.typing import threadsafe
 
 if TYPE_CHECKING:
     from types import TracebackType
-    from collections.abc import AsyncIterator
+    from collections.abc import AsyncIterator, Iterable, Mapping
 
 
 _GetSet: TypeAlias = tuple[
@@ -109,6 +109,35 @@ class NoOpCache(Cache[Any]):
     async def delete(self, cache_item_id: str) -> None:
         return
 
+    @override
+    async def get_many(
+        self, cache_item_ids: Iterable[str]
+    ) -> Mapping[str, CacheItem[Any]]:
+        return {}
+
+    @override
+    async def set_many(
+        self,
+        values: Mapping[str, Any],
+        *,
+        modified: int | float | None = None,
+    ) -> None:
+        return
+
+    @override
+    @asynccontextmanager
+    async def getset_many(
+        self, cache_item_ids: Iterable[str]
+    ) -> AsyncIterator[tuple[Mapping[str, CacheItem[Any]], CacheItemValuesSetter[Any]]]:
+        async def _setter(values: Mapping[str, Any]) -> None:
+            return
+
+        yield {}, _setter
+
+    @override
+    async def delete_many(self, cache_item_ids: Iterable[str]) -> None:
+        return
+
     @override
     async def clear(self) -> None:
         return
@@ -0,0 +1,252 @@
+"""
+Provide caching that persists cache items to a single SQLite database.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from datetime import datetime
+from pickle import dumps, loads
+from threading import Lock
+from typing import Generic, Self, TypeVar, final, TYPE_CHECKING, Any
+
+from typing_extensions import override
+
+from betty.cache import CacheItem
+from betty.cache._base import _CommonCacheBase
+from betty.core import Shutdownable
+from betty.typing import threadsafe
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence, Mapping, MutableMapping, Iterable
+    from pathlib import Path
+
+
+_CacheItemValueT_co = TypeVar("_CacheItemValueT_co", covariant=True)
+_CacheItemValueT_contra = TypeVar("_CacheItemValueT_contra", contravariant=True)
+
+
+# Separate scopes with a character that is unlikely to be part of a scope itself.
+_SCOPE_SEPARATOR = "\x1f"
+
+_QUERY_PARAMETERS_LIMIT = 500
+
+
+@final
+class _SqliteCacheItem(CacheItem[_CacheItemValueT_co], Generic[_CacheItemValueT_co]):
+    __slots__ = "_modified", "_value_bytes"
+
+    def __init__(
+        self,
+        modified: int | float,
+        value_bytes: bytes,
+    ):
+        self._modified = modified
+        self._value_bytes = value_bytes
+
+    @override
+    @property
+    def modified(self) -> int | float:
+        return self._modified
+
+    @override
+    async def value(self) -> _CacheItemValueT_co:
+        return loads(self._value_bytes)  # type: ignore[no-any-return]
+
+
+@final
+@threadsafe
+class _SqliteDatabase:
+    """
+    A lazily opened SQLite database connection, shared by a cache and all its scopes.
+    """
+
+    def __init__(self, database_path: Path):
+        self._database_path = database_path
+        self._connection: sqlite3.Connection | None = None
+        self._lock = Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._database_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                self._database_path,
+                # Let other processes finish their writes.
+                timeout=60,
+                # The connection is guarded by our own lock.
+                check_same_thread=False,
+                isolation_level=None,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_items (scope TEXT NOT NULL, id TEXT NOT NULL, modified REAL NOT NULL, value BLOB NOT NULL, PRIMARY KEY (scope, id)) WITHOUT ROWID"
+            )
+            self._connection = connection
+        return self._connection
+
+    def execute(self, sql: str, parameters: Sequence[Any] = ()) -> list[Any]:
+        with self._lock:
+            return self._connect().execute(sql, parameters).fetchall()
+
+    def executemany(self, sql: str, parameters: Iterable[Sequence[Any]]) -> None:
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN")
+            try:
+                connection.executemany(sql, parameters)
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+@final
+@threadsafe
+class SqliteCache(
+    _CommonCacheBase[_CacheItemValueT_contra],
+    Shutdownable,
+    Generic[_CacheItemValueT_contra],
+):
+    """
+    Provide a cache that pickles values and persists them to a single SQLite database.
+
+    Unlike :py:class:`betty.cache.file.PickledFileCache`, this does not create a file for each cache item, which makes
+    large caches faster to read from and to clear.
+    """
+
+    def __init__(
+        self,
+        database_path: Path,
+        *,
+        scopes: Sequence[str] | None = None,
+        _database: _SqliteDatabase | None = None,
+    ):
+        super().__init__(scopes=scopes)
+        self._database_path = database_path
+        self._database = _database or _SqliteDatabase(database_path)
+        self._scope = "".join(f"{scope}{_SCOPE_SEPARATOR}" for scope in self._scopes)
+
+    @override
+    def _with_scope(self, scope: str) -> Self:
+        return type(self)(
+            self._database_path,
+            scopes=(*self._scopes, scope),
+            _database=self._database,
+        )
+
+    @override
+    async def shutdown(self, *, wait: bool = True) -> None:
+        await asyncio.to_thread(self._database.close)
+
+    @override
+    async def _get(
+        self, cache_item_id: str
+    ) -> CacheItem[_CacheItemValueT_contra] | None:
+        rows = await asyncio.to_thread(
+            self._database.execute,
+            "SELECT modified, value FROM cache_items WHERE scope = ? AND id = ?",
+            (self._scope, cache_item_id),
+        )
+        if not rows:
+            return None
+        modified, value_bytes = rows[0]
+        self._metrics.record(bytes_read=len(value_bytes))
+        return _SqliteCacheItem(modified, value_bytes)
+
+    @override
+    async def _get_many(
+        self, cache_item_ids: Sequence[str]
+    ) -> Mapping[str, CacheItem[_CacheItemValueT_contra]]:
+        cache_items: MutableMapping[str, CacheItem[_CacheItemValueT_contra]] = {}
+        # Stay well below SQLite's maximum number of query parameters.
+        for offset in range(0, len(cache_item_ids), _QUERY_PARAMETERS_LIMIT):
+            batch = cache_item_ids[offset : offset + _QUERY_PARAMETERS_LIMIT]
+            rows = await asyncio.to_thread(
+                self._database.execute,
+                f"SELECT id, modified, value FROM cache_items WHERE scope = ? AND id IN ({', '.join('?' * len(batch))})",
+                (self._scope, *batch),
+            )
+            for cache_item_id, modified, value_bytes in rows:
+                self._metrics.record(bytes_read=len(value_bytes))
+                cache_items[cache_item_id] = _SqliteCacheItem(modified, value_bytes)
+        return cache_items
+
+    @override
+    async def _set(
+        self,
+        cache_item_id: str,
+        value: _CacheItemValueT_contra,
+        *,
+        modified: int | float | None = None,
+    ) -> None:
+        value_bytes = dumps(value)
+        await asyncio.to_thread(
+            self._database.execute,
+            "INSERT OR REPLACE INTO cache_items (scope, id, modified, value) VALUES (?, ?, ?, ?)",
+            (
+                self._scope,
+                cache_item_id,
+                datetime.now().timestamp() if modified is None else modified,
+                value_bytes,
+            ),
+        )
+        self._metrics.record(bytes_written=len(value_bytes))
+
+    @override
+    async def _set_many(
+        self,
+        values: Mapping[str, _CacheItemValueT_contra],
+        *,
+        modified: int | float | None = None,
+    ) -> None:
+        if modified is None:
+            modified = datetime.now().timestamp()
+        rows = [
+            (self._scope, cache_item_id, modified, dumps(value))
+            for cache_item_id, value in values.items()
+        ]
+        await asyncio.to_thread(
+            self._database.executemany,
+            "INSERT OR REPLACE INTO cache_items (scope, id, modified, value) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+        self._metrics.record(
+            bytes_written=sum(len(value_bytes) for *_, value_bytes in rows)
+        )
+
+    @override
+    async def _delete(self, cache_item_id: str) -> None:
+        await asyncio.to_thread(
+            self._database.execute,
+            "DELETE FROM cache_items WHERE scope = ? AND id = ?",
+            (self._scope, cache_item_id),
+        )
+
+    @override
+    async def _delete_many(self, cache_item_ids: Sequence[str]) -> None:
+        await asyncio.to_thread(
+            self._database.executemany,
+            "DELETE FROM cache_items WHERE scope = ? AND id = ?",
+            [(self._scope, cache_item_id) for cache_item_id in cache_item_ids],
+        )
+
+    @override
+    async def _clear(self) -> None:
+        if not self._scope:
+            await asyncio.to_thread(self._database.execute, "DELETE FROM cache_items")
+            return
+        # Clear nested scopes as well. All scopes starting with ours sort before the scope that follows ours, which
+        # lets the primary key index serve this range.
+        await asyncio.to_thread(
+            self._database.execute,
+            "DELETE FROM cache_items WHERE scope >= ? AND scope < ?",
+            (self._scope, f"{self._scope[:-1]}{chr(ord(_SCOPE_SEPARATOR) + 1)}"),
+        )
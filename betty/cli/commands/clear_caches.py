@@ -7,6 +7,7 @@ from typing_extensions import override
 
 from betty.app.factory import AppDependentFactory
 from betty.cli.commands import command, Command
+from betty.jinja2 import BYTECODE_CACHE_SCOPE
 from betty.locale.localizable import _
 from betty.plugin import ShorthandPluginBase
 
@@ -46,6 +47,7 @@ class ClearCaches(ShorthandPluginBase, AppDependentFactory, Command):
         )
         async def clear_caches() -> None:
             await self._app.cache.clear()
+            await self._app.binary_file_cache.with_scope(BYTECODE_CACHE_SCOPE).clear()
             logging.getLogger(__name__).info(localizer._("All caches cleared."))
 
         return clear_caches
@@ -1,7 +1,9 @@
 from __future__ import annotations  # noqa D100
 
-from typing import TYPE_CHECKING, final, Self
+import json
+from typing import TYPE_CHECKING, final, Self, Any, TextIO
 
+import asyncclick as click
 from typing_extensions import override
 
 from betty.app.factory import AppDependentFactory
@@ -10,9 +12,21 @@ from betty.locale.localizable import _
 from betty.plugin import ShorthandPluginBase
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from betty.cache import Cache
     from betty.project import Project
-    import asyncclick as click
     from betty.app import App
+    from betty.serde.dump import DumpMapping, Dump
+
+
+def _dump_cache_metrics(caches: Mapping[str, Cache[Any]]) -> DumpMapping[Dump]:
+    return {
+        cache_name: {
+            scope: scope_metrics.dump()
+            for scope, scope_metrics in cache.metrics().items()
+        }
+        for cache_name, cache in caches.items()
+    }
 
 
 @final
@@ -45,10 +59,53 @@ class Generate(ShorthandPluginBase, AppDependentFactory, Command):
             else self.plugin_label().localize(localizer),
         )
         @project_option
-        async def generate(project: Project) -> None:
-            from betty.project import generate, load
+        @click.option(
+            "--processes",
+            "processes",
+            type=click.IntRange(min=1),
+            default=1,
+            help="The number of processes to render entity pages in.",
+        )
+        @click.option(
+            "--incremental",
+            "incremental",
+            is_flag=True,
+            help="Only render the entity pages that changed since the previous build.",
+        )
+        @click.option(
+            "--cache-metrics",
+            "cache_metrics_file",
+            type=click.File("w"),
+            help="Write the caches' hits, misses, and other metrics to this file as JSON. Use - for standard output.",
+        )
+        async def generate(
+            project: Project,
+            *,
+            processes: int,
+            incremental: bool,
+            cache_metrics_file: TextIO | None,
+        ) -> None:
+            from betty.project import generate, load, ProjectContext
 
+            job_context = ProjectContext(project)
             await load.load(project)
-            await generate.generate(project)
+            await generate.generate(
+                project,
+                processes=processes,
+                incremental=incremental,
+                job_context=job_context,
+            )
+            if cache_metrics_file is not None:
+                json.dump(
+                    _dump_cache_metrics(
+                        {
+                            "app": project.app.cache,
+                            "binary_file": project.app.binary_file_cache,
+                            "job": job_context.cache,
+                        }
+                    ),
+                    cache_metrics_file,
+                    indent=4,
+                )
 
         return generate
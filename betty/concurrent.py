@@ -2,21 +2,35 @@
 Provide utilities for concurrent programming.
 """
 
+from __future__ import annotations
+
 import asyncio
 import threading
 import time
 from abc import ABC, abstractmethod
-from asyncio import sleep
-from collections import defaultdict
+from asyncio import sleep, get_running_loop, wait, CancelledError
+from collections import defaultdict, deque
 from collections.abc import Hashable
+from contextlib import suppress
 from types import TracebackType
-from typing import Self, final, MutableMapping
+from typing import Self, final, MutableMapping, TYPE_CHECKING
 
 from math import floor
 from typing_extensions import override
 
 from betty.typing import threadsafe
 
+if TYPE_CHECKING:
+    from asyncio import AbstractEventLoop, Future
+    from collections.abc import Iterable, Sequence
+
+_POLL_INTERVAL = 0.1
+"""
+The maximum number of seconds to wait before checking a lock again, if it may have been released without waking us.
+"""
+
+_NOT_BUSY = object()
+
 
 class Lock(ABC):
     """
@@ -52,35 +66,141 @@ class Lock(ABC):
 async def asynchronize_acquire(lock: threading.Lock, *, wait: bool = True) -> bool:
     """
     Acquire a synchronous lock asynchronously.
+
+    Nothing tells us when the lock is released, so this polls the lock, backing off exponentially while it waits.
+    Prefer :py:class:`betty.concurrent.AsynchronizedLock`, which wakes up waiters when it is released.
     """
+    interval = 0.0
     while not lock.acquire(blocking=False):
         if not wait:
             return False
-        # Sleeping for zero seconds does not actually sleep, but gives the event
-        # loop a chance to progress other tasks while we wait for another chance
-        # to acquire the lock.
-        await sleep(0)
+        await sleep(interval)
+        interval = min(max(interval * 2, 0.001), _POLL_INTERVAL)
     return True
 
 
+@final
+class _Waiter:
+    __slots__ = "_loop", "_future", "_active", "_woken"
+
+    def __init__(self, loop: AbstractEventLoop, future: Future[None]):
+        self._loop = loop
+        self._future = future
+        self._active = True
+        self._woken = False
+
+
+@final
+@threadsafe
+class _Waiters:
+    """
+    Park asynchronous waiters, and wake them up one at a time.
+
+    Waiters may be parked from different threads and event loops.
+    """
+
+    __slots__ = "_lock", "_waiters"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters: deque[_Waiter] = deque()
+
+    def empty(self) -> bool:
+        """
+        Check if no waiters are parked.
+        """
+        with self._lock:
+            return not self._waiters
+
+    def park(self) -> _Waiter:
+        """
+        Park a new waiter.
+
+        Waiters must be parked before checking whether they need to wait, so that they cannot miss being woken up.
+        """
+        loop = get_running_loop()
+        waiter = _Waiter(loop, loop.create_future())
+        with self._lock:
+            self._waiters.append(waiter)
+        return waiter
+
+    async def wait(self, waiter: _Waiter, *, timeout: float | None = None) -> None:
+        """
+        Wait until a parked waiter is woken up, or until the timeout, after which it should check again anyway.
+        """
+        try:
+            await wait((waiter._future,), timeout=timeout)
+        except CancelledError:
+            # If we were woken up, but can no longer act on it, wake up the next waiter instead.
+            self.leave(waiter)
+            if waiter._woken:
+                self.notify()
+            raise
+
+    def leave(self, waiter: _Waiter) -> None:
+        """
+        Stop waiting.
+        """
+        with self._lock:
+            if waiter._active:
+                waiter._active = False
+                self._waiters.remove(waiter)
+
+    def notify(self) -> None:
+        """
+        Wake up the next waiter, if there is one.
+        """
+        with self._lock:
+            waiter = None
+            while self._waiters and waiter is None:
+                waiter = self._waiters.popleft()
+                if not waiter._active:
+                    waiter = None
+            if waiter is None:
+                return
+            waiter._active = False
+            waiter._woken = True
+        with suppress(RuntimeError):
+            waiter._loop.call_soon_threadsafe(_wake, waiter._future)
+
+
+def _wake(future: Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
 @final
 class AsynchronizedLock(Lock):
     """
     Make a sychronous (blocking) lock asynchronous (non-blocking).
     """
 
-    __slots__ = "_lock"
+    __slots__ = "_lock", "_waiters"
 
     def __init__(self, lock: threading.Lock):
         self._lock = lock
+        self._waiters = _Waiters()
 
     @override
     async def acquire(self, *, wait: bool = True) -> bool:
-        return await asynchronize_acquire(self._lock, wait=wait)
+        if self._lock.acquire(blocking=False):
+            return True
+        if not wait:
+            return False
+        while True:
+            waiter = self._waiters.park()
+            try:
+                if self._lock.acquire(blocking=False):
+                    return True
+                # The lock may be released by others without calling self.release(), which does not wake us.
+                await self._waiters.wait(waiter, timeout=_POLL_INTERVAL)
+            finally:
+                self._waiters.leave(waiter)
 
     @override
     async def release(self) -> None:
         self._lock.release()
+        self._waiters.notify()
 
     @classmethod
     def threading(cls) -> Self:
@@ -136,49 +256,79 @@ class RateLimiter:
         """
         Wait until an operation may be performed (again).
         """
+        # Other callers wait for the lock, while the caller holding it sleeps until the next token is added.
         async with self._lock:
             while self._available < 1:
                 self._add_tokens()
                 if self._available < 1:
-                    await asyncio.sleep(0)
+                    await asyncio.sleep(
+                        self._last_add
+                        + (1 - self._available) / self._maximum
+                        - time.monotonic()
+                    )
             self._available -= 1
 
 
 class _Transaction(Lock):
     def __init__(
         self,
-        transaction_id: Hashable,
+        transaction_ids: Sequence[Hashable],
         orchestrator_lock: Lock,
         ledger: MutableMapping[Hashable, bool],
+        waiters: MutableMapping[Hashable, _Waiters],
     ):
-        self._transaction_id = transaction_id
+        self._transaction_ids = transaction_ids
         self._ledger_lock = orchestrator_lock
         self._ledger = ledger
+        self._waiters = waiters
 
     @override
     async def acquire(self, *, wait: bool = True) -> bool:
-        if wait:
-            while True:
-                async with self._ledger_lock:
-                    if self._can_acquire():
-                        return self._acquire()
-                await sleep(0)
-        else:
+        woken_waiters: _Waiters | None = None
+        while True:
             async with self._ledger_lock:
-                if self._can_acquire():
+                busy_transaction_id = self._get_busy_transaction_id()
+                if busy_transaction_id is _NOT_BUSY:
                     return self._acquire()
-                return False
-
-    def _can_acquire(self) -> bool:
-        return not self._ledger[self._transaction_id]
+                if not wait:
+                    return False
+                waiters = self._waiters[busy_transaction_id]
+                # If we were woken up for another transaction that we can no longer act on, pass it on.
+                if woken_waiters is not None and woken_waiters is not waiters:
+                    woken_waiters.notify()
+                waiter = waiters.park()
+            # Transactions are always released through self.release(), which is guaranteed to wake us.
+            try:
+                await waiters.wait(waiter)
+            finally:
+                waiters.leave(waiter)
+            woken_waiters = waiters if waiter._woken else None
+
+    def _get_busy_transaction_id(self) -> Hashable:
+        for transaction_id in self._transaction_ids:
+            if self._ledger.get(transaction_id, False):
+                return transaction_id
+        return _NOT_BUSY
 
     def _acquire(self) -> bool:
-        self._ledger[self._transaction_id] = True
+        for transaction_id in self._transaction_ids:
+            self._ledger[transaction_id] = True
         return True
 
     @override
     async def release(self) -> None:
-        self._ledger[self._transaction_id] = False
+        # Release under the ledger lock, so waiters cannot park after we notified them, but before they saw the
+        # transaction was busy.
+        async with self._ledger_lock:
+            for transaction_id in self._transaction_ids:
+                del self._ledger[transaction_id]
+            for transaction_id in self._transaction_ids:
+                waiters = self._waiters.get(transaction_id)
+                if waiters is not None:
+                    waiters.notify()
+                    # Forget transaction IDs that are no longer contended.
+                    if waiters.empty():
+                        del self._waiters[transaction_id]
 
 
 class Ledger:
@@ -190,10 +340,27 @@ class Ledger:
 
     def __init__(self, ledger_lock: Lock):
         self._ledger_lock = ledger_lock
-        self._ledger: MutableMapping[Hashable, bool] = defaultdict(lambda: False)
+        self._ledger: MutableMapping[Hashable, bool] = {}
+        self._waiters: MutableMapping[Hashable, _Waiters] = defaultdict(_Waiters)
 
     def ledger(self, transaction_id: Hashable) -> Lock:
         """
         Ledger a new lock for the given transaction ID.
         """
-        return _Transaction(transaction_id, self._ledger_lock, self._ledger)
+        return _Transaction(
+            (transaction_id,), self._ledger_lock, self._ledger, self._waiters
+        )
+
+    def ledger_many(self, transaction_ids: Iterable[Hashable]) -> Lock:
+        """
+        Ledger a single new lock for all of the given transaction IDs.
+
+        The lock is acquired for all transaction IDs at once, or not at all. This is cheaper than acquiring a lock for
+        each transaction ID separately, and cannot deadlock.
+        """
+        return _Transaction(
+            tuple(dict.fromkeys(transaction_ids)),
+            self._ledger_lock,
+            self._ledger,
+            self._waiters,
+        )
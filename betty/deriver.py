@@ -25,7 +25,7 @@ if TYPE_CHECKING:
     from betty.plugin import PluginRepository
     from betty.ancestry import Ancestry
     from betty.ancestry.event_type import EventType
-    from collections.abc import Sequence
+    from collections.abc import Sequence, MutableMapping
     from betty.locale.localizer import Localizer
 
 
@@ -71,54 +71,89 @@ class Deriver:
         Derive additional data.
         """
         logger = logging.getLogger(__name__)
+        event_type_orders = [
+            await self._get_event_type_order(derivable_event_type)
+            for derivable_event_type in self._derivable_event_type
+        ]
+        created_derivations = dict.fromkeys(self._derivable_event_type, 0)
+        updated_derivations = dict.fromkeys(self._derivable_event_type, 0)
+        # Derive all event types for each person in turn, so each person's events and their dates are gathered once.
+        for person in self._ancestry[Person]:
+            person_events = _PersonEvents(person)
+            for event_type_order in event_type_orders:
+                created, updated = self._derive_person(person_events, event_type_order)
+                created_derivations[event_type_order.derivable_event_type] += created
+                updated_derivations[event_type_order.derivable_event_type] += updated
         for derivable_event_type in self._derivable_event_type:
-            created_derivations = 0
-            updated_derivations = 0
-            for person in self._ancestry[Person]:
-                created, updated = await self._derive_person(
-                    person, derivable_event_type
-                )
-                created_derivations += created
-                updated_derivations += updated
-            if updated_derivations > 0:
+            if updated_derivations[derivable_event_type] > 0:
                 logger.info(
                     self._localizer._(
                         "Updated {updated_derivations} {event_type} events based on existing information."
                     ).format(
-                        updated_derivations=str(updated_derivations),
+                        updated_derivations=str(
+                            updated_derivations[derivable_event_type]
+                        ),
                         event_type=derivable_event_type.plugin_label().localize(
                             self._localizer
                         ),
                     )
                 )
-            if created_derivations > 0:
+            if created_derivations[derivable_event_type] > 0:
                 logger.info(
                     self._localizer._(
                         "Created {created_derivations} additional {event_type} events based on existing information."
                     ).format(
-                        created_derivations=str(created_derivations),
+                        created_derivations=str(
+                            created_derivations[derivable_event_type]
+                        ),
                         event_type=derivable_event_type.plugin_label().localize(
                             self._localizer
                         ),
                     )
                 )
 
-    async def _derive_person(
-        self, person: Person, derivable_event_type: type[DerivableEventType]
+    async def _get_event_type_order(
+        self, derivable_event_type: type[DerivableEventType]
+    ) -> _EventTypeOrder:
+        # Aggregate event type order from references and backreferences.
+        comes_before_event_types = set(
+            await self._event_types.resolve_identifiers(
+                derivable_event_type.comes_before()
+            )
+        )
+        comes_after_event_types = set(
+            await self._event_types.resolve_identifiers(
+                derivable_event_type.comes_after()
+            )
+        )
+        for other_event_type in self._derivable_event_type:
+            if derivable_event_type in other_event_type.comes_before():
+                comes_after_event_types.add(other_event_type)
+            if derivable_event_type in other_event_type.comes_after():
+                comes_before_event_types.add(other_event_type)
+        return _EventTypeOrder(
+            derivable_event_type,
+            tuple(comes_before_event_types),
+            tuple(comes_after_event_types),
+        )
+
+    def _derive_person(
+        self, person_events: _PersonEvents, event_type_order: _EventTypeOrder
     ) -> tuple[int, int]:
+        person = person_events.person
+        derivable_event_type = event_type_order.derivable_event_type
+
         # Gather any existing events that could be derived, or create a new derived event if needed.
         derivable_events: Sequence[tuple[Event, Derivation]] = [
             (event, Derivation.UPDATE)
-            for event in _get_derivable_events(person, derivable_event_type)
+            for event in _get_derivable_events(
+                person_events.events, derivable_event_type
+            )
         ]
         if not derivable_events:
-            if list(
-                filter(
-                    lambda presence: isinstance(
-                        presence.event.event_type, derivable_event_type
-                    ),
-                    person.presences,
-                )
+            if any(
+                isinstance(event.event_type, derivable_event_type)
+                for event in person_events.events
             ):
                 return 0, 0
             if issubclass(
@@ -134,23 +169,6 @@ class Deriver:
             else:
                 return 0, 0
 
-        # Aggregate event type order from references and backreferences.
-        comes_before_event_types = set(
-            await self._event_types.resolve_identifiers(
-                derivable_event_type.comes_before()
-            )
-        )
-        comes_after_event_types = set(
-            await self._event_types.resolve_identifiers(
-                derivable_event_type.comes_after()
-            )
-        )
-        for other_event_type in self._derivable_event_type:
-            if derivable_event_type in other_event_type.comes_before():
-                comes_after_event_types.add(other_event_type)
-            if derivable_event_type in other_event_type.comes_after():
-                comes_before_event_types.add(other_event_type)
-
         created_derivations = 0
         updated_derivations = 0
 
@@ -162,12 +180,16 @@ class Deriver:
 
             if derivable_date is None or derivable_date.end is None:
                 dates_derived = dates_derived or _ComesBeforeDateDeriver.derive(
-                    person, derivable_event, comes_before_event_types
+                    person_events,
+                    derivable_event,
+                    event_type_order.comes_before_event_types,
                 )
 
             if derivable_date is None or derivable_date.start is None:
                 dates_derived = dates_derived or _ComesAfterDateDeriver.derive(
-                    person, derivable_event, comes_after_event_types
+                    person_events,
+                    derivable_event,
+                    event_type_order.comes_after_event_types,
                 )
 
             if dates_derived:
@@ -176,41 +198,94 @@ class Deriver:
                     created_derivations += 1
                     presence = Presence(person, Subject(), derivable_event)
                     self._ancestry.add(presence)
+                    person_events.events.append(derivable_event)
                 else:
                     updated_derivations += 1
 
         return created_derivations, updated_derivations
 
 
+@final
+class _EventTypeOrder:
+    """
+    The event types a derivable event type comes before and after.
+    """
+
+    def __init__(
+        self,
+        derivable_event_type: type[DerivableEventType],
+        comes_before_event_types: tuple[type[EventType], ...],
+        comes_after_event_types: tuple[type[EventType], ...],
+    ):
+        self.derivable_event_type = derivable_event_type
+        self.comes_before_event_types = comes_before_event_types
+        self.comes_after_event_types = comes_after_event_types
+
+
+@final
+class _PersonEvents:
+    """
+    A person's events, and their dates that can be compared to derivable events.
+    """
+
+    def __init__(self, person: Person):
+        self.person = person
+        self.events = [presence.event for presence in person.presences]
+        self._dates: MutableMapping[tuple[int, type[_DateDeriver]], Sequence[Date]] = {}
+
+    def dates(self, event: Event, date_deriver: type[_DateDeriver]) -> Sequence[Date]:
+        """
+        Get an event's comparable dates, as used by a date deriver.
+        """
+        key = (id(event), date_deriver)
+        try:
+            return self._dates[key]
+        except KeyError:
+            dates = self._dates[key] = [
+                date for date in date_deriver.get_event_dates(event) if date.comparable
+            ]
+            return dates
+
+    def invalidate(self, event: Event) -> None:
+        """
+        Invalidate an event's dates after they changed.
+        """
+        self._dates.pop((id(event), _ComesBeforeDateDeriver), None)
+        self._dates.pop((id(event), _ComesAfterDateDeriver), None)
+
+
 class _DateDeriver(ABC):
     @classmethod
     def derive(
         cls,
-        person: Person,
+        person_events: _PersonEvents,
         derivable_event: Event,
-        reference_event_types: set[type[EventType]],
+        reference_event_types: tuple[type[EventType], ...],
     ) -> bool:
         assert isinstance(derivable_event.event_type, DerivableEventType)
 
         if not reference_event_types:
             return False
 
-        reference_events = _get_reference_events(
-            person, reference_event_types, type(derivable_event.event_type)
-        )
-        reference_events_dates: Iterable[tuple[Event, Date]] = filter(
-            lambda x: x[1].comparable, cls._get_events_dates(reference_events)
-        )
-        if derivable_event.date is not None:
-            reference_events_dates = filter(
-                lambda x: cls._compare(cast(DateRange, derivable_event.date), x[1]),
-                reference_events_dates,
-            )
-        sorted_reference_events_dates = cls._sort(reference_events_dates)
-        try:
-            reference_event, reference_date = sorted_reference_events_dates[0]
-        except IndexError:
+        # Find the reference date that would come first if all reference dates were sorted.
+        reference_event_date: tuple[Event, Date] | None = None
+        for reference_event in _get_reference_events(
+            person_events.events,
+            reference_event_types,
+            type(derivable_event.event_type),
+        ):
+            for date in person_events.dates(reference_event, cls):
+                if derivable_event.date is not None and not cls._compare(
+                    cast(DateRange, derivable_event.date), date
+                ):
+                    continue
+                if reference_event_date is None or cls._precedes(
+                    date, reference_event_date[1]
+                ):
+                    reference_event_date = reference_event, date
+        if reference_event_date is None:
             return False
+        reference_event, reference_date = reference_event_date
 
         if derivable_event.date is None:
             derivable_event.date = DateRange()
@@ -224,17 +299,19 @@ class _DateDeriver(ABC):
             ),
         )
         derivable_event.citations.add(*reference_event.citations)
+        person_events.invalidate(derivable_event)
 
         return True
 
     @classmethod
-    def _get_events_dates(cls, events: Iterable[Event]) -> Iterable[tuple[Event, Date]]:
-        for event in events:
-            if isinstance(event.date, Date):
-                yield event, event.date
-            if isinstance(event.date, DateRange):
-                for date in cls._get_date_range_dates(event.date):
-                    yield event, date
+    def get_event_dates(cls, event: Event) -> Iterable[Date]:
+        """
+        Get an event's dates that may be used to derive other events' dates from.
+        """
+        if isinstance(event.date, Date):
+            yield event.date
+        if isinstance(event.date, DateRange):
+            yield from cls._get_date_range_dates(event.date)
 
     @classmethod
     @abstractmethod
@@ -248,9 +325,7 @@ class _DateDeriver(ABC):
 
     @classmethod
     @abstractmethod
-    def _sort(
-        cls, events_dates: Iterable[tuple[Event, Date]]
-    ) -> Sequence[tuple[Event, Date]]:
+    def _precedes(cls, reference_date: Date, other_reference_date: Date) -> bool:
         pass
 
     @classmethod
@@ -276,10 +351,8 @@ class _ComesBeforeDateDeriver(_DateDeriver):
 
     @override
     @classmethod
-    def _sort(
-        cls, events_dates: Iterable[tuple[Event, Date]]
-    ) -> Sequence[tuple[Event, Date]]:
-        return sorted(events_dates, key=lambda x: x[1])
+    def _precedes(cls, reference_date: Date, other_reference_date: Date) -> bool:
+        return reference_date < other_reference_date
 
     @override
     @classmethod
@@ -305,10 +378,8 @@ class _ComesAfterDateDeriver(_DateDeriver):
 
     @override
     @classmethod
-    def _sort(
-        cls, events_dates: Iterable[tuple[Event, Date]]
-    ) -> Sequence[tuple[Event, Date]]:
-        return sorted(events_dates, key=lambda x: x[1], reverse=True)
+    def _precedes(cls, reference_date: Date, other_reference_date: Date) -> bool:
+        return other_reference_date < reference_date
 
     @override
     @classmethod
@@ -318,11 +389,9 @@ class _ComesAfterDateDeriver(_DateDeriver):
 
 
 def _get_derivable_events(
-    person: Person, derivable_event_type: type[EventType]
+    events: Iterable[Event], derivable_event_type: type[EventType]
 ) -> Iterable[Event]:
-    for presence in person.presences:
-        event = presence.event
-
+    for event in events:
         # Ignore events of the wrong type.
         if not isinstance(event.event_type, derivable_event_type):
             continue
@@ -341,18 +410,17 @@ def _get_derivable_events(
 
 
 def _get_reference_events(
-    person: Person,
-    reference_event_types: set[type[EventType]],
+    events: Iterable[Event],
+    reference_event_types: tuple[type[EventType], ...],
     derivable_event_type: type[EventType],
 ) -> Iterable[Event]:
-    for presence in person.presences:
-        reference_event = presence.event
-
+    comes_before = derivable_event_type.comes_before()
+    for reference_event in events:
         if reference_event.date is None:
             continue
 
         if isinstance(reference_event.date, DateRange):
-            if type(reference_event.event_type) in derivable_event_type.comes_before():
+            if type(reference_event.event_type) in comes_before:
                 reference_date = reference_event.date.start
             else:
                 reference_date = reference_event.date.end
@@ -362,7 +430,7 @@ def _get_reference_events(
                 continue
 
         # Ignore reference events of the wrong type.
-        if not isinstance(reference_event.event_type, tuple(reference_event_types)):
+        if not isinstance(reference_event.event_type, reference_event_types):
             continue
 
         yield reference_event
@@ -3,6 +3,7 @@ Fetch content from the internet.
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
 from json import loads
 from pathlib import Path
@@ -75,3 +76,40 @@ class Fetcher(ABC):
         :return: The path to the file on disk.
         """
         pass
+
+    async def fetch_cached(self, url: str) -> FetchResponse | None:
+        """
+        Fetch an HTTP resource from the cache only, without making any network requests.
+
+        This lets callers skip rate limiting for responses that need no network requests. Fetchers that serve expired
+        responses while refreshing them in the background may return those as well.
+
+        :return: The cached response, or ``None`` if the response cannot be served without a network request.
+        """
+        return None
+
+    async def fetch_cached_many(
+        self, urls: Sequence[str]
+    ) -> Mapping[str, FetchResponse]:
+        """
+        Fetch many HTTP resources from the cache only, without making any network requests.
+
+        :return: The cached responses, keyed by their URLs. URLs whose responses cannot be served without a network request are omitted.
+        """
+        responses = {}
+        for url in urls:
+            response = await self.fetch_cached(url)
+            if response is not None:
+                responses[url] = response
+        return responses
+
+    async def fetch_file_cached(self, url: str) -> Path | None:
+        """
+        Fetch a file from the cache only, without making any network requests.
+
+        This lets callers skip rate limiting for files that need no network requests. Fetchers that serve expired files
+        while refreshing them in the background may return those as well.
+
+        :return: The path to the cached file on disk, or ``None`` if the file cannot be served without a network request.
+        """
+        return None
@@ -3,15 +3,23 @@ Fetch content from the internet.
 """
 
 import asyncio
-from collections.abc import Callable, Awaitable
+from collections.abc import (
+    Callable,
+    Awaitable,
+    Mapping,
+    MutableMapping,
+    Sequence,
+)
+from http import HTTPStatus
 from logging import getLogger
 from pathlib import Path
 from time import time
 from typing import TypeVar
 
 from aiohttp import ClientSession, ClientResponse, ClientError
-from betty.cache import Cache
+from betty.cache import Cache, CacheItem, CacheItemValueSetter
 from betty.cache.file import BinaryFileCache
+from betty.core import Shutdownable
 from betty.fetch import Fetcher, FetchResponse, FetchError
 from betty.hashid import hashid
 from betty.locale.localizable import plain
@@ -20,9 +28,23 @@ from typing_extensions import override
 _CacheItemValueT = TypeVar("_CacheItemValueT")
 
 
-class HttpFetcher(Fetcher):
+def _conditional_request_headers(response: FetchResponse) -> Mapping[str, str]:
+    headers = {}
+    if "ETag" in response.headers:
+        headers["If-None-Match"] = response.headers["ETag"]
+    if "Last-Modified" in response.headers:
+        headers["If-Modified-Since"] = response.headers["Last-Modified"]
+    return headers
+
+
+class HttpFetcher(Fetcher, Shutdownable):
     """
     Fetch content from the internet using an HTTP client.
+
+    Expired responses are revalidated using their ``ETag`` and ``Last-Modified`` headers, so unchanged content is not
+    downloaded again.
+
+    With ``stale_while_revalidate``, expired content is returned immediately, and refreshed in the background.
     """
 
     def __init__(
@@ -32,18 +54,24 @@ class HttpFetcher(Fetcher):
         binary_file_cache: BinaryFileCache,
         # Default to seven days.
         ttl: int = 86400 * 7,
+        *,
+        stale_while_revalidate: bool = False,
     ):
         self._response_cache = response_cache
         self._binary_file_cache = binary_file_cache
         self._ttl = ttl
+        self._stale_while_revalidate = stale_while_revalidate
         self._http_client = http_client
         self._logger = getLogger(__name__)
+        self._revalidations: MutableMapping[tuple[int, str], asyncio.Task[None]] = {}
 
     async def _fetch(
         self,
         url: str,
         cache: Cache[_CacheItemValueT],
         response_mapper: Callable[[ClientResponse], Awaitable[_CacheItemValueT]],
+        conditional_request_headers: Callable[[_CacheItemValueT], Mapping[str, str]]
+        | None = None,
     ) -> tuple[_CacheItemValueT, str]:
         cache_item_id = hashid(url)
 
@@ -51,19 +79,24 @@ class HttpFetcher(Fetcher):
         async with cache.getset(cache_item_id) as (cache_item, setter):
             if cache_item and cache_item.modified + self._ttl > time():
                 response_data = await cache_item.value()
+            elif cache_item and self._stale_while_revalidate:
+                response_data = await cache_item.value()
+                self._revalidate(
+                    url,
+                    cache,
+                    cache_item_id,
+                    response_mapper,
+                    conditional_request_headers,
+                )
             else:
-                self._logger.debug(f'Fetching "{url}"...')
-                try:
-                    async with self._http_client.get(url) as response:
-                        response_data = await response_mapper(response)
-                except ClientError as error:
-                    self._logger.warning(
-                        f'Could not successfully connect to "{url}": {error}'
-                    )
-                except asyncio.TimeoutError:
-                    self._logger.warning(f'Timeout when connecting to "{url}"')
-                else:
-                    await setter(response_data)
+                requested_response_data = await self._request(
+                    url,
+                    cache_item,
+                    setter,
+                    response_mapper,
+                    conditional_request_headers,
+                )
+                response_data = requested_response_data
 
         if response_data is None:
             if cache_item:
@@ -77,6 +110,131 @@ class HttpFetcher(Fetcher):
 
         return response_data, cache_item_id
 
+    async def _request(
+        self,
+        url: str,
+        cache_item: CacheItem[_CacheItemValueT] | None,
+        setter: CacheItemValueSetter[_CacheItemValueT],
+        response_mapper: Callable[[ClientResponse], Awaitable[_CacheItemValueT]],
+        conditional_request_headers: Callable[[_CacheItemValueT], Mapping[str, str]]
+        | None,
+    ) -> _CacheItemValueT | None:
+        stale_response_data: _CacheItemValueT | None = None
+        request_headers: Mapping[str, str] = {}
+        if cache_item and conditional_request_headers:
+            stale_response_data = await cache_item.value()
+            request_headers = conditional_request_headers(stale_response_data)
+
+        response_data: _CacheItemValueT
+        self._logger.debug(f'Fetching "{url}"...')
+        try:
+            async with self._http_client.get(url, headers=request_headers) as response:
+                if (
+                    response.status == HTTPStatus.NOT_MODIFIED
+                    and stale_response_data is not None
+                ):
+                    response_data = stale_response_data
+                else:
+                    response_data = await response_mapper(response)
+        except ClientError as error:
+            self._logger.warning(f'Could not successfully connect to "{url}": {error}')
+            return None
+        except asyncio.TimeoutError:
+            self._logger.warning(f'Timeout when connecting to "{url}"')
+            return None
+        # Store unchanged content again as well, so it is considered fresh for another TTL.
+        await setter(response_data)
+        return response_data
+
+    def _revalidate(
+        self,
+        url: str,
+        cache: Cache[_CacheItemValueT],
+        cache_item_id: str,
+        response_mapper: Callable[[ClientResponse], Awaitable[_CacheItemValueT]],
+        conditional_request_headers: Callable[[_CacheItemValueT], Mapping[str, str]]
+        | None,
+    ) -> None:
+        revalidation_key = (id(cache), cache_item_id)
+        if revalidation_key in self._revalidations:
+            return
+        revalidation = self._revalidations[revalidation_key] = asyncio.create_task(
+            self._revalidate_cache_item(
+                url, cache, cache_item_id, response_mapper, conditional_request_headers
+            )
+        )
+        revalidation.add_done_callback(
+            lambda _: self._revalidations.pop(revalidation_key, None)
+        )
+
+    async def _revalidate_cache_item(
+        self,
+        url: str,
+        cache: Cache[_CacheItemValueT],
+        cache_item_id: str,
+        response_mapper: Callable[[ClientResponse], Awaitable[_CacheItemValueT]],
+        conditional_request_headers: Callable[[_CacheItemValueT], Mapping[str, str]]
+        | None,
+    ) -> None:
+        async with cache.getset(cache_item_id) as (cache_item, setter):
+            # Another fetch may have refreshed the cache item in the meantime.
+            if cache_item and cache_item.modified + self._ttl > time():
+                return
+            await self._request(
+                url, cache_item, setter, response_mapper, conditional_request_headers
+            )
+
+    @override
+    async def shutdown(self, *, wait: bool = True) -> None:
+        revalidations = list(self._revalidations.values())
+        if not wait:
+            for revalidation in revalidations:
+                revalidation.cancel()
+        await asyncio.gather(*revalidations, return_exceptions=True)
+
+    async def _get_cache_item(
+        self,
+        url: str,
+        cache: Cache[_CacheItemValueT],
+        response_mapper: Callable[[ClientResponse], Awaitable[_CacheItemValueT]],
+        conditional_request_headers: Callable[[_CacheItemValueT], Mapping[str, str]]
+        | None = None,
+    ) -> tuple[CacheItem[_CacheItemValueT], str] | None:
+        cache_item_id = hashid(url)
+        async with cache.get(cache_item_id) as cache_item:
+            if cache_item and self._serve_cache_item(
+                url,
+                cache,
+                cache_item_id,
+                cache_item,
+                response_mapper,
+                conditional_request_headers,
+            ):
+                return cache_item, cache_item_id
+        return None
+
+    def _serve_cache_item(
+        self,
+        url: str,
+        cache: Cache[_CacheItemValueT],
+        cache_item_id: str,
+        cache_item: CacheItem[_CacheItemValueT],
+        response_mapper: Callable[[ClientResponse], Awaitable[_CacheItemValueT]],
+        conditional_request_headers: Callable[[_CacheItemValueT], Mapping[str, str]]
+        | None,
+    ) -> bool:
+        """
+        Check if a cache item can be served without waiting for a network request.
+        """
+        if cache_item.modified + self._ttl > time():
+            return True
+        if self._stale_while_revalidate:
+            self._revalidate(
+                url, cache, cache_item_id, response_mapper, conditional_request_headers
+            )
+            return True
+        return False
+
     async def _map_response(self, response: ClientResponse) -> FetchResponse:
         return FetchResponse(
             response.headers.copy(),
@@ -90,10 +248,53 @@ class HttpFetcher(Fetcher):
         Fetch an HTTP resource.
         """
         response_data, _ = await self._fetch(
-            url, self._response_cache, self._map_response
+            url,
+            self._response_cache,
+            self._map_response,
+            _conditional_request_headers,
         )
         return response_data
 
+    @override
+    async def fetch_cached(self, url: str) -> FetchResponse | None:
+        """
+        Fetch an HTTP resource from the cache only.
+
+        With ``stale_while_revalidate``, this also returns expired responses, and refreshes them in the background.
+        """
+        cached = await self._get_cache_item(
+            url,
+            self._response_cache,
+            self._map_response,
+            _conditional_request_headers,
+        )
+        if cached is None:
+            return None
+        cache_item, _ = cached
+        return await cache_item.value()
+
+    @override
+    async def fetch_cached_many(
+        self, urls: Sequence[str]
+    ) -> Mapping[str, FetchResponse]:
+        """
+        Fetch many HTTP resources from the cache only, using a single cache lookup.
+        """
+        cache_item_ids = {hashid(url): url for url in urls}
+        cache_items = await self._response_cache.get_many(list(cache_item_ids))
+        return {
+            cache_item_ids[cache_item_id]: await cache_item.value()
+            for cache_item_id, cache_item in cache_items.items()
+            if self._serve_cache_item(
+                cache_item_ids[cache_item_id],
+                self._response_cache,
+                cache_item_id,
+                cache_item,
+                self._map_response,
+                _conditional_request_headers,
+            )
+        }
+
     @override
     async def fetch_file(self, url: str) -> Path:
         """
@@ -105,3 +306,20 @@ class HttpFetcher(Fetcher):
             url, self._binary_file_cache, ClientResponse.read
         )
         return self._binary_file_cache.cache_item_file_path(cache_item_id)
+
+    @override
+    async def fetch_file_cached(self, url: str) -> Path | None:
+        """
+        Fetch a file from the cache only.
+
+        With ``stale_while_revalidate``, this also returns expired files, and refreshes them in the background.
+
+        :return: The path to the file on disk.
+        """
+        cached = await self._get_cache_item(
+            url, self._binary_file_cache, ClientResponse.read
+        )
+        if cached is None:
+            return None
+        _, cache_item_id = cached
+        return self._binary_file_cache.cache_item_file_path(cache_item_id)
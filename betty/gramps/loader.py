@@ -11,12 +11,13 @@ from collections import defaultdict
 from contextlib import suppress, ExitStack
 from dataclasses import dataclass
 from enum import Enum
+from functools import partial
+from io import BytesIO
 from logging import getLogger
 from pathlib import Path
 from typing import Iterable, Any, cast, TYPE_CHECKING, TypeVar, Generic, final
 from xml.etree import ElementTree
 
-import aiofiles
 from aiofiles.tempfile import TemporaryDirectory
 from geopy import Point
 from lxml import etree
@@ -57,6 +58,7 @@ from betty.privacy import HasPrivacy
 from betty.typing import internal
 
 if TYPE_CHECKING:
+    from _typeshed import SupportsRead
     from betty.copyright_notice import CopyrightNotice
     from betty.license import License
     from betty.plugin import PluginRepository
@@ -70,7 +72,7 @@ if TYPE_CHECKING:
     from betty.ancestry.gender import Gender
     from betty.factory import Factory
     from betty.locale.localizer import Localizer
-    from collections.abc import MutableMapping, Mapping, Sequence
+    from collections.abc import MutableMapping, Mapping, Sequence, Callable, Awaitable
 
 
 _EntityT = TypeVar("_EntityT", bound=Entity)
@@ -176,7 +178,7 @@ class GrampsLoader:
         self._added_entity_counts: MutableMapping[type[Entity], int] = defaultdict(
             lambda: 0
         )
-        self._tree: ElementTree.ElementTree | None = None
+        self._added_repository_count = 0
         self._gramps_tree_directory_path: Path | None = None
         self._loaded = False
         self._localizer = localizer
@@ -201,22 +203,24 @@ class GrampsLoader:
             )
         )
 
-        with suppress(UserFacingGrampsError):
-            await self.load_gpkg(file_path)
+        if self._loaded:
+            raise LoaderUsedAlready("This loader has been used up.")
+
+        if await self._try_load(self.load_gpkg(file_path)):
             return
 
-        with suppress(UserFacingGrampsError):
-            await self.load_gramps(file_path)
+        if await self._try_load(self.load_gramps(file_path)):
             return
 
         try:
-            async with aiofiles.open(file_path, mode="rb") as f:
-                xml = await f.read()
+            xml_file = open(file_path, mode="rb")  # noqa SIM115
         except FileNotFoundError:
             raise GrampsFileNotFound.new(file_path) from None
-        with suppress(UserFacingGrampsError):
-            await self._load_xml(xml, Path(file_path.anchor))
-            return
+        with xml_file:
+            if await self._try_load(
+                self._load_xml_file(xml_file, Path(file_path.anchor))
+            ):
+                return
 
         raise UserFacingGrampsError(
             _(
@@ -224,6 +228,17 @@ class GrampsLoader:
             ).format(file_path=str(file_path))
         )
 
+    async def _try_load(self, load: Awaitable[None]) -> bool:
+        try:
+            await load
+        except UserFacingGrampsError:
+            # Once loading has started, the file turned out to be of this type, and it must not be loaded as another
+            # type.
+            if self._loaded:
+                raise
+            return False
+        return True
+
     async def load_gramps(self, gramps_path: Path) -> None:
         """
         Load family history data from a Gramps *.gramps file.
@@ -233,8 +248,7 @@ class GrampsLoader:
         gramps_path = gramps_path.resolve()
         try:
             with gzip.open(gramps_path) as f:
-                xml = f.read()
-            await self._load_xml(xml, rootname(gramps_path))
+                await self._load_xml_file(f, rootname(gramps_path))
         except FileNotFoundError:
             raise GrampsFileNotFound.new(gramps_path) from None
         except OSError as error:
@@ -260,7 +274,7 @@ class GrampsLoader:
                 )
             except FileNotFoundError:
                 raise GrampsFileNotFound.new(gpkg_path) from None
-            except (OSError, tarfile.ReadError) as error:
+            except (EOFError, OSError, tarfile.ReadError) as error:
                 raise UserFacingGrampsError(
                     _(
                         "Could not extract {file_path} as a gzipped tar file  (*.tar.gz)."
@@ -279,91 +293,130 @@ class GrampsLoader:
         await self._load_xml(xml.encode("utf-8"), gramps_tree_directory_path)
 
     async def _load_xml(self, xml: bytes, gramps_tree_directory_path: Path) -> None:
-        try:
-            tree = cast(  # type: ignore[bad-cast]
-                ElementTree.ElementTree, etree.ElementTree(etree.fromstring(xml))
-            )
-        except etree.ParseError as error:
-            raise UserFacingGrampsError(plain(str(error))) from error
-        await self._load_tree(tree, gramps_tree_directory_path)
+        await self._load_xml_file(BytesIO(xml), gramps_tree_directory_path)
 
-    async def _load_tree(
-        self, tree: ElementTree.ElementTree, gramps_tree_directory_path: Path
+    async def _load_xml_file(
+        self, xml_file: SupportsRead[bytes], gramps_tree_directory_path: Path
     ) -> None:
         """
-        Load family history data from a Gramps XML tree.
+        Load family history data from a Gramps XML file.
+
+        The XML is parsed incrementally, and each entity element is discarded as soon as it has been loaded, so that
+        neither the raw XML nor the full XML tree have to be kept in memory.
         """
         if self._loaded:
             raise LoaderUsedAlready("This loader has been used up.")
 
-        self._loaded = True
-        self._tree = tree
         self._gramps_tree_directory_path = gramps_tree_directory_path.resolve()
-
-        logger = getLogger(__name__)
-
-        database = self._tree.getroot()
+        element_loaders = self._element_loaders(self._gramps_tree_directory_path)
+        family_tag = self._tag("family")
+        # Families reference people directly rather than through resolvers, so they are loaded once all people are.
+        family_elements = []
 
         with self._ancestry.unchecked():
-            await self._load_notes(database)
-            logger.info(
-                self._localizer._("Loaded {note_count} notes.").format(
-                    note_count=self._added_entity_counts[Note]
-                )
-            )
-            await self._load_objects(database, self._gramps_tree_directory_path)
-            logger.info(
-                self._localizer._("Loaded {file_count} files.").format(
-                    file_count=self._added_entity_counts[File]
+            try:
+                for __, element in etree.iterparse(xml_file, events=("end",)):
+                    self._loaded = True
+                    parent = element.getparent()
+                    if parent is None:
+                        continue
+                    element_loader = element_loaders.get(
+                        (cast(str, parent.tag), cast(str, element.tag))
+                    )
+                    if element_loader is None:
+                        continue
+                    if element.tag == family_tag:
+                        family_elements.append(element)
+                        continue
+                    await element_loader(
+                        cast(ElementTree.Element, element)  # type: ignore[bad-cast]
+                    )
+                    self._discard(element)
+            except etree.ParseError as error:
+                raise UserFacingGrampsError(plain(str(error))) from error
+            except (EOFError, OSError) as error:
+                # The file ended unexpectedly, for example because it is a truncated gzip file.
+                raise UserFacingGrampsError(plain(str(error))) from error
+            for family_element in family_elements:
+                await self._load_family(
+                    cast(ElementTree.Element, family_element)  # type: ignore[bad-cast]
                 )
-            )
 
-            await self._load_repositories(database)
-            repository_count = self._added_entity_counts[Source]
-            logger.info(
-                self._localizer._(
-                    "Loaded {repository_count} repositories as sources."
-                ).format(repository_count=repository_count)
-            )
+        self._log_added_entity_counts()
 
-            await self._load_sources(database)
-            logger.info(
-                self._localizer._("Loaded {source_count} sources.").format(
-                    source_count=self._added_entity_counts[Source] - repository_count
-                )
-            )
+        resolve(*self._ancestry)
 
-            await self._load_citations(database)
-            logger.info(
-                self._localizer._("Loaded {citation_count} citations.").format(
-                    citation_count=self._added_entity_counts[Citation]
-                )
+    def _tag(self, name: str) -> str:
+        return f"{{{self._NS['ns']}}}{name}"
+
+    def _element_loaders(
+        self, gramps_tree_directory_path: Path
+    ) -> Mapping[tuple[str, str], Callable[[ElementTree.Element], Awaitable[None]]]:
+        return {
+            (self._tag("notes"), self._tag("note")): self._load_note,
+            (self._tag("objects"), self._tag("object")): partial(
+                self._load_object,
+                gramps_tree_directory_path=gramps_tree_directory_path,
+            ),
+            (self._tag("repositories"), self._tag("repository")): self._load_repository,
+            (self._tag("sources"), self._tag("source")): self._load_source,
+            (self._tag("citations"), self._tag("citation")): self._load_citation,
+            (self._tag("places"), self._tag("placeobj")): self._load_place,
+            (self._tag("events"), self._tag("event")): self._load_event,
+            (self._tag("people"), self._tag("person")): self._load_person,
+            (self._tag("families"), self._tag("family")): self._load_family,
+        }
+
+    def _discard(self, element: etree._Element) -> None:
+        element.clear(keep_tail=True)
+        parent = element.getparent()
+        assert parent is not None
+        while element.getprevious() is not None:
+            del parent[0]
+
+    def _log_added_entity_counts(self) -> None:
+        logger = getLogger(__name__)
+        logger.info(
+            self._localizer._("Loaded {note_count} notes.").format(
+                note_count=self._added_entity_counts[Note]
             )
-
-            await self._load_places(database)
-            logger.info(
-                self._localizer._("Loaded {place_count} places.").format(
-                    place_count=self._added_entity_counts[Place]
-                )
+        )
+        logger.info(
+            self._localizer._("Loaded {file_count} files.").format(
+                file_count=self._added_entity_counts[File]
             )
-
-            await self._load_events(database)
-            logger.info(
-                self._localizer._("Loaded {event_count} events.").format(
-                    event_count=self._added_entity_counts[Event]
-                )
+        )
+        repository_count = self._added_repository_count
+        logger.info(
+            self._localizer._(
+                "Loaded {repository_count} repositories as sources."
+            ).format(repository_count=repository_count)
+        )
+        logger.info(
+            self._localizer._("Loaded {source_count} sources.").format(
+                source_count=self._added_entity_counts[Source] - repository_count
             )
-
-            await self._load_people(database)
-            logger.info(
-                self._localizer._("Loaded {person_count} people.").format(
-                    person_count=self._added_entity_counts[Person]
-                )
+        )
+        logger.info(
+            self._localizer._("Loaded {citation_count} citations.").format(
+                citation_count=self._added_entity_counts[Citation]
             )
-
-            await self._load_families(database)
-
-        resolve(*self._ancestry)
+        )
+        logger.info(
+            self._localizer._("Loaded {place_count} places.").format(
+                place_count=self._added_entity_counts[Place]
+            )
+        )
+        logger.info(
+            self._localizer._("Loaded {event_count} events.").format(
+                event_count=self._added_entity_counts[Event]
+            )
+        )
+        logger.info(
+            self._localizer._("Loaded {person_count} people.").format(
+                person_count=self._added_entity_counts[Person]
+            )
+        )
 
     def _resolve1(
         self, entity_type: type[_EntityT], handle: str
@@ -466,10 +519,6 @@ class GrampsLoader:
             return date
         return None
 
-    async def _load_notes(self, database: ElementTree.Element) -> None:
-        for element in self._xpath(database, "./ns:notes/ns:note"):
-            await self._load_note(element)
-
     async def _load_note(self, element: ElementTree.Element) -> None:
         note_handle = element.get("handle")
         note_id = element.get("id")
@@ -490,12 +539,6 @@ class GrampsLoader:
     ) -> None:
         owner.notes = self._resolve(Note, *self._load_handles("noteref", element))
 
-    async def _load_objects(
-        self, database: ElementTree.Element, gramps_tree_directory_path: Path
-    ) -> None:
-        for element in self._xpath(database, "./ns:objects/ns:object"):
-            await self._load_object(element, gramps_tree_directory_path)
-
     async def _load_object(
         self, element: ElementTree.Element, gramps_tree_directory_path: Path
     ) -> None:
@@ -555,10 +598,6 @@ class GrampsLoader:
         )
         self._load_noteref(file, element)
 
-    async def _load_people(self, database: ElementTree.Element) -> None:
-        for element in self._xpath(database, "./ns:people/ns:person"):
-            await self._load_person(element)
-
     async def _load_person(self, element: ElementTree.Element) -> None:
         person_handle = element.get("handle")
         assert person_handle is not None
@@ -639,10 +678,6 @@ class GrampsLoader:
         self._load_urls(person, element)
         self._add_entity(person, person_handle)
 
-    async def _load_families(self, database: ElementTree.Element) -> None:
-        for element in self._xpath(database, "./ns:families/ns:family"):
-            await self._load_family(element)
-
     async def _load_family(self, element: ElementTree.Element) -> None:
         children = [
             cast(Person, self._handles_to_entities[child_handle])
@@ -706,10 +741,6 @@ class GrampsLoader:
 
         self._add_entity(presence)
 
-    async def _load_places(self, database: ElementTree.Element) -> None:
-        for element in self._xpath(database, "./ns:places/ns:placeobj"):
-            await self._load_place(element)
-
     async def _load_place(self, element: ElementTree.Element) -> None:
         place_handle = element.get("handle")
         assert place_handle is not None
@@ -787,10 +818,6 @@ class GrampsLoader:
                 )
         return None
 
-    async def _load_events(self, database: ElementTree.Element) -> None:
-        for element in self._xpath(database, "./ns:events/ns:event"):
-            await self._load_event(element)
-
     async def _load_event(self, element: ElementTree.Element) -> None:
         event_handle = element.get("handle")
         event_id = element.get("id")
@@ -848,10 +875,6 @@ class GrampsLoader:
 
         self._add_entity(event, event_handle)
 
-    async def _load_repositories(self, database: ElementTree.Element) -> None:
-        for element in self._xpath(database, "./ns:repositories/ns:repository"):
-            await self._load_repository(element)
-
     async def _load_repository(self, element: ElementTree.Element) -> None:
         repository_source_handle = element.get("handle")
 
@@ -863,10 +886,7 @@ class GrampsLoader:
         self._load_urls(source, element)
         self._load_noteref(source, element)
         self._add_entity(source, repository_source_handle)
-
-    async def _load_sources(self, database: ElementTree.Element) -> None:
-        for element in self._xpath(database, "./ns:sources/ns:source"):
-            await self._load_source(element)
+        self._added_repository_count += 1
 
     async def _load_source(self, element: ElementTree.Element) -> None:
         source_handle = element.get("handle")
@@ -910,10 +930,6 @@ class GrampsLoader:
         self._load_noteref(source, element)
         self._add_entity(source, source_handle)
 
-    async def _load_citations(self, database: ElementTree.Element) -> None:
-        for element in self._xpath(database, "./ns:citations/ns:citation"):
-            await self._load_citation(element)
-
     async def _load_citation(self, element: ElementTree.Element) -> None:
         citation_handle = element.get("handle")
         source_handle = self._xpath1(element, "./ns:sourceref").get("hlink")
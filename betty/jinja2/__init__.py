@@ -12,7 +12,10 @@ from typing import Callable, Any, cast, TYPE_CHECKING, TypeAlias, final, Self
 import aiofiles
 from aiofiles import os as aiofiles_os
 from jinja2 import (
+    __version__ as jinja2_version,
+    BytecodeCache,
     Environment as Jinja2Environment,
+    FileSystemBytecodeCache,
     select_autoescape,
     FileSystemLoader,
     pass_context,
@@ -21,7 +24,9 @@ from jinja2 import (
 from jinja2.runtime import StrictUndefined, Context, DebugUndefined
 from typing_extensions import override
 
+from betty import about
 from betty.date import Date
+from betty.hashid import hashid_sequence
 from betty.html import CssProvider, JsProvider, Citer, Breadcrumbs
 from betty.jinja2.filter import filters
 from betty.jinja2.test import tests
@@ -171,6 +176,12 @@ class Jinja2Provider:
         return {}
 
 
+BYTECODE_CACHE_SCOPE = "jinja2"
+"""
+The binary file cache scope to store compiled templates in.
+"""
+
+
 class Environment(ProjectDependentFactory, Jinja2Environment):
     """
     Betty's Jinja2 environment.
@@ -189,12 +200,14 @@ class Environment(ProjectDependentFactory, Jinja2Environment):
         entity_contexts: EntityContexts,
         filters: Mapping[str, Callable[..., Any]],
         tests: Mapping[str, Callable[..., bool]],
+        bytecode_cache: BytecodeCache | None = None,
     ):
         template_directory_paths = [
             str(path / "templates") for path in assets.assets_directory_paths
         ]
         super().__init__(
             loader=FileSystemLoader(template_directory_paths),
+            bytecode_cache=bytecode_cache,
             auto_reload=project.configuration.debug,
             enable_async=True,
             undefined=(
@@ -213,6 +226,7 @@ class Environment(ProjectDependentFactory, Jinja2Environment):
         self._project = project
         self._extensions = extensions
         self._entity_contexts = entity_contexts
+        self._entity_templates: MutableMapping[tuple[str, type[Entity]], Template] = {}
 
         if project.configuration.debug:
             self.add_extension("jinja2.ext.debug")
@@ -227,6 +241,20 @@ class Environment(ProjectDependentFactory, Jinja2Environment):
     @classmethod
     async def new_for_project(cls, project: Project) -> Self:
         extensions = await project.extensions
+        # Jinja2 invalidates compiled templates whose sources changed, but not those compiled by other versions of
+        # Betty, whose filters, tests, and extensions may differ.
+        bytecode_cache_directory_path = (
+            project.app.binary_file_cache.with_scope(BYTECODE_CACHE_SCOPE)
+            .with_scope(
+                hashid_sequence(
+                    about.version(),
+                    jinja2_version,
+                    str(project.configuration.debug),
+                )
+            )
+            .path
+        )
+        await aiofiles_os.makedirs(bytecode_cache_directory_path, exist_ok=True)
         return cls(
             project,
             list(extensions.flatten()),
@@ -234,6 +262,7 @@ class Environment(ProjectDependentFactory, Jinja2Environment):
             await EntityContexts.new(),
             await filters(),
             await tests(),
+            FileSystemBytecodeCache(str(bytecode_cache_directory_path)),
         )
 
     @property
@@ -243,6 +272,30 @@ class Environment(ProjectDependentFactory, Jinja2Environment):
         """
         return self._project
 
+    def select_entity_template(self, role: str, entity_type: type[Entity]) -> Template:
+        """
+        Select the template to render an entity or entity type with.
+
+        This selects ``{role}--{entity type ID}.html.j2`` if it exists, or ``{role}.html.j2`` otherwise. Selected
+        templates are cached, unless templates are reloaded automatically.
+
+        :param role: The template's role, such as ``entity/page`` or ``search/result``.
+        """
+        if self.auto_reload:
+            return self._select_entity_template(role, entity_type)
+        try:
+            return self._entity_templates[role, entity_type]
+        except KeyError:
+            template = self._entity_templates[role, entity_type] = (
+                self._select_entity_template(role, entity_type)
+            )
+            return template
+
+    def _select_entity_template(self, role: str, entity_type: type[Entity]) -> Template:
+        return self.select_template(
+            [f"{role}--{entity_type.plugin_id()}.html.j2", f"{role}.html.j2"]
+        )
+
     def _init_i18n(self) -> None:
         self.install_gettext_callables(  # type: ignore[attr-defined]
             gettext=self._gettext,
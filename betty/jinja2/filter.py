@@ -36,7 +36,7 @@ from pdf2image.pdf2image import convert_from_path
 
 from betty.ancestry.file import File
 from betty.ancestry.file_reference import FileReference
-from betty.hashid import hashid_file_meta, hashid
+from betty.hashid import hashid_file_meta, hashid, hashid_file_content
 from betty.image import resize_cover, Size, FocusArea
 from betty.locale import (
     negotiate_locale,
@@ -57,6 +57,8 @@ from betty.string import (
 from betty.typing import internal
 
 if TYPE_CHECKING:
+    from betty.app import App
+    from betty.job import Context as JobContext
     from betty.ancestry.date import HasDate
     from betty.date import Datey
     from betty.locale.localizable import Localizable
@@ -317,27 +319,27 @@ async def filter_image_resize_cover(
     project = context_project(context)
     job_context = context_job_context(context)
 
-    destination_name = f"{file.id}-"
+    derivative_name = ""
     if size is not None:
         width, height = size
         if width is None:
-            destination_name += f"-x{height}"
+            derivative_name += f"-x{height}"
         elif height is None:
-            destination_name += f"{width}x-"
+            derivative_name += f"{width}x-"
         else:
-            destination_name += f"{width}x{height}"
+            derivative_name += f"{width}x{height}"
     if focus is not None:
-        destination_name += f"-{focus[0]}x{focus[1]}x{focus[2]}x{focus[3]}"
+        derivative_name += f"-{focus[0]}x{focus[1]}x{focus[2]}x{focus[3]}"
 
     file_directory_path = project.configuration.www_directory_path / "file"
 
     if file.media_type:
         if file.media_type.type == "image":
             image_loader = _load_image_image
-            destination_name += file.path.suffix
+            derivative_name += file.path.suffix
         elif file.media_type.type == "application" and file.media_type.subtype == "pdf":
             image_loader = _load_image_application_pdf
-            destination_name += "." + "jpg"
+            derivative_name += "." + "jpg"
         else:
             raise ValueError(
                 f'Cannot convert a file of media type "{file.media_type}" to an image.'
@@ -345,11 +347,13 @@ async def filter_image_resize_cover(
     else:
         raise ValueError("Cannot convert a file without a media type to an image.")
 
-    cache_item_id = f"{await hashid_file_meta(file.path)}:{destination_name}"
+    destination_name = f"{file.id}-{derivative_name}"
+    # Derivatives are keyed by the image's contents, so they can be reused across file paths and projects.
+    cache_item_id = f"{await _file_content_digest(project.app, job_context, file.path)}:{derivative_name}"
     execute_filter = True
     if job_context:
         async with job_context.cache.with_scope("filter_image").getset(
-            cache_item_id, wait=False
+            f"{cache_item_id}:{destination_name}", wait=False
         ) as (cache_item, setter):
             if cache_item is None and setter is not None:
                 await setter(True)
@@ -376,6 +380,33 @@ async def filter_image_resize_cover(
     return destination_public_path
 
 
+async def _file_content_digest(
+    app: App, job_context: JobContext | None, file_path: Path
+) -> str:
+    """
+    Get a digest of a file's contents.
+
+    Contents are only hashed again if the file's path, size, or last modified time change.
+    """
+    file_meta_digest = await hashid_file_meta(file_path)
+    caches = [app.cache.with_scope("file_content_digest")]
+    if job_context:
+        caches.insert(0, job_context.cache.with_scope("file_content_digest"))
+    digest: str | None = None
+    missed_caches = []
+    for cache in caches:
+        async with cache.get(file_meta_digest) as cache_item:
+            if cache_item is not None:
+                digest = await cache_item.value()
+                break
+        missed_caches.append(cache)
+    if digest is None:
+        digest = await hashid_file_content(file_path)
+    for cache in missed_caches:
+        await cache.set(file_meta_digest, digest)
+    return digest
+
+
 async def _load_image_image(
     file_path: Path,
     media_type: MediaType,
@@ -551,9 +582,9 @@ def filter_select_has_dates(
     if date is None:
         date = context.resolve_or_missing("today")
     return filter(
-        lambda dated: dated.date is None
-        or dated.date.comparable
-        and dated.date in date,
+        lambda dated: (
+            dated.date is None or dated.date.comparable and dated.date in date
+        ),
         has_dates,
     )
 
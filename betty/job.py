@@ -13,13 +13,19 @@ if TYPE_CHECKING:
     from betty.cache import Cache
 
 
+_CACHE_MAX_ENTRIES = 2**16
+"""
+The maximum number of cache items per scope in a job context's cache.
+"""
+
+
 class Context:
     """
     Define a job context.
     """
 
     def __init__(self):
-        self._cache: Cache[Any] = MemoryCache()
+        self._cache: Cache[Any] = MemoryCache(max_entries=_CACHE_MAX_ENTRIES)
         self._start = datetime.now()
 
     @property
@@ -27,7 +33,8 @@ class Context:
         """
         Provide a cache for this job context.
 
-        The cache is volatile and will be discarded once the job context is completed.
+        The cache is volatile and will be discarded once the job context is completed. Each of its scopes holds a
+        limited number of cache items, and evicts the least recently used ones first.
         """
         return self._cache
 
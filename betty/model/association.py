@@ -185,6 +185,13 @@ class _Association(LinkedDataDumpableProvider[_OwnerT], Generic[_OwnerT, _Associ
             )
         )
 
+    def __reduce__(self) -> Any:
+        # Associations are registered singletons, so unpickle them by looking them up.
+        return AssociationRegistry.get_association, (
+            self.owner_type,
+            self._owner_attr_name,
+        )
+
     @property
     def owner_type(self) -> type[_OwnerT]:
         """
@@ -620,6 +627,15 @@ class BidirectionalToMany(
             self,
         )
 
+    def associates_changed(self, owner: _OwnerT) -> None:
+        """
+        React to associates having been added to or removed from an owner.
+
+        This does nothing by default. Subclasses may override it, for example to invalidate caches derived from the
+        associates.
+        """
+        pass
+
 
 @final
 class UnidirectionalToZeroOrOne(
@@ -717,12 +733,22 @@ class _BidirectionalAssociateCollection(
         self._association = association
         self.__owner = weakref.ref(owner)
 
+    @override
+    def __getstate__(self) -> Any:
+        return super().__getstate__(), self._association, self._owner
+
+    @override
+    def __setstate__(self, state: Any) -> None:
+        collection_state, self._association, owner = state
+        super().__setstate__(collection_state)
+        self.__owner = weakref.ref(owner)
+
     @property
     def _owner(self) -> _OwnerT:
         owner = self.__owner()
-        assert (
-            owner is not None
-        ), "This associate collection's owner no longer exists in memory."
+        assert owner is not None, (
+            "This associate collection's owner no longer exists in memory."
+        )
         return owner
 
     @override
@@ -730,12 +756,18 @@ class _BidirectionalAssociateCollection(
         super()._on_add(*entities)
         for associate in entities:
             self._association.inverse().associate(associate, self._owner)
+        self._associates_changed()
 
     @override
     def _on_remove(self, *entities: _AssociateT) -> None:
         super()._on_remove(*entities)
         for associate in entities:
             self._association.inverse().disassociate(associate, self._owner)
+        self._associates_changed()
+
+    def _associates_changed(self) -> None:
+        if isinstance(self._association, BidirectionalToMany):
+            self._association.associates_changed(self._owner)
 
 
 def resolve(*entities: Entity) -> None:
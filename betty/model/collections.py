@@ -21,14 +21,13 @@ from typing import (
 
 from typing_extensions import override
 
-from betty.functools import unique
 from betty.model import Entity
 from betty.repr import repr_instance
 
 if TYPE_CHECKING:
     from betty.plugin import PluginIdToTypeMap
     from betty.machine_name import MachineName
-    from collections.abc import Sequence, MutableSequence, MutableMapping, AsyncIterator
+    from collections.abc import Sequence, MutableMapping, AsyncIterator
 
 _EntityT = TypeVar("_EntityT", bound=Entity)
 _TargetT = TypeVar("_TargetT")
@@ -75,7 +74,8 @@ class EntityCollection(Generic[_TargetT], ABC):
         """
         Replace all entities with the given ones.
         """
-        self.remove(*(entity for entity in self if entity not in entities))
+        entity_identities = {id(entity) for entity in entities}
+        self.remove(*(entity for entity in self if id(entity) not in entity_identities))
         self.add(*entities)
 
     @abstractmethod
@@ -116,49 +116,115 @@ class EntityCollection(Generic[_TargetT], ABC):
         pass
 
     def _known(self, *entities: _TargetT & Entity) -> Iterable[_TargetT & Entity]:
-        for entity in unique(entities):
+        for entity in _unique_entities(entities):
             if entity in self:
                 yield entity
 
     def _unknown(self, *entities: _TargetT & Entity) -> Iterable[_TargetT & Entity]:
-        for entity in unique(entities):
+        for entity in _unique_entities(entities):
             if entity not in self:
                 yield entity
 
 
+def _unique_entities(entities: Iterable[_EntityT]) -> Iterator[_EntityT]:
+    """
+    Yield the first occurrences of entities, by identity.
+    """
+    seen = set()
+    for entity in entities:
+        entity_identity = id(entity)
+        if entity_identity not in seen:
+            seen.add(entity_identity)
+            yield entity
+
+
 _EntityCollectionT = TypeVar("_EntityCollectionT", bound=EntityCollection[_EntityT])
 
 
 class SingleTypeEntityCollection(Generic[_TargetT], EntityCollection[_TargetT]):
     """
     Collect entities of a single type.
+
+    Entities are indexed by identity and by entity ID, so that lookups, containment checks, additions, and removals
+    take constant time, while the collection retains its insertion order.
     """
 
-    __slots__ = "_entities", "_target_type"
+    __slots__ = "_entities", "_entities_by_id", "_sequence", "_target_type"
 
     def __init__(self, target_type: type[_TargetT], *entities: _TargetT & Entity):
         super().__init__()
-        self._entities: MutableSequence[_TargetT & Entity] = [*entities]
+        self._entities: MutableMapping[int, _TargetT & Entity] = {}
+        self._entities_by_id: MutableMapping[str, _TargetT & Entity] | None = {}
+        self._sequence: Sequence[_TargetT & Entity] | None = None
         self._target_type = target_type
+        for entity in entities:
+            self._index(entity)
+
+    def __getstate__(self) -> Any:
+        return self._target_type, [*self._entities.values()]
+
+    def __setstate__(self, state: Any) -> None:
+        self._target_type, entities = state
+        self._entities = {id(entity): entity for entity in entities}
+        # Unpickled entities may not have been fully restored yet, so their IDs are indexed when they are first needed.
+        self._entities_by_id = None
+        self._sequence = None
 
     @override  # type: ignore[callable-functiontype]
     @recursive_repr()
     def __repr__(self) -> str:
         return repr_instance(self, target_type=self._target_type, length=len(self))
 
+    def _index(self, entity: _TargetT & Entity) -> bool:
+        entity_identity = id(entity)
+        if entity_identity in self._entities:
+            return False
+        self._entities[entity_identity] = entity
+        if self._entities_by_id is not None:
+            self._entities_by_id.setdefault(entity.id, entity)
+        self._sequence = None
+        return True
+
+    def _unindex(self, entity: _TargetT & Entity) -> bool:
+        entity_identity = id(entity)
+        if entity_identity not in self._entities:
+            return False
+        entities_by_id = self._index_by_id()
+        # Entity IDs are not guaranteed to be unique within a collection. Only if that is the case may we have to
+        # look for another entity with the same ID.
+        has_duplicate_ids = len(entities_by_id) < len(self._entities)
+        del self._entities[entity_identity]
+        self._sequence = None
+        if entities_by_id.get(entity.id) is entity:
+            del entities_by_id[entity.id]
+            if has_duplicate_ids:
+                for other_entity in self._entities.values():
+                    if other_entity.id == entity.id:
+                        entities_by_id[entity.id] = other_entity
+                        break
+        return True
+
+    def _index_by_id(self) -> MutableMapping[str, _TargetT & Entity]:
+        if self._entities_by_id is None:
+            self._entities_by_id = {}
+            for entity in self._entities.values():
+                self._entities_by_id.setdefault(entity.id, entity)
+        return self._entities_by_id
+
+    def _ordered(self) -> Sequence[_TargetT & Entity]:
+        if self._sequence is None:
+            self._sequence = [*self._entities.values()]
+        return self._sequence
+
     @override
     def add(self, *entities: _TargetT & Entity) -> None:
-        added_entities = [*self._unknown(*entities)]
-        for entity in added_entities:
-            self._entities.append(entity)
+        added_entities = [entity for entity in entities if self._index(entity)]
         if added_entities:
             self._on_add(*added_entities)
 
     @override
     def remove(self, *entities: _TargetT & Entity) -> None:
-        removed_entities = [*self._known(*entities)]
-        for entity in removed_entities:
-            self._entities.remove(entity)
+        removed_entities = [entity for entity in entities if self._unindex(entity)]
         if removed_entities:
             self._on_remove(*removed_entities)
 
@@ -168,7 +234,7 @@ class SingleTypeEntityCollection(Generic[_TargetT], EntityCollection[_TargetT]):
 
     @override
     def __iter__(self) -> Iterator[_TargetT & Entity]:
-        return self._entities.__iter__()
+        return iter(self._ordered())
 
     @override
     def __len__(self) -> int:
@@ -197,18 +263,18 @@ class SingleTypeEntityCollection(Generic[_TargetT], EntityCollection[_TargetT]):
         return self._getitem_by_entity_id(key)
 
     def _getitem_by_index(self, index: int) -> _TargetT & Entity:
-        return self._entities[index]
+        return self._ordered()[index]
 
     def _getitem_by_indices(self, indices: slice) -> Sequence[_TargetT & Entity]:
-        return self.view[indices]
+        return self._ordered()[indices]
 
     def _getitem_by_entity_id(self, entity_id: str) -> _TargetT & Entity:
-        for entity in self._entities:
-            if entity_id == entity.id:
-                return entity
-        raise KeyError(
-            f'Cannot find a {self._target_type} entity with ID "{entity_id}".'
-        )
+        try:
+            return self._index_by_id()[entity_id]
+        except KeyError:
+            raise KeyError(
+                f'Cannot find a {self._target_type} entity with ID "{entity_id}".'
+            ) from None
 
     @override
     def __delitem__(self, key: str | _TargetT & Entity) -> None:
@@ -222,10 +288,9 @@ class SingleTypeEntityCollection(Generic[_TargetT], EntityCollection[_TargetT]):
         self.remove(entity)
 
     def _delitem_by_entity_id(self, entity_id: str) -> None:
-        for entity in self._entities:
-            if entity_id == entity.id:
-                self.remove(entity)
-                return
+        entity = self._index_by_id().get(entity_id)
+        if entity is not None:
+            self.remove(entity)
 
     @override
     def __contains__(self, value: Any) -> bool:
@@ -236,10 +301,10 @@ class SingleTypeEntityCollection(Generic[_TargetT], EntityCollection[_TargetT]):
         return False
 
     def _contains_by_entity(self, other_entity: _TargetT & Entity) -> bool:
-        return any(other_entity is entity for entity in self._entities)
+        return id(other_entity) in self._entities
 
     def _contains_by_entity_id(self, entity_id: str) -> bool:
-        return any(entity.id == entity_id for entity in self._entities)
+        return entity_id in self._index_by_id()
 
 
 class MultipleTypesEntityCollection(Generic[_TargetT], EntityCollection[_TargetT]):
@@ -395,8 +460,9 @@ class MultipleTypesEntityCollection(Generic[_TargetT], EntityCollection[_TargetT
             return self._contains_by_entity(value)
         return False
 
-    def _contains_by_entity(self, other_entity: Any) -> bool:
-        return any(other_entity is entity for entity in self)
+    def _contains_by_entity(self, other_entity: Entity) -> bool:
+        collection = self._collections.get(other_entity.type)
+        return collection is not None and other_entity in collection
 
     @override
     def add(self, *entities: _TargetT & Entity) -> None:
@@ -430,7 +496,7 @@ async def record_added(
     """
     Record all entities that are added to a collection.
     """
-    original = [*entities]
+    original = {id(entity) for entity in entities}
     added = await MultipleTypesEntityCollection[_EntityT].new()
     yield added
-    added.add(*[entity for entity in entities if entity not in original])
+    added.add(*[entity for entity in entities if id(entity) not in original])
@@ -5,9 +5,11 @@ Provide an API to determine if information should be kept private.
 from __future__ import annotations
 
 import logging
+from collections import defaultdict
 from contextlib import suppress
 from datetime import datetime
-from typing import Iterator, TypeAlias, Any, TYPE_CHECKING
+from sys import maxsize
+from typing import TypeAlias, Any, TYPE_CHECKING, Literal
 
 from betty.ancestry.presence import Presence
 from betty.ancestry.event import Event
@@ -24,15 +26,39 @@ from betty.date import DateRange, Date
 from betty.model import Entity
 
 if TYPE_CHECKING:
-    from collections.abc import MutableSequence
+    from collections.abc import MutableSet, MutableMapping, MutableSequence, Iterator
     from betty.locale.localizer import Localizer
 
 _Expirable: TypeAlias = Person | Event | Date | None
 
 
+class _LineageSweepFrame:
+    def __init__(
+        self,
+        person: Person,
+        relatives: Iterator[Person],
+        depth: int,
+    ):
+        self.person = person
+        self.relatives = relatives
+        self.expiration = -1
+        self.low = depth
+
+    def include(
+        self, relative_expiration: int, relative_lineage_expiration: int, shift: int
+    ) -> None:
+        self.expiration = max(
+            self.expiration,
+            max(relative_expiration, relative_lineage_expiration) - shift,
+        )
+
+
 class Privatizer:
     """
     Privatize resources.
+
+    A privatizer caches what it learns about people's expiration and their ancestors' and descendants' expiration,
+    so it must not be reused after the people it privatized, or their events, have changed.
     """
 
     def __init__(
@@ -43,7 +69,13 @@ class Privatizer:
     ):
         self._lifetime_threshold = lifetime_threshold
         self._localizer = localizer
-        self._seen: MutableSequence[HasPrivacy] = []
+        self._now = datetime.now()
+        self._seen: MutableSet[int] = set()
+        self._expiration_dates: MutableMapping[int, Date] = {}
+        self._person_expirations: MutableMapping[int, int] = {}
+        self._lineage_expirations: MutableMapping[
+            tuple[Literal["parents", "children"], int], int
+        ] = {}
 
     def privatize(self, subject: HasPrivacy) -> None:
         """
@@ -61,9 +93,9 @@ class Privatizer:
         if subject.privacy is not Privacy.PRIVATE:
             return
 
-        if subject in self._seen:
+        if id(subject) in self._seen:
             return
-        self._seen.append(subject)
+        self._seen.add(id(subject))
 
         if isinstance(subject, Person):
             self._privatize_person(subject)
@@ -169,13 +201,6 @@ class Privatizer:
             self._mark_private(note, has_notes)
             self.privatize(note)
 
-    def _ancestors_by_generation(
-        self, person: Person, generations_ago: int = 1
-    ) -> Iterator[tuple[Person, int]]:
-        for parent in person.parents:
-            yield parent, generations_ago
-            yield from self._ancestors_by_generation(parent, generations_ago + 1)
-
     def _determine_person_privacy(self, person: Person) -> None:
         # Do not change existing explicit privacy declarations.
         if person.privacy is not Privacy.UNDETERMINED:
@@ -195,16 +220,15 @@ class Privatizer:
             person.public = True
             return
 
-        for ancestor, generations_ago in self._ancestors_by_generation(person):
-            if self.has_expired(ancestor, generations_ago + 1):
-                person.public = True
-                return
+        # If any ancestor has expired for the generation they belong to, the person is considered not private.
+        if self._lineage_expiration(person, "parents") >= 1:
+            person.public = True
+            return
 
         # If any descendant has any expired event, the person is considered not private.
-        for descendant in person.descendants:
-            if self.has_expired(descendant, 1):
-                person.public = True
-                return
+        if self._lineage_expiration(person, "children") >= 1:
+            person.public = True
+            return
 
         person.private = True
         logging.getLogger(__name__).debug(
@@ -261,10 +285,119 @@ class Privatizer:
         return False
 
     def _person_has_expired(self, person: Person, generations_ago: int) -> bool:
-        for presence in person.presences:
-            if self._event_has_expired(presence.event, generations_ago):
-                return True
-        return False
+        return self._person_expiration(person) >= generations_ago
+
+    def _person_expiration(self, person: Person) -> int:
+        """
+        Get the highest generation for which a person has expired, or -1 if they have not expired at all.
+
+        Expiration is monotonic: if a person has expired for a generation, they have expired for all lower
+        generations as well.
+        """
+        try:
+            return self._person_expirations[id(person)]
+        except KeyError:
+            pass
+        expiration = -1
+        while any(
+            self._event_has_expired(presence.event, expiration + 1)
+            for presence in person.presences
+        ):
+            if self._lifetime_threshold <= 0:
+                # Without a lifetime threshold, anyone who has expired has expired for all generations.
+                expiration = maxsize
+                break
+            expiration += 1
+        self._person_expirations[id(person)] = expiration
+        return expiration
+
+    def _lineage_expiration(
+        self, person: Person, relatives_attr_name: Literal["parents", "children"]
+    ) -> int:
+        """
+        Get the highest expiration in a person's lineage.
+
+        For ancestors (``parents``), this is the highest expiration of any ancestor minus the number of generations
+        between the ancestor and the person, so it is 1 or higher if any ancestor has expired for the generation after
+        theirs. For descendants (``children``), this is the highest expiration of any descendant.
+
+        The lineage is swept depth-first, and every relative's lineage expiration is cached on the way, so that
+        determining the privacy of all people in an ancestry scales linearly.
+        """
+        with suppress(KeyError):
+            return self._lineage_expirations[relatives_attr_name, id(person)]
+
+        generation_shift = 1 if relatives_attr_name == "parents" else 0
+        lineage_expirations = self._lineage_expirations
+        # The stack depths of the people being swept.
+        depths: MutableMapping[int, int] = {}
+        # The lineage expirations of swept people that depend on a cycle through someone who is still on the stack,
+        # with the lowest stack depth they depend on. These are incomplete, and are discarded once the sweep leaves
+        # the stack depth they depend on.
+        incomplete: MutableMapping[int, tuple[int, int]] = {}
+        incomplete_by_low: MutableMapping[int, MutableSequence[int]] = defaultdict(list)
+        stack: MutableSequence[_LineageSweepFrame] = []
+
+        def _push(pushed_person: Person) -> None:
+            depths[id(pushed_person)] = len(stack)
+            stack.append(
+                _LineageSweepFrame(
+                    pushed_person,
+                    iter(
+                        pushed_person.parents
+                        if relatives_attr_name == "parents"
+                        else pushed_person.children
+                    ),
+                    len(stack),
+                )
+            )
+
+        _push(person)
+        while True:
+            frame = stack[-1]
+            for relative in frame.relatives:
+                relative_id = id(relative)
+                if (relatives_attr_name, relative_id) in lineage_expirations:
+                    relative_lineage_expiration = lineage_expirations[
+                        relatives_attr_name, relative_id
+                    ]
+                elif relative_id in depths:
+                    # This is a cycle. Anything reached through the relative is reached through the relative's own
+                    # frame as well.
+                    frame.low = min(frame.low, depths[relative_id])
+                    continue
+                elif relative_id in incomplete:
+                    relative_lineage_expiration, relative_low = incomplete[relative_id]
+                    frame.low = min(frame.low, relative_low)
+                else:
+                    _push(relative)
+                    break
+                frame.include(
+                    self._person_expiration(relative),
+                    relative_lineage_expiration,
+                    generation_shift,
+                )
+            else:
+                stack.pop()
+                del depths[id(frame.person)]
+                for incomplete_person_id in incomplete_by_low.pop(len(stack), ()):
+                    del incomplete[incomplete_person_id]
+                if frame.low >= len(stack):
+                    # Nothing this lineage depends on is still on the stack, so it is complete.
+                    lineage_expirations[relatives_attr_name, id(frame.person)] = (
+                        frame.expiration
+                    )
+                else:
+                    incomplete[id(frame.person)] = frame.expiration, frame.low
+                    incomplete_by_low[frame.low].append(id(frame.person))
+                if not stack:
+                    return frame.expiration
+                stack[-1].low = min(stack[-1].low, frame.low)
+                stack[-1].include(
+                    self._person_expiration(frame.person),
+                    frame.expiration,
+                    generation_shift,
+                )
 
     def _event_has_expired(self, event: Event, generations_ago: int) -> bool:
         date = event.date
@@ -285,11 +418,15 @@ class Privatizer:
         if not date.comparable:
             return False
 
-        return date <= Date(
-            datetime.now().year - self._lifetime_threshold * generations_ago,
-            datetime.now().month,
-            datetime.now().day,
-        )
+        try:
+            expiration_date = self._expiration_dates[generations_ago]
+        except KeyError:
+            expiration_date = self._expiration_dates[generations_ago] = Date(
+                self._now.year - self._lifetime_threshold * generations_ago,
+                self._now.month,
+                self._now.day,
+            )
+        return date <= expiration_date
 
     def _mark_private(self, target: HasPrivacy, reason: Any) -> None:
         # Do not change existing explicit privacy declarations.
@@ -297,8 +434,7 @@ class Privatizer:
             return
 
         target.private = True
-        with suppress(ValueError):
-            self._seen.remove(target)
+        self._seen.discard(id(target))
 
         if isinstance(target, Entity) and isinstance(reason, Entity):
             logging.getLogger(__name__).debug(
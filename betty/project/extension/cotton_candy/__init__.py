@@ -8,9 +8,10 @@ import json
 from asyncio import gather
 from collections import defaultdict
 from pathlib import Path
-from typing import Iterable, cast, TYPE_CHECKING, final, Self
+from typing import Iterable, cast, TYPE_CHECKING, final, Self, Any
 
 import aiofiles
+from aiofiles.os import makedirs
 from typing_extensions import override
 
 from betty.ancestry.event import Event
@@ -35,7 +36,12 @@ from betty.plugin import ShorthandPluginBase
 from betty.privacy import is_public
 from betty.project.extension import ConfigurableExtension, Theme, Extension
 from betty.project.extension.cotton_candy.config import CottonCandyConfiguration
-from betty.project.extension.cotton_candy.search import Index
+from betty.project.extension.cotton_candy.search import (
+    Index,
+    InvertedIndex,
+    extract_texts,
+    token_shard_name,
+)
 from betty.project.extension.maps import Maps
 from betty.project.extension.trees import Trees
 from betty.project.extension.webpack import Webpack, WebpackEntryPointProvider
@@ -50,6 +56,7 @@ if TYPE_CHECKING:
     from betty.plugin import PluginIdentifier
     from betty.event_dispatcher import EventHandlerRegistry
     from collections.abc import Sequence
+    from betty.project.extension.cotton_candy.search import EntityText
 
 _RESULT_CONTAINER_TEMPLATE = """
 <li class="search-result">
@@ -72,40 +79,65 @@ async def _generate_favicon(event: GenerateSiteEvent) -> None:
 
 
 async def _generate_search_index(event: GenerateSiteEvent) -> None:
+    texts = extract_texts(event.project.ancestry)
     await gather(
         *(
-            _generate_search_index_for_locale(event, locale)
+            _generate_search_index_for_locale(event, locale, texts)
             for locale in event.project.configuration.locales
         )
     )
 
 
 async def _generate_search_index_for_locale(
-    event: GenerateSiteEvent, locale: str
+    event: GenerateSiteEvent, locale: str, texts: Sequence[EntityText]
 ) -> None:
     project = event.project
     localizers = await project.localizers
     localizer = await localizers.get(locale)
-    search_index = {
-        "resultContainerTemplate": _RESULT_CONTAINER_TEMPLATE,
-        "resultsContainerTemplate": _RESULTS_CONTAINER_TEMPLATE,
-        "index": [
-            {"text": " ".join(entry.text), "result": entry.result}
-            for entry in await Index(
-                project.ancestry,
-                await project.jinja2_environment,
-                event.job_context,
-                localizer,
-            ).build()
-        ],
-    }
-    search_index_json = json.dumps(search_index)
-    async with aiofiles.open(
-        event.project.configuration.localize_www_directory_path(locale)
-        / "search-index.json",
-        mode="w",
-    ) as f:
-        await f.write(search_index_json)
+    index = InvertedIndex(
+        await Index(
+            project.ancestry,
+            await project.jinja2_environment,
+            event.job_context,
+            localizer,
+            texts=texts,
+        ).build()
+    )
+    search_directory_path = (
+        project.configuration.localize_www_directory_path(locale) / "search"
+    )
+    await makedirs(search_directory_path / "tokens", exist_ok=True)
+    await makedirs(search_directory_path / "results", exist_ok=True)
+    await gather(
+        _write_json(
+            search_directory_path / "index.json",
+            {
+                "resultContainerTemplate": _RESULT_CONTAINER_TEMPLATE,
+                "resultsContainerTemplate": _RESULTS_CONTAINER_TEMPLATE,
+                "tokenPrefixLength": index.token_prefix_length,
+                "tokenShards": {
+                    prefix: token_shard_name(prefix) for prefix in index.token_shards
+                },
+                "resultsPerShard": index.results_per_shard,
+            },
+        ),
+        *(
+            _write_json(
+                search_directory_path / "tokens" / f"{token_shard_name(prefix)}.json",
+                token_shard,
+            )
+            for prefix, token_shard in index.token_shards.items()
+        ),
+        *(
+            _write_json(search_directory_path / "results" / f"{ordinal}.json", results)
+            for ordinal, results in enumerate(index.result_shards)
+        ),
+    )
+
+
+async def _write_json(file_path: Path, dump: Any) -> None:
+    async with aiofiles.open(file_path, mode="w") as f:
+        await f.write(json.dumps(dump))
 
 
 @final
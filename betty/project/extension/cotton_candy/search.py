@@ -6,6 +6,7 @@ from __future__ import annotations
 
 from abc import ABC
 from asyncio import gather
+from collections import defaultdict
 from dataclasses import dataclass
 from inspect import getmembers
 from typing import TYPE_CHECKING, TypeVar, Generic, final
@@ -28,11 +29,29 @@ if TYPE_CHECKING:
     from betty.locale.localizable import StaticTranslationsLocalizable
     from betty.locale.localizer import Localizer
     from betty.job import Context
-    from collections.abc import Iterable, Sequence
+    from collections.abc import Iterator, Sequence, Mapping, MutableMapping
 
 _EntityT = TypeVar("_EntityT", bound=Entity)
 
 
+_TOKEN_PREFIX_LENGTH = 2
+"""
+The number of characters of a token that determine which token shard it is in.
+"""
+
+
+_RESULTS_PER_SHARD = 100
+"""
+The number of results in each result shard.
+"""
+
+
+_RENDER_CONCURRENCY = 64
+"""
+The maximum number of search results to render concurrently.
+"""
+
+
 def _static_translations_to_text(
     translations: StaticTranslationsLocalizable,
 ) -> set[str]:
@@ -44,6 +63,20 @@ def _static_translations_to_text(
 
 
 class _EntityTypeIndexer(Generic[_EntityT], ABC):
+    def __init__(self):
+        self._localizable_attr_names: MutableMapping[type[Entity], Sequence[str]] = {}
+
+    def _get_localizable_attr_names(self, entity_type: type[Entity]) -> Sequence[str]:
+        try:
+            return self._localizable_attr_names[entity_type]
+        except KeyError:
+            attr_names = self._localizable_attr_names[entity_type] = [
+                attr_name
+                for attr_name, class_attr_value in getmembers(entity_type)
+                if isinstance(class_attr_value, StaticTranslationsLocalizableAttr)
+            ]
+            return attr_names
+
     def text(self, entity: _EntityT) -> set[str]:
         text = set()
 
@@ -52,9 +85,8 @@ class _EntityTypeIndexer(Generic[_EntityT], ABC):
             for note in entity.notes:
                 text.update(_static_translations_to_text(note.text))
 
-        for attr_name, class_attr_value in getmembers(type(entity)):
-            if isinstance(class_attr_value, StaticTranslationsLocalizableAttr):
-                text.update(_static_translations_to_text(getattr(entity, attr_name)))
+        for attr_name in self._get_localizable_attr_names(type(entity)):
+            text.update(_static_translations_to_text(getattr(entity, attr_name)))
 
         return text
 
@@ -88,6 +120,20 @@ class _SourceIndexer(_EntityTypeIndexer[Source]):
     pass
 
 
+@internal
+@final
+class EntityText:
+    """
+    The searchable text of an entity.
+    """
+
+    __slots__ = "entity", "text"
+
+    def __init__(self, entity: Entity, text: set[str]):
+        self.entity = entity
+        self.text = text
+
+
 @final
 @dataclass(frozen=True)
 class _Entry:
@@ -95,6 +141,34 @@ class _Entry:
     result: str
 
 
+def _extract_entity_type_texts(
+    ancestry: Ancestry,
+    indexer: _EntityTypeIndexer[_EntityT],
+    entity_type: type[_EntityT],
+) -> Iterator[EntityText]:
+    for entity in ancestry[entity_type]:
+        if is_private(entity):
+            continue
+        text = indexer.text(entity)
+        if text:
+            yield EntityText(entity, text)
+
+
+@internal
+def extract_texts(ancestry: Ancestry) -> Sequence[EntityText]:
+    """
+    Extract the searchable text of all public entities.
+
+    Text does not depend on the locale, so it can be extracted once, and shared by the indexes for all locales.
+    """
+    return [
+        *_extract_entity_type_texts(ancestry, _PersonIndexer(), Person),
+        *_extract_entity_type_texts(ancestry, _PlaceIndexer(), Place),
+        *_extract_entity_type_texts(ancestry, _FileIndexer(), File),
+        *_extract_entity_type_texts(ancestry, _SourceIndexer(), Source),
+    ]
+
+
 @internal
 class Index:
     """
@@ -107,54 +181,42 @@ class Index:
         jinja2_environment: Environment,
         job_context: Context | None,
         localizer: Localizer,
+        *,
+        texts: Sequence[EntityText] | None = None,
     ):
+        """
+        :param texts: The texts extracted by :py:func:`betty.project.extension.cotton_candy.search.extract_texts`. If
+            omitted, they are extracted from the ancestry.
+        """
         self._ancestry = ancestry
         self._jinja2_environment = jinja2_environment
         self._job_context = job_context
         self._localizer = localizer
+        self._texts = texts
 
     async def build(self) -> Sequence[_Entry]:
         """
         Build the search index.
         """
-        return [
-            entry
-            for entries in await gather(
-                self._build_entities(_PersonIndexer(), Person),
-                self._build_entities(_PlaceIndexer(), Place),
-                self._build_entities(_FileIndexer(), File),
-                self._build_entities(_SourceIndexer(), Source),
-            )
-            for entry in entries
-            if entry is not None
-        ]
+        texts = extract_texts(self._ancestry) if self._texts is None else self._texts
+        results = [""] * len(texts)
+        ordinals = iter(range(len(texts)))
 
-    async def _build_entities(
-        self, indexer: _EntityTypeIndexer[_EntityT], entity_type: type[_EntityT]
-    ) -> Iterable[_Entry | None]:
-        return await gather(
-            *(
-                self._build_entity(indexer, entity)
-                for entity in self._ancestry[entity_type]
-            )
-        )
+        # Render results using a fixed number of workers, so the number of pending coroutines does not grow with the
+        # size of the ancestry.
+        async def _render() -> None:
+            for ordinal in ordinals:
+                results[ordinal] = await self._render_entity(texts[ordinal].entity)
 
-    async def _build_entity(
-        self, indexer: _EntityTypeIndexer[_EntityT], entity: _EntityT
-    ) -> _Entry | None:
-        if is_private(entity):
-            return None
-        text = indexer.text(entity)
-        if not text:
-            return None
-        return _Entry(text, await self._render_entity(entity))
+        await gather(*(_render() for _ in range(min(_RENDER_CONCURRENCY, len(texts)))))
+        return [
+            _Entry(text.text, result)
+            for text, result in zip(texts, results, strict=True)
+        ]
 
     async def _render_entity(self, entity: Entity) -> str:
-        return await self._jinja2_environment.select_template(
-            [
-                f"search/result--{entity.plugin_id()}.html.j2",
-                "search/result.html.j2",
-            ]
+        return await self._jinja2_environment.select_entity_template(
+            "search/result", entity.type
         ).render_async(
             {
                 "job_context": self._job_context,
@@ -162,3 +224,64 @@ class Index:
                 "entity": entity,
             }
         )
+
+
+def token_shard_name(prefix: str) -> str:
+    """
+    Get the name of a token shard, which is safe to use in file names and URLs.
+    """
+    return prefix.encode("utf-8").hex()
+
+
+@internal
+@final
+class InvertedIndex:
+    """
+    A search index that maps tokens to the ordinals of the entries they occur in.
+
+    Tokens are sharded by their prefix, and results are sharded by their ordinal, so that clients only need to fetch
+    the shards for the words they are searching for, and the results they are showing.
+    """
+
+    def __init__(self, entries: Sequence[_Entry]):
+        token_shards: MutableMapping[str, MutableMapping[str, list[int]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        for ordinal, entry in enumerate(entries):
+            for token in entry.text:
+                token_shards[token[:_TOKEN_PREFIX_LENGTH]][token].append(ordinal)
+        self._token_shards = token_shards
+        self._result_shards = [
+            [entry.result for entry in entries[offset : offset + _RESULTS_PER_SHARD]]
+            for offset in range(0, len(entries), _RESULTS_PER_SHARD)
+        ]
+
+    @property
+    def token_prefix_length(self) -> int:
+        """
+        The number of characters of a token that determine which token shard it is in.
+        """
+        return _TOKEN_PREFIX_LENGTH
+
+    @property
+    def results_per_shard(self) -> int:
+        """
+        The number of results in each result shard.
+        """
+        return _RESULTS_PER_SHARD
+
+    @property
+    def token_shards(self) -> Mapping[str, Mapping[str, Sequence[int]]]:
+        """
+        The token shards, keyed by token prefix.
+
+        Each shard maps its tokens to the ordinals of the entries they occur in.
+        """
+        return self._token_shards
+
+    @property
+    def result_shards(self) -> Sequence[Sequence[str]]:
+        """
+        The result shards, in order.
+        """
+        return self._result_shards
@@ -1,14 +1,15 @@
-interface IndexEntry {
-  text: string
-  result: string
-}
-
 interface Index {
-  index: IndexEntry[]
   resultContainerTemplate: string
   resultsContainerTemplate: string
+  tokenPrefixLength: number
+  tokenShards: Record<string, string>
+  resultsPerShard: number
 }
 
+type TokenShard = Record<string, number[]>
+
+type ResultShard = string[]
+
 class Search {
   private readonly hideSearchKeys = ['Escape']
   private readonly nextResultKeys = ['ArrowDown']
@@ -19,6 +20,8 @@ class Search {
   private readonly resultsContainer: HTMLElement
   private documentY: number
   private index: Index | null = null
+  private readonly tokenShards = new Map<string, Promise<TokenShard>>()
+  private readonly resultShards = new Map<number, Promise<ResultShard>>()
 
   public constructor () {
     this.search = document.getElementById('search')
@@ -101,8 +104,8 @@ class Search {
     }
   }
 
-  private setSearchEntries (entries: IndexEntry[]): void {
-    this.resultsContainer.innerHTML = this.renderResults(entries)
+  private setSearchResults (results: string[]): void {
+    this.resultsContainer.innerHTML = this.renderResults(results)
     this.resultsContainer.scrollTop = 0
   }
 
@@ -132,37 +135,98 @@ class Search {
     }
   }
 
+  private indexUrl (): URL {
+    return new URL(this.search.dataset.bettySearchIndex ?? '', document.baseURI)
+  }
+
+  private async fetchJson<T> (relativeUrl: string): Promise<T> {
+    const response = await fetch(new URL(relativeUrl, this.indexUrl()))
+    return await response.json() as T
+  }
+
   private async getIndex () :Promise<Index> {
     if (this.index === null) {
-      const response = await fetch(this.search.dataset.bettySearchIndex)
+      const response = await fetch(this.indexUrl())
       this.index = await response.json() as Index
     }
     return this.index
   }
 
+  private async getTokenShard (name: string): Promise<TokenShard> {
+    let tokenShard = this.tokenShards.get(name)
+    if (tokenShard === undefined) {
+      tokenShard = this.fetchJson<TokenShard>(`tokens/${name}.json`)
+      this.tokenShards.set(name, tokenShard)
+    }
+    return await tokenShard
+  }
+
+  private async getResultShard (ordinal: number): Promise<ResultShard> {
+    let resultShard = this.resultShards.get(ordinal)
+    if (resultShard === undefined) {
+      resultShard = this.fetchJson<ResultShard>(`results/${ordinal}.json`)
+      this.resultShards.set(ordinal, resultShard)
+    }
+    return await resultShard
+  }
+
   private async perform (query: string): Promise<void> {
     const index = await this.getIndex()
-    this.setSearchEntries(index.index.filter((entry) => this.match(query, entry.text)))
+    const ordinals = await this.match(index, query)
+    const results = await Promise.all(ordinals.map(async (ordinal) => {
+      const resultShard = await this.getResultShard(Math.floor(ordinal / index.resultsPerShard))
+      return resultShard[ordinal % index.resultsPerShard]
+    }))
+    // Ignore the results if the query changed while they were being fetched.
+    if (query === this.queryElement.value) {
+      this.setSearchResults(results)
+    }
   }
 
-  private match (query: string, haystack: string):boolean {
-    const queryParts = query.toLowerCase().split(/\s/)
-    for (const queryPart of queryParts) {
-      if (!haystack.includes(queryPart)) {
-        return false
+  private async match (index: Index, query: string): Promise<number[]> {
+    const queryParts = query.toLowerCase().split(/\s/).filter((queryPart) => queryPart.length > 0)
+    if (!queryParts.length) {
+      return []
+    }
+    let matches = await this.matchQueryPart(index, queryParts[0])
+    for (const queryPart of queryParts.slice(1)) {
+      if (!matches.size) {
+        break
+      }
+      const queryPartMatches = await this.matchQueryPart(index, queryPart)
+      matches = new Set([...matches].filter((ordinal) => queryPartMatches.has(ordinal)))
+    }
+    return [...matches].sort((a, b) => a - b)
+  }
+
+  private async matchQueryPart (index: Index, queryPart: string): Promise<Set<number>> {
+    // A token's shard is determined by its prefix, so a query part can only match tokens in the shards whose prefixes
+    // it starts with, or, if it is shorter than a prefix, that start with it.
+    const queryPartPrefix = Array.from(queryPart).slice(0, index.tokenPrefixLength).join('')
+    const tokenShardNames = Object.entries(index.tokenShards)
+      .filter(([prefix]) => prefix.startsWith(queryPartPrefix))
+      .map(([, name]) => name)
+    const matches = new Set<number>()
+    for (const tokenShard of await Promise.all(tokenShardNames.map(async (name) => await this.getTokenShard(name)))) {
+      for (const [token, ordinals] of Object.entries(tokenShard)) {
+        if (token.startsWith(queryPart)) {
+          for (const ordinal of ordinals) {
+            matches.add(ordinal)
+          }
+        }
       }
     }
-    return true
+    return matches
   }
 
-  private renderResults (entries: IndexEntry[]) :string {
+  private renderResults (results: string[]) :string {
     return this.index.resultsContainerTemplate
-      .replace('{{{ betty-search-results }}}', entries.map((entry) => this.renderResult(entry)).join(''))
+      .replace('{{{ betty-search-results }}}', results.map((result) => this.renderResult(result)).join(''))
   }
 
-  private renderResult (entry: IndexEntry) :string {
+  private renderResult (result: string) :string {
     return this.index.resultContainerTemplate
-      .replace('{{{ betty-search-result }}}', entry.result)
+      .replace('{{{ betty-search-result }}}', result)
   }
 }
 
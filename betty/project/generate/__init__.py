@@ -7,27 +7,25 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-import os
 import shutil
 from asyncio import (
     create_task,
-    Task,
     as_completed,
-    Semaphore,
     CancelledError,
+    Queue,
     sleep,
     to_thread,
     gather,
+    get_running_loop,
 )
-from collections.abc import MutableSequence, Coroutine
+from collections.abc import MutableSequence, Coroutine, MutableMapping, Mapping
 from contextlib import suppress
+from dataclasses import dataclass
+from multiprocessing import get_context
 from pathlib import Path
+from queue import Empty
 from typing import (
     cast,
-    ParamSpec,
-    Callable,
-    Awaitable,
-    Sequence,
     TYPE_CHECKING,
     Any,
 )
@@ -38,26 +36,32 @@ from aiofiles.os import makedirs
 from math import floor
 
 from betty import model
+from betty.app import App
 from betty.locale import get_display_name
 from betty.locale.localizable import _
 from betty.locale.localizer import DEFAULT_LOCALIZER
 from betty.media_type.media_types import JSON, HTML
 from betty.model import UserFacingEntity, Entity, has_generated_entity_id
+from betty.multiprocessing import ProcessPoolExecutor
 from betty.openapi import Specification
 from betty.privacy import is_public
-from betty.project import ProjectEvent, ProjectSchema, ProjectContext
+from betty.project import Project, ProjectEvent, ProjectSchema, ProjectContext
+from betty.project.config import ProjectConfiguration
 from betty.project.generate.file import (
     create_file,
-    create_html_resource,
     create_json_resource,
+    FileWriter,
+    set_permissions,
 )
+from betty.project.generate._manifest import Manifest
+from betty.project.generate._snapshot import dump_ancestry, load_ancestry
 from betty.string import kebab_case_to_lower_camel_case
 
 if TYPE_CHECKING:
-    from betty.project import Project
-    from betty.app import App
     from betty.serde.dump import DumpMapping, Dump
-    from collections.abc import AsyncIterator
+    from queue import Queue as ThreadingQueue
+    from threading import Event as ThreadingEvent
+    from collections.abc import AsyncIterator, Callable, Sequence
 
 
 class GenerateSiteEvent(ProjectEvent):
@@ -68,12 +72,45 @@ class GenerateSiteEvent(ProjectEvent):
     pass
 
 
-async def generate(project: Project) -> None:
+DEFAULT_CONCURRENCY = 512
+"""
+The default maximum number of site generation jobs to run concurrently.
+"""
+
+
+async def generate(
+    project: Project,
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    processes: int = 1,
+    incremental: bool = False,
+    job_context: ProjectContext | None = None,
+) -> None:
     """
     Generate a new site.
+
+    :param concurrency: The maximum number of jobs to run concurrently, per process.
+    :param processes: The number of processes to render entity pages in. If greater than 1, the entity pages
+        are partitioned into this many shards, each of which is rendered by a separate worker process.
+    :param incremental: Whether to continue from the previous build. If the previous build used the same
+        configuration, assets, and software versions, only the entity pages that render changed entities are
+        rendered again, and the pages of entities that no longer exist are deleted. Otherwise, the site is generated
+        from scratch.
+    :param job_context: The job context to generate the site within, e.g. to inspect its cache afterwards. If not
+        given, a new job context is created. Worker processes always use job contexts of their own.
+    :raises ValueError: Raised if ``concurrency`` or ``processes`` is smaller than 1.
     """
+    if concurrency < 1:
+        raise ValueError(
+            f"Concurrency must be at least 1, but {concurrency} was given."
+        )
+    if processes < 1:
+        raise ValueError(
+            f"The number of processes must be at least 1, but {processes} was given."
+        )
     logger = logging.getLogger(__name__)
-    job_context = ProjectContext(project)
+    if job_context is None:
+        job_context = ProjectContext(project)
     app = project.app
     localizer = await app.localizer
 
@@ -82,103 +119,407 @@ async def generate(project: Project) -> None:
             output_directory=project.configuration.output_directory_path
         )
     )
-    with suppress(FileNotFoundError):
-        await asyncio.to_thread(
-            shutil.rmtree, project.configuration.output_directory_path
+    manifest = None
+    if incremental:
+        manifest = await Manifest.new_for_project(project)
+        previous_manifest = await Manifest.read(
+            project.configuration.output_directory_path
         )
+        if previous_manifest is None or not manifest.continue_from(previous_manifest):
+            logger.info(
+                localizer._(
+                    "Cannot continue from the previous build. Generating your entire site."
+                )
+            )
+            await _clear_output_directory(project)
+        await manifest.track_entities(project)
+    else:
+        await _clear_output_directory(project)
     await makedirs(project.configuration.output_directory_path, exist_ok=True)
 
     # The static public assets may be overridden depending on the number of locales rendered, so ensure they are
     # generated before anything else.
     await _generate_static_public_assets(job_context)
 
-    jobs = []
-    log_job: Task[None] | None = None
+    await _select_entity_templates(project)
+
+    progress = _JobProgress()
+    log_job = create_task(_log_jobs_forever(app, progress))
     try:
-        async for job_coroutine in _run_jobs(job_context):
-            jobs.append(create_task(job_coroutine))
-        log_job = create_task(_log_jobs_forever(app, jobs))
-        for completed_job in as_completed(jobs):
-            await completed_job
-    except BaseException:
-        for job in jobs:
-            job.cancel()
-        raise
+        async with FileWriter() as writer:
+            # Jobs are created lazily, so count them up front to be able to report progress as a percentage.
+            progress.total = await _count_jobs(project)
+            if processes > 1:
+                await _run_sharded_jobs(
+                    job_context,
+                    progress,
+                    concurrency=concurrency,
+                    processes=processes,
+                    manifest=manifest,
+                )
+            else:
+                await _run_job_pool(
+                    _run_jobs(job_context, writer, manifest=manifest),
+                    progress,
+                    concurrency=concurrency,
+                )
     finally:
-        if log_job is not None:  # type: ignore[redundant-expr]
-            log_job.cancel()
-    await _log_jobs(app, jobs)
+        log_job.cancel()
+    await _log_jobs(app, progress)
 
-    project.configuration.output_directory_path.chmod(0o755)
-    for directory_path_str, subdirectory_names, file_names in os.walk(
-        project.configuration.output_directory_path
-    ):
-        directory_path = Path(directory_path_str)
-        for subdirectory_name in subdirectory_names:
-            (directory_path / subdirectory_name).chmod(0o755)
-        for file_name in file_names:
-            (directory_path / file_name).chmod(0o644)
+    if manifest is not None:
+        await to_thread(manifest.prune)
+        await manifest.write()
+
+    await set_permissions(project.configuration.output_directory_path)
+
+
+async def _select_entity_templates(project: Project) -> None:
+    """
+    Select the entity page templates up front, so entity page jobs do not have to look them up.
+    """
+    jinja2_environment = await project.jinja2_environment
+    async for entity_type in model.ENTITY_TYPE_REPOSITORY:
+        if issubclass(entity_type, UserFacingEntity):
+            for role in ("entity/page", "entity/page-list"):
+                jinja2_environment.select_entity_template(role, entity_type)
+
+
+async def _clear_output_directory(project: Project) -> None:
+    with suppress(FileNotFoundError):
+        await asyncio.to_thread(
+            shutil.rmtree, project.configuration.output_directory_path
+        )
 
 
-async def _log_jobs(app: App, jobs: Sequence[Task[None]]) -> None:
+class _JobProgress:
+    def __init__(self):
+        self.total = 0
+        self.completed = 0
+        self.shards: MutableMapping[int, int] = {}
+
+    def merge(self, shard: int, completed: int) -> None:
+        """
+        Merge the progress reported by a shard.
+        """
+        self.shards[shard] = completed
+
+    @property
+    def overall_completed(self) -> int:
+        return self.completed + sum(self.shards.values())
+
+
+async def _count_jobs(project: Project) -> int:
+    """
+    Count the jobs that :py:func:`betty.project.generate._run_jobs` yields, without creating them.
+    """
+    locale_count = len(project.configuration.locales)
+    count = len(_site_jobs()) + locale_count
+    async for entity_type in model.ENTITY_TYPE_REPOSITORY:
+        if not issubclass(entity_type, UserFacingEntity):
+            continue
+        if (
+            entity_type in project.configuration.entity_types
+            and project.configuration.entity_types[entity_type].generate_html_list
+        ):
+            count += locale_count
+        count += 1
+        for entity in project.ancestry[entity_type]:
+            if has_generated_entity_id(entity):
+                continue
+            count += 1
+            if is_public(entity):
+                count += locale_count
+    return count
+
+
+async def _run_job_pool(
+    jobs: AsyncIterator[Coroutine[Any, Any, None]],
+    progress: _JobProgress,
+    *,
+    concurrency: int,
+) -> None:
+    """
+    Run jobs using a fixed number of workers.
+
+    Jobs are pulled from the iterator only when there is room for them in a bounded queue, so that the number of
+    pending job coroutines stays constant, regardless of how many jobs there are in total.
+    """
+    queue: Queue[Coroutine[Any, Any, None] | None] = Queue(concurrency)
+
+    async def _produce() -> None:
+        async for job in jobs:
+            try:
+                await queue.put(job)
+            except BaseException:
+                job.close()
+                raise
+        for __ in range(concurrency):
+            await queue.put(None)
+
+    async def _consume() -> None:
+        while (job := await queue.get()) is not None:
+            await job
+            progress.completed += 1
+
+    workers = [
+        create_task(_produce()),
+        *(create_task(_consume()) for __ in range(concurrency)),
+    ]
+    try:
+        for completed_worker in as_completed(workers):
+            await completed_worker
+    except BaseException:
+        for worker in workers:
+            worker.cancel()
+        while not queue.empty():
+            job = queue.get_nowait()
+            if job is not None:
+                job.close()
+        raise
+
+
+async def _log_jobs(app: App, progress: _JobProgress) -> None:
     localizer = await app.localizer
-    total_job_count = len(jobs)
-    completed_job_count = len([job for job in jobs if job.done()])
     logging.getLogger(__name__).info(
         localizer._(
             "Generated {completed_job_count} out of {total_job_count} items ({completed_job_percentage}%)."
         ).format(
-            completed_job_count=completed_job_count,
-            total_job_count=total_job_count,
-            completed_job_percentage=floor(
-                completed_job_count / (total_job_count / 100)
-            ),
+            completed_job_count=progress.overall_completed,
+            total_job_count=progress.total,
+            completed_job_percentage=min(
+                floor(progress.overall_completed / (progress.total / 100)), 100
+            )
+            if progress.total
+            else 0,
         )
     )
 
 
-async def _log_jobs_forever(app: App, jobs: Sequence[Task[None]]) -> None:
+async def _log_jobs_forever(app: App, progress: _JobProgress) -> None:
     with suppress(CancelledError):
         while True:
-            await _log_jobs(app, jobs)
+            await _log_jobs(app, progress)
             await sleep(5)
 
 
-_JobP = ParamSpec("_JobP")
+@dataclass(frozen=True)
+class _Shard:
+    """
+    Everything a worker process needs to render a shard of the entity pages.
+    """
 
+    index: int
+    count: int
+    concurrency: int
+    app: App
+    project_configuration_file_path: Path
+    project_configuration_dump: Dump
+    ancestry_snapshot: bytes
+    progress_queue: ThreadingQueue[tuple[int, int]]
+    cancel: ThreadingEvent
+    manifest: Manifest | None
 
-def _run_job(
-    semaphore: Semaphore,
-    f: Callable[_JobP, Awaitable[None]],
-    *args: _JobP.args,
-    **kwargs: _JobP.kwargs,
-) -> Coroutine[Any, Any, None]:
-    async def _job():
-        async with semaphore:
-            await f(*args, **kwargs)
 
-    return _job()
+async def _run_sharded_jobs(
+    job_context: ProjectContext,
+    progress: _JobProgress,
+    *,
+    concurrency: int,
+    processes: int,
+    manifest: Manifest | None,
+) -> None:
+    """
+    Run the site jobs in this process, and the entity jobs in ``processes`` worker processes.
+    """
+    project = job_context.project
+    app = project.app
+    ancestry_snapshot = await to_thread(dump_ancestry, project.ancestry)
+    loop = get_running_loop()
+    # Shut down the process pool before the manager, so that the workers can still reach the manager until then.
+    with (
+        get_context("spawn").Manager() as manager,
+        ProcessPoolExecutor(max_workers=processes) as executor,
+    ):
+        progress_queue = manager.Queue()
+        # Workers ignore SIGINT, so they must be told to stop when generation fails or is interrupted.
+        cancel = manager.Event()
+        shard_jobs = [
+            loop.run_in_executor(
+                executor,
+                _generate_shard,
+                _Shard(
+                    index=shard,
+                    count=processes,
+                    concurrency=concurrency,
+                    app=app,
+                    project_configuration_file_path=project.configuration.configuration_file_path,
+                    project_configuration_dump=project.configuration.dump(),
+                    ancestry_snapshot=ancestry_snapshot,
+                    progress_queue=progress_queue,
+                    cancel=cancel,
+                    manifest=manifest,
+                ),
+            )
+            for shard in range(processes)
+        ]
+        site_job = create_task(
+            _run_job_pool(
+                _run_site_jobs(job_context), progress, concurrency=concurrency
+            )
+        )
+        merge_job = create_task(_merge_shard_progress_forever(progress_queue, progress))
+        try:
+            __, shard_manifest_files = await gather(site_job, gather(*shard_jobs))
+        except BaseException:
+            cancel.set()
+            site_job.cancel()
+            await gather(
+                site_job,
+                to_thread(executor.shutdown, wait=True, cancel_futures=True),
+                return_exceptions=True,
+            )
+            raise
+        finally:
+            merge_job.cancel()
+        _merge_shard_progress(progress_queue, progress)
+    if manifest is not None:
+        for files in shard_manifest_files:
+            manifest.files.update(files)
+
+
+def _merge_shard_progress(
+    progress_queue: ThreadingQueue[tuple[int, int]], progress: _JobProgress
+) -> None:
+    with suppress(Empty):
+        while True:
+            progress.merge(*progress_queue.get_nowait())
+
+
+async def _merge_shard_progress_forever(
+    progress_queue: ThreadingQueue[tuple[int, int]], progress: _JobProgress
+) -> None:
+    with suppress(CancelledError):
+        while True:
+            _merge_shard_progress(progress_queue, progress)
+            await sleep(1)
+
+
+def _generate_shard(shard: _Shard) -> Mapping[str, str]:
+    return asyncio.run(_generate_shard_async(shard))
+
+
+async def _generate_shard_async(shard: _Shard) -> Mapping[str, str]:
+    """
+    Generate a shard.
+
+    :return: The manifest entries for the files generated by the shard.
+    """
+    async with shard.app as app:
+        project_configuration = await ProjectConfiguration.new(
+            shard.project_configuration_file_path
+        )
+        project_configuration.load(shard.project_configuration_dump)
+        ancestry = await load_ancestry(shard.ancestry_snapshot)
+        async with (
+            Project(app, project_configuration, ancestry=ancestry) as project,
+            FileWriter() as writer,
+        ):
+            await _select_entity_templates(project)
+            progress = _JobProgress()
+            pool_job = create_task(
+                _run_job_pool(
+                    _run_entity_jobs(
+                        ProjectContext(project),
+                        writer,
+                        shard=shard.index,
+                        shards=shard.count,
+                        manifest=shard.manifest,
+                    ),
+                    progress,
+                    concurrency=shard.concurrency,
+                )
+            )
+
+            def _report_progress() -> None:
+                shard.progress_queue.put((shard.index, progress.completed))
+
+            async def _report_progress_forever() -> None:
+                with suppress(CancelledError):
+                    while not shard.cancel.is_set():
+                        _report_progress()
+                        await sleep(1)
+                    pool_job.cancel()
+
+            report_job = create_task(_report_progress_forever())
+            try:
+                await pool_job
+            finally:
+                report_job.cancel()
+            _report_progress()
+    return {} if shard.manifest is None else shard.manifest.files
 
 
 async def _run_jobs(
     job_context: ProjectContext,
+    writer: FileWriter,
+    *,
+    manifest: Manifest | None = None,
+) -> AsyncIterator[Coroutine[Any, Any, None]]:
+    async for job in _run_site_jobs(job_context):
+        yield job
+    async for job in _run_entity_jobs(job_context, writer, manifest=manifest):
+        yield job
+
+
+def _site_jobs() -> Sequence[Callable[[ProjectContext], Coroutine[Any, Any, None]]]:
+    return (
+        _generate_favicon,
+        lambda job_context: _generate_json_error_responses(job_context.project),
+        _generate_dispatch,
+        _generate_robots_txt,
+        _generate_sitemap,
+        _generate_json_schema,
+        _generate_openapi,
+    )
+
+
+async def _run_site_jobs(
+    job_context: ProjectContext,
 ) -> AsyncIterator[Coroutine[Any, Any, None]]:
     project = job_context.project
-    semaphore = Semaphore(512)
-    yield _run_job(semaphore, _generate_favicon, job_context)
-    yield _run_job(semaphore, _generate_json_error_responses, project)
-    yield _run_job(semaphore, _generate_dispatch, job_context)
-    yield _run_job(semaphore, _generate_robots_txt, job_context)
-    yield _run_job(semaphore, _generate_sitemap, job_context)
-    yield _run_job(semaphore, _generate_json_schema, job_context)
-    yield _run_job(semaphore, _generate_openapi, job_context)
+    for site_job in _site_jobs():
+        yield site_job(job_context)
+
+    for locale in project.configuration.locales:
+        yield _generate_localized_public_assets(job_context, locale)
 
+
+async def _run_entity_jobs(
+    job_context: ProjectContext,
+    writer: FileWriter,
+    *,
+    shard: int = 0,
+    shards: int = 1,
+    manifest: Manifest | None = None,
+) -> AsyncIterator[Coroutine[Any, Any, None]]:
+    """
+    Yield the jobs to generate entity pages.
+
+    The jobs write their files using ``writer``.
+
+    The jobs are partitioned into ``shards`` shards, and only the jobs for shard ``shard`` are yielded.
+
+    If a manifest is given, the entity jobs skip the pages whose inputs did not change.
+    """
+    project = job_context.project
     locales = list(project.configuration.locales.keys())
+    job_index = -1
 
-    for locale in locales:
-        yield _run_job(
-            semaphore, _generate_localized_public_assets, job_context, locale
-        )
+    def _in_shard() -> bool:
+        nonlocal job_index
+        job_index += 1
+        return job_index % shards == shard
 
     async for entity_type in model.ENTITY_TYPE_REPOSITORY:
         if not issubclass(entity_type, UserFacingEntity):
@@ -188,33 +529,31 @@ async def _run_jobs(
             and project.configuration.entity_types[entity_type].generate_html_list
         ):
             for locale in locales:
-                yield _run_job(
-                    semaphore,
-                    _generate_entity_type_list_html,
-                    job_context,
-                    locale,
-                    entity_type,
-                )
-        yield _run_job(
-            semaphore, _generate_entity_type_list_json, job_context, entity_type
-        )
+                if _in_shard():
+                    yield _generate_entity_type_list_html(
+                        job_context, writer, locale, entity_type
+                    )
+        if _in_shard():
+            yield _generate_entity_type_list_json(job_context, writer, entity_type)
         for entity in project.ancestry[entity_type]:
             if has_generated_entity_id(entity):
                 continue
 
-            yield _run_job(
-                semaphore, _generate_entity_json, job_context, entity_type, entity.id
-            )
+            if _in_shard():
+                yield _generate_entity_json(
+                    job_context, writer, entity_type, entity.id, manifest=manifest
+                )
             if is_public(entity):
                 for locale in locales:
-                    yield _run_job(
-                        semaphore,
-                        _generate_entity_html,
-                        job_context,
-                        locale,
-                        entity_type,
-                        entity.id,
-                    )
+                    if _in_shard():
+                        yield _generate_entity_html(
+                            job_context,
+                            writer,
+                            locale,
+                            entity_type,
+                            entity.id,
+                            manifest=manifest,
+                        )
 
 
 async def _generate_dispatch(job_context: ProjectContext) -> None:
@@ -339,6 +678,7 @@ async def _generate_json_error_responses(project: Project) -> None:
 
 async def _generate_entity_type_list_html(
     job_context: ProjectContext,
+    writer: FileWriter,
     locale: str,
     entity_type: type[Entity],
 ) -> None:
@@ -349,11 +689,8 @@ async def _generate_entity_type_list_html(
         project.configuration.localize_www_directory_path(locale)
         / entity_type.plugin_id()
     )
-    template = jinja2_environment.select_template(
-        [
-            f"entity/page-list--{entity_type.plugin_id()}.html.j2",
-            "entity/page-list.html.j2",
-        ]
+    template = jinja2_environment.select_entity_template(
+        "entity/page-list", entity_type
     )
     rendered_html = await template.render_async(
         job_context=job_context,
@@ -362,12 +699,12 @@ async def _generate_entity_type_list_html(
         entity_type=entity_type,
         entities=project.ancestry[entity_type],
     )
-    async with create_html_resource(entity_type_path) as f:
-        await f.write(rendered_html)
+    await writer.write_html_resource(entity_type_path, rendered_html)
 
 
 async def _generate_entity_type_list_json(
     job_context: ProjectContext,
+    writer: FileWriter,
     entity_type: type[Entity],
 ) -> None:
     project = job_context.project
@@ -391,16 +728,17 @@ async def _generate_entity_type_list_json(
                 absolute=True,
             )
         )
-    rendered_json = json.dumps(data)
-    async with create_json_resource(entity_type_path) as f:
-        await f.write(rendered_json)
+    await writer.write_json_resource(entity_type_path, json.dumps(data))
 
 
 async def _generate_entity_html(
     job_context: ProjectContext,
+    writer: FileWriter,
     locale: str,
     entity_type: type[Entity],
     entity_id: str,
+    *,
+    manifest: Manifest | None = None,
 ) -> None:
     project = job_context.project
     app = project.app
@@ -411,11 +749,12 @@ async def _generate_entity_html(
         / entity_type.plugin_id()
         / entity.id
     )
-    rendered_html = await jinja2_environment.select_template(
-        [
-            f"entity/page--{entity_type.plugin_id()}.html.j2",
-            "entity/page.html.j2",
-        ]
+    if manifest is not None and not manifest.page_changed(
+        entity_path / "index.html", entity, locale
+    ):
+        return
+    rendered_html = await jinja2_environment.select_entity_template(
+        "entity/page", entity_type
     ).render_async(
         job_context=job_context,
         localizer=await app.localizers.get(locale),
@@ -423,23 +762,29 @@ async def _generate_entity_html(
         entity_type=entity.type,
         entity=entity,
     )
-    async with create_html_resource(entity_path) as f:
-        await f.write(rendered_html)
+    await writer.write_html_resource(entity_path, rendered_html)
 
 
 async def _generate_entity_json(
     job_context: ProjectContext,
+    writer: FileWriter,
     entity_type: type[Entity],
     entity_id: str,
+    *,
+    manifest: Manifest | None = None,
 ) -> None:
     project = job_context.project
     entity_path = (
         project.configuration.www_directory_path / entity_type.plugin_id() / entity_id
     )
     entity = project.ancestry[entity_type][entity_id]
-    rendered_json = json.dumps(await entity.dump_linked_data(project))
-    async with create_json_resource(entity_path) as f:
-        await f.write(rendered_json)
+    if manifest is not None and not manifest.changed(
+        entity_path / "index.json", await manifest.entity_digest(project, entity)
+    ):
+        return
+    await writer.write_json_resource(
+        entity_path, json.dumps(await entity.dump_linked_data(project))
+    )
 
 
 _ROBOTS_TXT_TEMPLATE = """Sitemap: {{{ sitemap }}}"""
@@ -0,0 +1,413 @@
+"""
+Keep track of the inputs of generated files, so unchanged files can be skipped by subsequent builds.
+"""
+
+from __future__ import annotations
+
+import json
+from asyncio import to_thread
+from contextlib import suppress
+from importlib import metadata
+from itertools import chain
+from pathlib import Path
+from typing import Any, Self, TYPE_CHECKING, TypeGuard
+
+import aiofiles
+from aiofiles.os import makedirs
+
+from betty import about
+from betty.ancestry.person import Person
+from betty.ancestry.place import Place
+from betty.hashid import hashid, hashid_file_content, hashid_sequence
+from betty.model import Entity, GeneratedEntityId, has_generated_entity_id
+from betty.model.association import AssociationRegistry
+
+if TYPE_CHECKING:
+    from betty.project import Project
+    from betty.serde.dump import Dump
+    from collections.abc import (
+        Iterable,
+        Iterator,
+        Mapping,
+        MutableMapping,
+        MutableSet,
+        Sequence,
+        Set,
+    )
+
+
+_VERSION = 2
+
+_PAGE_ASSOCIATE_DEPTH = 3
+"""
+How many associations away from an entity its page renders other entities, e.g. a person's presence's event's place.
+"""
+
+
+def _normalize_dump(dump: Dump) -> Dump:
+    # Generated entity IDs change every time an ancestry is loaded, so they must not affect digests.
+    if isinstance(dump, GeneratedEntityId):
+        return ""
+    if isinstance(dump, dict):
+        return {key: _normalize_dump(value) for key, value in dump.items()}
+    if isinstance(dump, list):
+        return [_normalize_dump(value) for value in dump]
+    return dump
+
+
+def _is_digest_mapping(value: Any) -> TypeGuard[Mapping[str, str]]:
+    return isinstance(value, dict) and all(
+        isinstance(key, str) and isinstance(digest, str)
+        for key, digest in value.items()
+    )
+
+
+def _entity_key(entity: Entity) -> str:
+    return f"{entity.type.plugin_id()}/{entity.id}"
+
+
+def _associates(entity: Entity) -> Iterator[Entity]:
+    for association in AssociationRegistry.get_all_associations(entity):
+        yield from association.get_associates(entity)
+
+
+def _walk_enclosures(place: Place) -> Iterator[Place]:
+    """
+    Walk over all places enclosing, or enclosed by a place.
+    """
+    seen = {id(place)}
+    places = [place]
+    while places:
+        current_place = places.pop()
+        for enclosure_place in chain(
+            (enclosure.encloser for enclosure in current_place.enclosers),
+            (enclosure.enclosee for enclosure in current_place.enclosees),
+        ):
+            if id(enclosure_place) not in seen:
+                seen.add(id(enclosure_place))
+                places.append(enclosure_place)
+                yield enclosure_place
+
+
+def _invalidated_entity_keys(changed_entities: Iterable[Entity]) -> Set[str]:
+    """
+    Get the keys of the entities whose pages render any of the given, changed entities.
+
+    Pages render their entity's associates, and the associates of those in turn. Person pages summarize entire
+    lineages, such as the names of all ancestors and descendants, and the events of relatives. Place labels include
+    the names of all enclosing places, and place pages list all enclosed places.
+    """
+    seen: MutableSet[int] = set()
+    frontier: list[Entity] = []
+
+    def _visit(entity: Entity) -> None:
+        if id(entity) not in seen:
+            seen.add(id(entity))
+            frontier.append(entity)
+
+    for changed_entity in changed_entities:
+        _visit(changed_entity)
+        if isinstance(changed_entity, Place):
+            for enclosure_place in _walk_enclosures(changed_entity):
+                _visit(enclosure_place)
+
+    invalidated_entity_keys: MutableSet[str] = set()
+    lineage_people: MutableSet[int] = set()
+    for depth in range(_PAGE_ASSOCIATE_DEPTH + 1):
+        associates: list[Entity] = []
+        for entity in frontier:
+            if not has_generated_entity_id(entity):
+                invalidated_entity_keys.add(_entity_key(entity))
+            if isinstance(entity, Person) and id(entity) not in lineage_people:
+                lineage_people.add(id(entity))
+                invalidated_entity_keys.update(
+                    _entity_key(relative)
+                    for relative in chain(
+                        entity.ancestors, entity.descendants, entity.siblings
+                    )
+                    if not has_generated_entity_id(relative)
+                )
+            if depth < _PAGE_ASSOCIATE_DEPTH:
+                associates.extend(_associates(entity))
+        frontier = []
+        for associate in associates:
+            _visit(associate)
+    return invalidated_entity_keys
+
+
+def _extension_version(
+    extension_type: type[Any], distributions: Mapping[str, Sequence[str]]
+) -> str:
+    return ",".join(
+        metadata.version(distribution_name)
+        for distribution_name in distributions.get(
+            extension_type.__module__.split(".")[0], ()
+        )
+    )
+
+
+class Manifest:
+    """
+    A build manifest.
+
+    The manifest maps each generated file (relative to the output directory) to a digest of the file's inputs, and each
+    entity to a digest of its linked data.
+    """
+
+    def __init__(
+        self,
+        output_directory_path: Path,
+        *,
+        configuration_digest: str,
+        assets_digest: str,
+        versions_digest: str,
+        files: Mapping[str, str] | None = None,
+        entities: Mapping[str, str] | None = None,
+    ):
+        self._output_directory_path = output_directory_path
+        self._configuration_digest = configuration_digest
+        self._assets_digest = assets_digest
+        self._versions_digest = versions_digest
+        self._previous_files: Mapping[str, str] = {}
+        self._existing_previous_files: Set[str] | None = None
+        self._previous_entities: Mapping[str, str] | None = None
+        self.files: MutableMapping[str, str] = {**files} if files else {}
+        self.entities: MutableMapping[str, str] = {**entities} if entities else {}
+        self._invalidated_entity_keys: Set[str] = set()
+        self._entity_digests: MutableMapping[int, str] = {}
+
+    def __getstate__(self) -> Any:
+        # Entity digests are keyed by object identity, which is meaningless in other processes.
+        return {**self.__dict__, "_entity_digests": {}}
+
+    @classmethod
+    async def new_for_project(cls, project: Project) -> Self:
+        """
+        Create a new, empty manifest for a project's current configuration, assets, and software versions.
+        """
+        configuration_digest = hashid(
+            json.dumps(project.configuration.dump(), sort_keys=True)
+        )
+        assets = await project.assets
+        asset_paths = sorted(
+            {
+                asset_path
+                for asset_directory_path in (Path("templates"), Path("locale"))
+                async for asset_path in assets.walk(asset_directory_path)
+            }
+        )
+        assets_digest = hashid_sequence(
+            *[
+                hashid_sequence(
+                    asset_path.as_posix(),
+                    await hashid_file_content(await assets.get(asset_path)),
+                )
+                for asset_path in asset_paths
+            ]
+        )
+        extensions = await project.extensions
+        distributions = metadata.packages_distributions()
+        versions_digest = hashid_sequence(
+            about.version(),
+            *sorted(
+                f"{extension.plugin_id()}:{_extension_version(type(extension), distributions)}"
+                for extension in extensions.flatten()
+            ),
+        )
+        return cls(
+            project.configuration.output_directory_path,
+            configuration_digest=configuration_digest,
+            assets_digest=assets_digest,
+            versions_digest=versions_digest,
+        )
+
+    @classmethod
+    def file_path(cls, output_directory_path: Path) -> Path:
+        """
+        Get the path to the manifest file for an output directory.
+        """
+        return output_directory_path / "manifest.json"
+
+    @classmethod
+    async def read(cls, output_directory_path: Path) -> Self | None:
+        """
+        Read the manifest from a previous build, if there is one.
+        """
+        try:
+            async with aiofiles.open(cls.file_path(output_directory_path)) as f:
+                dump = json.loads(await f.read())
+        except (FileNotFoundError, UnicodeDecodeError, json.JSONDecodeError):
+            return None
+        if not isinstance(dump, dict) or dump.get("version") != _VERSION:
+            return None
+        configuration_digest = dump.get("configuration")
+        assets_digest = dump.get("assets")
+        versions_digest = dump.get("versions")
+        files = dump.get("files")
+        entities = dump.get("entities")
+        if (
+            not isinstance(configuration_digest, str)
+            or not isinstance(assets_digest, str)
+            or not isinstance(versions_digest, str)
+            or not _is_digest_mapping(files)
+            or not _is_digest_mapping(entities)
+        ):
+            return None
+        return cls(
+            output_directory_path,
+            configuration_digest=configuration_digest,
+            assets_digest=assets_digest,
+            versions_digest=versions_digest,
+            files=files,
+            entities=entities,
+        )
+
+    async def write(self) -> None:
+        """
+        Write the manifest to disk.
+        """
+        file_path = self.file_path(self._output_directory_path)
+        await makedirs(file_path.parent, exist_ok=True)
+        async with aiofiles.open(file_path, "w") as f:
+            await f.write(
+                json.dumps(
+                    {
+                        "version": _VERSION,
+                        "configuration": self._configuration_digest,
+                        "assets": self._assets_digest,
+                        "versions": self._versions_digest,
+                        "files": self.files,
+                        "entities": self.entities,
+                    }
+                )
+            )
+
+    def continue_from(self, previous: Manifest) -> bool:
+        """
+        Continue from the manifest of a previous build.
+
+        Previous builds can only be continued if they used the same configuration, assets, and software versions,
+        because those affect files that are not tracked by the manifest.
+
+        :return: Whether the previous build can be continued.
+        """
+        if (
+            previous._configuration_digest != self._configuration_digest
+            or previous._assets_digest != self._assets_digest
+            or previous._versions_digest != self._versions_digest
+        ):
+            return False
+        self._previous_files = previous.files
+        self._previous_entities = previous.entities
+        return True
+
+    async def track_entities(self, project: Project) -> None:
+        """
+        Record the digests of all entities, and find the entity pages that render entities changed since the
+        previous build.
+        """
+        # Check which previously generated files still exist all at once, rather than for each file separately.
+        self._existing_previous_files = await to_thread(self._find_previous_files)
+        changed_entities = []
+        for entity in project.ancestry:
+            if has_generated_entity_id(entity):
+                continue
+            entity_key = _entity_key(entity)
+            digest = self.entities[entity_key] = await self._tracked_entity_digest(
+                project, entity
+            )
+            if (
+                self._previous_entities is not None
+                and self._previous_entities.get(entity_key) != digest
+            ):
+                changed_entities.append(entity)
+        # Without a previous build, all pages are generated anyway.
+        if self._previous_entities is not None:
+            self._invalidated_entity_keys = _invalidated_entity_keys(changed_entities)
+
+    def _find_previous_files(self) -> Set[str]:
+        return {
+            file_key
+            for file_key in self._previous_files
+            if (self._output_directory_path / file_key).exists()
+        }
+
+    async def _tracked_entity_digest(self, project: Project, entity: Entity) -> str:
+        # Entities with generated IDs cannot be recognized across builds, so include them in the digests of the
+        # entities they are associated with instead.
+        digests = []
+        seen = {id(entity)}
+        generated_entities = [entity]
+        while generated_entities:
+            for associate in _associates(generated_entities.pop()):
+                if has_generated_entity_id(associate) and id(associate) not in seen:
+                    seen.add(id(associate))
+                    generated_entities.append(associate)
+                    digests.append(await self.entity_digest(project, associate))
+        return hashid_sequence(
+            await self.entity_digest(project, entity), *sorted(digests)
+        )
+
+    async def entity_digest(self, project: Project, entity: Entity) -> str:
+        """
+        Create a digest of an entity's linked data.
+        """
+        try:
+            return self._entity_digests[id(entity)]
+        except KeyError:
+            digest = self._entity_digests[id(entity)] = hashid(
+                json.dumps(
+                    _normalize_dump(await entity.dump_linked_data(project)),
+                    sort_keys=True,
+                )
+            )
+            return digest
+
+    def changed(self, file_path: Path, *inputs: str) -> bool:
+        """
+        Record a file's inputs, and check if they changed since the previous build.
+
+        :return: Whether the file must be (re)generated.
+        """
+        file_key = file_path.relative_to(self._output_directory_path).as_posix()
+        digest = self.files[file_key] = hashid_sequence(
+            self._configuration_digest,
+            self._assets_digest,
+            self._versions_digest,
+            *inputs,
+        )
+        if self._previous_files.get(file_key) != digest:
+            return True
+        if self._existing_previous_files is None:
+            return not file_path.exists()
+        return file_key not in self._existing_previous_files
+
+    def page_changed(self, file_path: Path, entity: Entity, *inputs: str) -> bool:
+        """
+        Record an entity page's inputs, and check if they, or any of the entities the page renders, changed since the
+        previous build.
+
+        This requires the entities to have been tracked first, using :py:meth:`betty.project.generate._manifest.Manifest.track_entities`.
+
+        :return: Whether the page must be (re)generated.
+        """
+        entity_key = _entity_key(entity)
+        changed = self.changed(file_path, self.entities.get(entity_key, ""), *inputs)
+        return changed or entity_key in self._invalidated_entity_keys
+
+    def prune(self) -> None:
+        """
+        Delete the files generated by the previous build that were not generated by this build.
+        """
+        for file_key in self._previous_files.keys() - self.files.keys():
+            file_path = self._output_directory_path / file_key
+            with suppress(FileNotFoundError):
+                file_path.unlink()
+            # Remove the directories that became empty, such as those of entities that no longer exist.
+            for directory_path in file_path.parents:
+                if directory_path == self._output_directory_path:
+                    break
+                try:
+                    directory_path.rmdir()
+                except OSError:
+                    break
@@ -0,0 +1,95 @@
+"""
+Serialize ancestries so they can be sent to other processes.
+"""
+
+from __future__ import annotations
+
+from io import BytesIO
+from pickle import Pickler, Unpickler, HIGHEST_PROTOCOL
+from typing import Any, TYPE_CHECKING
+
+from betty.ancestry import Ancestry
+from betty.model import Entity
+
+if TYPE_CHECKING:
+    from collections.abc import MutableMapping, MutableSequence
+    from typing import IO
+
+
+class _AncestryPickler(Pickler):
+    """
+    Pickle entities by reference, so that densely associated entities do not exhaust the stack.
+    """
+
+    def __init__(self, file: IO[bytes]):
+        super().__init__(file, protocol=HIGHEST_PROTOCOL)
+        self.entities: MutableSequence[Entity] = []
+        self._entity_indices: MutableMapping[int, int] = {}
+
+    def index(self, entity: Entity) -> int:
+        try:
+            return self._entity_indices[id(entity)]
+        except KeyError:
+            entity_index = self._entity_indices[id(entity)] = len(self.entities)
+            self.entities.append(entity)
+            return entity_index
+
+    def persistent_id(self, obj: Any) -> Any:
+        if isinstance(obj, Entity):
+            return self.index(obj), type(obj)
+        return None
+
+
+class _AncestryUnpickler(Unpickler):
+    def __init__(self, file: IO[bytes]):
+        super().__init__(file)
+        self.entities: MutableMapping[int, Entity] = {}
+
+    def persistent_load(self, pid: Any) -> Entity:
+        entity_index, entity_type = pid
+        try:
+            return self.entities[entity_index]
+        except KeyError:
+            entity: Entity = entity_type.__new__(entity_type)
+            self.entities[entity_index] = entity
+            return entity
+
+
+def dump_ancestry(ancestry: Ancestry) -> bytes:
+    """
+    Dump an ancestry to a snapshot.
+
+    Entities are referenced from each other's state by index, and their states are pickled one after the other,
+    so the nesting depth of the pickle stays constant regardless of how entities are associated with each other.
+    """
+    file = BytesIO()
+    pickler = _AncestryPickler(file)
+    for entity in ancestry:
+        pickler.index(entity)
+    pickler.dump(len(pickler.entities))
+    entity_index = 0
+    # Dumping an entity's state may reference entities that are not part of the ancestry, which are appended to the
+    # entities to dump.
+    while entity_index < len(pickler.entities):
+        pickler.dump(pickler.entities[entity_index].__getstate__() or {})
+        entity_index += 1
+    pickler.dump(None)
+    return file.getvalue()
+
+
+async def load_ancestry(snapshot: bytes) -> Ancestry:
+    """
+    Load an ancestry from a snapshot created by :py:func:`betty.project.generate._snapshot.dump_ancestry`.
+    """
+    unpickler = _AncestryUnpickler(BytesIO(snapshot))
+    ancestry_entity_count = unpickler.load()
+    entity_index = 0
+    while (entity_state := unpickler.load()) is not None:
+        unpickler.entities[entity_index].__dict__.update(entity_state)
+        entity_index += 1
+    ancestry = await Ancestry.new()
+    with ancestry.unchecked():
+        ancestry.add(
+            *(unpickler.entities[index] for index in range(ancestry_entity_count))
+        )
+    return ancestry
@@ -4,16 +4,36 @@ File utilities for site generation.
 
 from __future__ import annotations
 
-from contextlib import asynccontextmanager
-from typing import AsyncContextManager, TYPE_CHECKING
+import os
+import sys
+from asyncio import to_thread, gather
+from contextlib import asynccontextmanager, suppress
+from queue import Empty, Full, Queue
+from threading import Thread
+from pathlib import Path
+from typing import AsyncContextManager, TYPE_CHECKING, Self, final, TypeAlias
 
 import aiofiles
 from aiofiles.os import makedirs
 
+from betty.typing import threadsafe
+
 if TYPE_CHECKING:
     from aiofiles.threadpool.text import AsyncTextIOWrapper
     from collections.abc import AsyncIterator
-    from pathlib import Path
+    from types import TracebackType
+
+
+_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+if sys.platform == "win32":
+    # Windows would otherwise translate newlines.
+    _OPEN_FLAGS |= os.O_BINARY
+
+# The final permissions of generated files and directories, subject to the umask.
+_FILE_MODE = 0o644
+_DIRECTORY_MODE = 0o755
+
+_FileWrite: TypeAlias = "tuple[Path, bytes] | None"
 
 
 @asynccontextmanager
@@ -21,11 +41,15 @@ async def create_file(path: Path) -> AsyncIterator[AsyncTextIOWrapper]:
     """
     Create the file for a resource.
     """
-    await makedirs(path.parent, exist_ok=True)
-    async with aiofiles.open(path, "w", encoding="utf-8") as f:
+    await makedirs(path.parent, _DIRECTORY_MODE, exist_ok=True)
+    async with aiofiles.open(path, "w", encoding="utf-8", opener=_open_file) as f:
         yield f
 
 
+def _open_file(path: str, flags: int) -> int:
+    return os.open(path, flags, _FILE_MODE)
+
+
 def create_html_resource(path: Path) -> AsyncContextManager[AsyncTextIOWrapper]:
     """
     Create the file for an HTML resource.
@@ -38,3 +62,166 @@ def create_json_resource(path: Path) -> AsyncContextManager[AsyncTextIOWrapper]:
     Create the file for a JSON resource.
     """
     return create_file(path / "index.json")
+
+
+@final
+@threadsafe
+class FileWriter:
+    """
+    Write generated files from a dedicated writer thread.
+
+    Rather than handing every directory creation, file open, write, and close to a thread pool, files are queued, and
+    written by a single thread in batches. Use this as an asynchronous context manager. All queued files are written
+    by the time the context exits.
+    """
+
+    def __init__(self, *, batch_size: int = 256, queue_size: int = 4096):
+        self._batch_size = batch_size
+        self._queue: Queue[_FileWrite] = Queue(queue_size)
+        self._thread = Thread(target=self._run, daemon=True)
+        self._error: OSError | None = None
+        self._error_raised = False
+
+    async def __aenter__(self) -> Self:
+        self._thread.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        await self._put(None)
+        await to_thread(self._thread.join)
+        # Do not replace any error raised by the context.
+        if exc_val is None:
+            self._raise_error()
+
+    def _raise_error(self) -> None:
+        if self._error is not None and not self._error_raised:
+            self._error_raised = True
+            raise self._error
+
+    async def _put(self, file_write: _FileWrite) -> None:
+        try:
+            self._queue.put_nowait(file_write)
+        except Full:
+            await to_thread(self._queue.put, file_write)
+
+    async def write(self, path: Path, content: str) -> None:
+        """
+        Queue a file to be written.
+        """
+        self._raise_error()
+        await self._put((path, content.encode("utf-8")))
+
+    async def write_html_resource(self, path: Path, content: str) -> None:
+        """
+        Queue the file for an HTML resource to be written.
+        """
+        await self.write(path / "index.html", content)
+
+    async def write_json_resource(self, path: Path, content: str) -> None:
+        """
+        Queue the file for a JSON resource to be written.
+        """
+        await self.write(path / "index.json", content)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            with suppress(Empty):
+                while len(batch) < self._batch_size:
+                    batch.append(self._queue.get_nowait())
+            for file_write in batch:
+                if file_write is None:
+                    return
+                # Keep consuming the queue after an error, so no producers are blocked.
+                if self._error is None:
+                    try:
+                        self._write(*file_write)
+                    except OSError as error:
+                        self._error = error
+
+    def _write(self, path: Path, content: bytes) -> None:
+        try:
+            file_descriptor = os.open(path, _OPEN_FLAGS, _FILE_MODE)
+        except FileNotFoundError:
+            os.makedirs(path.parent, _DIRECTORY_MODE, exist_ok=True)
+            file_descriptor = os.open(path, _OPEN_FLAGS, _FILE_MODE)
+        try:
+            content_bytes = memoryview(content)
+            while content_bytes:
+                content_bytes = content_bytes[
+                    os.write(file_descriptor, content_bytes) :
+                ]
+        finally:
+            os.close(file_descriptor)
+
+
+_SET_PERMISSIONS_SPLIT_DEPTH = 2
+"""
+How many directory levels deep to split a directory tree into subtrees that are checked in parallel.
+"""
+
+
+async def set_permissions(directory_path: Path) -> None:
+    """
+    Ensure that all files and directories in a generated directory tree have their final permissions.
+
+    Most generated files are created with their final permissions already, but not all of them are. Copied assets keep
+    their source files' modes, other libraries write files with modes of their own, and a restrictive umask narrows
+    the modes of all files. Therefore every file and directory is checked on every build, but only the modes of those
+    that differ are changed. Subtrees are checked in parallel, and off the event loop.
+    """
+    await to_thread(_set_permission, directory_path, _DIRECTORY_MODE)
+    await _set_subtree_permissions(directory_path, 0)
+
+
+async def _set_subtree_permissions(directory_path: Path, depth: int) -> None:
+    if depth >= _SET_PERMISSIONS_SPLIT_DEPTH:
+        await to_thread(_set_tree_permissions, directory_path)
+        return
+    subdirectory_paths = await to_thread(_set_directory_permissions, directory_path)
+    await gather(
+        *(
+            _set_subtree_permissions(subdirectory_path, depth + 1)
+            for subdirectory_path in subdirectory_paths
+        )
+    )
+
+
+def _set_permission(path: Path | str, mode: int) -> None:
+    # Checking is cheaper than changing, because changing a mode writes to the inode, even if the mode is unchanged.
+    if os.stat(path).st_mode & 0o777 != mode:
+        os.chmod(path, mode)
+
+
+def _set_directory_permissions(directory_path: Path) -> list[Path]:
+    """
+    Set the permissions of a directory's children.
+
+    :return: The paths to the subdirectories.
+    """
+    subdirectory_paths = []
+    with os.scandir(directory_path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                _set_permission(entry.path, _DIRECTORY_MODE)
+                # Like os.walk(), do not descend into symlinked directories.
+                if not entry.is_symlink():
+                    subdirectory_paths.append(Path(entry.path))
+            else:
+                _set_permission(entry.path, _FILE_MODE)
+    return subdirectory_paths
+
+
+def _set_tree_permissions(directory_path: Path) -> None:
+    for directory_path_str, subdirectory_names, file_names in os.walk(directory_path):
+        for subdirectory_name in subdirectory_names:
+            _set_permission(
+                os.path.join(directory_path_str, subdirectory_name), _DIRECTORY_MODE
+            )
+        for file_name in file_names:
+            _set_permission(os.path.join(directory_path_str, file_name), _FILE_MODE)
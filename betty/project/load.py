@@ -2,17 +2,45 @@
 Provide the Ancestry loading API.
 """
 
+from __future__ import annotations
+
 import logging
-from asyncio import gather
-from xml.etree.ElementTree import Element
+import re
+from asyncio import gather, Semaphore
+from collections import defaultdict
+from contextlib import suppress
+from html.parser import HTMLParser
+from typing import Any, Self, TYPE_CHECKING
+from urllib.parse import urlparse
 
-from html5lib import parse
+from typing_extensions import override
 
 from betty.ancestry.link import Link, HasLinks
-from betty.fetch import Fetcher, FetchError
+from betty.fetch import Fetcher, FetchError, FetchResponse
 from betty.media_type import MediaType, InvalidMediaType
 from betty.project import Project, ProjectEvent, ProjectContext
 
+if TYPE_CHECKING:
+    from collections.abc import MutableMapping, Sequence, Iterator, Coroutine
+
+
+_LINK_TITLE_CONCURRENCY = 64
+"""
+The maximum number of link titles to fetch concurrently.
+"""
+
+_LINK_TITLE_HOST_CONCURRENCY = 5
+"""
+The maximum number of link titles to fetch concurrently from a single host.
+"""
+
+_LINK_TITLE_CACHE_BATCH_SIZE = 256
+"""
+The number of link titles to look up in the cache at once.
+"""
+
+_HTML_HEAD_END_PATTERN = re.compile(rb"</head\s*>", re.IGNORECASE)
+
 
 class LoadAncestryEvent(ProjectEvent):
     """
@@ -43,24 +71,60 @@ async def load(project: Project) -> None:
 
 
 async def _fetch_link_titles(project: Project) -> None:
-    await gather(
-        *[
-            _fetch_link_title(await project.app.fetcher, link)
-            for entity in project.ancestry
-            if isinstance(entity, HasLinks)
-            for link in entity.links
-        ]
+    fetcher = await project.app.fetcher
+    links_by_url: MutableMapping[str, list[Link]] = defaultdict(list)
+    for entity in project.ancestry:
+        if isinstance(entity, HasLinks):
+            for link in entity.links:
+                if not link.label:
+                    links_by_url[link.url].append(link)
+
+    # Look up cached responses in bulk, so only the remaining links need to be fetched individually.
+    urls = list(links_by_url)
+    for offset in range(0, len(urls), _LINK_TITLE_CACHE_BATCH_SIZE):
+        responses = await fetcher.fetch_cached_many(
+            urls[offset : offset + _LINK_TITLE_CACHE_BATCH_SIZE]
+        )
+        for url, response in responses.items():
+            _populate_link_title(response, links_by_url.pop(url))
+
+    # Group the links by host, so no single host receives too many concurrent requests.
+    links_by_host: MutableMapping[str, list[tuple[str, Sequence[Link]]]] = defaultdict(
+        list
     )
-
-
-async def _fetch_link_title(fetcher: Fetcher, link: Link) -> None:
-    if link.label:
-        return
+    for url, links in links_by_url.items():
+        links_by_host[urlparse(url).netloc].append((url, links))
+
+    semaphore = Semaphore(_LINK_TITLE_CONCURRENCY)
+
+    async def _fetch_host_link_titles(
+        host_links: Iterator[tuple[str, Sequence[Link]]],
+    ) -> None:
+        for url, links in host_links:
+            async with semaphore:
+                await _fetch_link_title(fetcher, url, links)
+
+    workers: list[Coroutine[Any, Any, None]] = []
+    for host_links in links_by_host.values():
+        host_links_iterator = iter(host_links)
+        # Start no more workers for a host than it has links.
+        workers.extend(
+            _fetch_host_link_titles(host_links_iterator)
+            for _ in range(min(_LINK_TITLE_HOST_CONCURRENCY, len(host_links)))
+        )
+    await gather(*workers)
+
+
+async def _fetch_link_title(fetcher: Fetcher, url: str, links: Sequence[Link]) -> None:
     try:
-        response = await fetcher.fetch(link.url)
+        response = await fetcher.fetch(url)
     except FetchError as error:
         logging.getLogger(__name__).warning(str(error))
         return
+    _populate_link_title(response, links)
+
+
+def _populate_link_title(response: FetchResponse, links: Sequence[Link]) -> None:
     try:
         content_type = MediaType(response.headers["Content-Type"])
     except InvalidMediaType:
@@ -72,56 +136,81 @@ async def _fetch_link_title(fetcher: Fetcher, link: Link) -> None:
     ):
         return
 
-    document = parse(response.text)
-    title = _extract_html_title(document)
-    if title is not None:
-        link.label = title
-    if not link.description:
-        description = _extract_html_meta_description(document)
-        if description is not None:
-            link.description = description
-
-
-def _extract_html_title(document: Element) -> str | None:
-    head = document.find(
-        "ns:head",
-        namespaces={
-            "ns": "http://www.w3.org/1999/xhtml",
-        },
-    )
-    if head is None:
-        return None
-    title = head.find(
-        "ns:title",
-        namespaces={
-            "ns": "http://www.w3.org/1999/xhtml",
-        },
-    )
-    if title is None:
-        return None
-    return title.text
+    head = _HtmlHeadParser.parse(response)
+    for link in links:
+        if head.title is not None:
+            link.label = head.title
+        if not link.description:
+            description = head.description
+            if description is not None:
+                link.description = description
 
 
-def _extract_html_meta_description(document: Element) -> str | None:
-    head = document.find(
-        "ns:head",
-        namespaces={
-            "ns": "http://www.w3.org/1999/xhtml",
-        },
-    )
-    if head is None:
+class _HtmlHeadEnd(Exception):
+    pass
+
+
+class _HtmlHeadParser(HTMLParser):
+    """
+    Parse the title and description from an HTML document's head, without parsing the rest of the document.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._in_title = False
+        self._title: list[str] | None = None
+        self._meta_descriptions: MutableMapping[tuple[str, str], str] = {}
+
+    @classmethod
+    def parse(cls, response: FetchResponse) -> Self:
+        parser = cls()
+        head_end = _HTML_HEAD_END_PATTERN.search(response.body)
+        body = response.body if head_end is None else response.body[: head_end.end()]
+        with suppress(_HtmlHeadEnd):
+            parser.feed(body.decode(response.encoding, errors="replace"))
+        return parser
+
+    @property
+    def title(self) -> str | None:
+        if not self._title:
+            return None
+        return "".join(self._title)
+
+    @property
+    def description(self) -> str | None:
+        for meta_attr in (
+            ("name", "description"),
+            ("property", "og:description"),
+        ):
+            with suppress(KeyError):
+                return self._meta_descriptions[meta_attr]
         return None
-    metas = head.findall(
-        "ns:meta",
-        namespaces={
-            "ns": "http://www.w3.org/1999/xhtml",
-        },
-    )
-    for attr_name, attr_value in (
-        ("name", "description"),
-        ("property", "og:description"),
-    ):
-        for meta in metas:
-            if meta.get(attr_name, None) == attr_value:
-                return meta.get("content", None)
-    return None
+
+    @override
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag == "body":
+            raise _HtmlHeadEnd
+        if tag == "title" and self._title is None:
+            self._in_title = True
+            self._title = []
+        elif tag == "meta":
+            meta_attrs = dict(attrs)
+            content = meta_attrs.get("content", None)
+            if content is None:
+                return
+            for attr_name in ("name", "property"):
+                attr_value = meta_attrs.get(attr_name, None)
+                if attr_value is not None:
+                    self._meta_descriptions.setdefault((attr_name, attr_value), content)
+
+    @override
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "head":
+            raise _HtmlHeadEnd
+        if tag == "title":
+            self._in_title = False
+
+    @override
+    def handle_data(self, data: str) -> None:
+        if self._in_title and self._title is not None:
+            self._title.append(data)
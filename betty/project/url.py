@@ -4,13 +4,16 @@ URL generators for project resources.
 
 from __future__ import annotations
 
-from typing import final, Any, Self, TYPE_CHECKING
+from collections import OrderedDict
+from threading import Lock
+from typing import final, Any, Self, TYPE_CHECKING, TypeAlias
 from urllib.parse import quote
 
 from typing_extensions import override
 
 from betty import model
 from betty.media_type.media_types import HTML, JSON, JSON_LD
+from betty.model import Entity
 from betty.project.factory import ProjectDependentFactory
 from betty.string import camel_case_to_kebab_case
 from betty.typing import private
@@ -18,15 +21,22 @@ from betty.url import (
     generate_from_path,
     LocalizedUrlGenerator as StdLocalizedUrlGenerator,
     StaticUrlGenerator as StdStaticUrlGenerator,
+    UnsupportedResource,
 )
-from betty.url.proxy import ProxyLocalizedUrlGenerator
 
 if TYPE_CHECKING:
     from betty.media_type import MediaType
     from betty.project import Project
-    from betty.model import Entity
     from betty.locale import Localey
-    from collections.abc import Mapping
+    from collections.abc import Mapping, MutableMapping
+
+
+_ENTITY_URL_MEMO_SIZE = 2**16
+"""
+The default maximum number of entity URLs to memoize.
+"""
+
+_EntityUrlKey: TypeAlias = "tuple[type[Entity], str, MediaType, bool, Localey | None]"
 
 
 class _ProjectUrlGenerator:
@@ -210,14 +220,29 @@ class _EntityUrlGenerator(_EntityTypeDependentUrlGenerator):
 class LocalizedUrlGenerator(StdLocalizedUrlGenerator, ProjectDependentFactory):
     """
     Generate URLs for all resources provided by a Betty project.
+
+    Upstream generators are looked up by resource type, and entity URLs are memoized, so most URLs are generated
+    through dictionary lookups only.
     """
 
     @private
     def __init__(
         self,
         *upstreams: StdLocalizedUrlGenerator,
+        entity_url_memo_size: int = _ENTITY_URL_MEMO_SIZE,
     ):
-        self._upstream = ProxyLocalizedUrlGenerator(*upstreams)
+        """
+        :param upstreams: The upstream URL generators. Except for paths, they MUST decide whether they support a
+            resource based on the resource's type (or for types, the type itself) alone.
+        :param entity_url_memo_size: The maximum number of entity URLs to memoize, or ``0`` to disable memoization.
+        """
+        self._upstreams = upstreams
+        self._upstreams_by_type: MutableMapping[
+            tuple[bool, type[Any]], StdLocalizedUrlGenerator | None
+        ] = {}
+        self._entity_url_memo_size = entity_url_memo_size
+        self._entity_urls: OrderedDict[_EntityUrlKey, str] = OrderedDict()
+        self._entity_urls_lock = Lock()
 
     @override
     @classmethod
@@ -243,9 +268,31 @@ class LocalizedUrlGenerator(StdLocalizedUrlGenerator, ProjectDependentFactory):
             _LocalizedPathUrlGenerator(*args),
         )
 
+    def _get_upstream(self, resource: Any) -> StdLocalizedUrlGenerator | None:
+        # Paths are supported based on their values rather than their type.
+        if isinstance(resource, str):
+            return self._find_upstream(resource)
+        # Keep types apart from their instances, e.g. to generate entity type URLs as well as entity URLs.
+        dispatch_key = (
+            (True, resource) if isinstance(resource, type) else (False, type(resource))
+        )
+        try:
+            return self._upstreams_by_type[dispatch_key]
+        except KeyError:
+            upstream = self._upstreams_by_type[dispatch_key] = self._find_upstream(
+                resource
+            )
+            return upstream
+
+    def _find_upstream(self, resource: Any) -> StdLocalizedUrlGenerator | None:
+        for upstream in self._upstreams:
+            if upstream.supports(resource):
+                return upstream
+        return None
+
     @override
     def supports(self, resource: Any) -> bool:
-        return self._upstream.supports(resource)
+        return self._get_upstream(resource) is not None
 
     @override
     def generate(
@@ -256,6 +303,33 @@ class LocalizedUrlGenerator(StdLocalizedUrlGenerator, ProjectDependentFactory):
         absolute: bool = False,
         locale: Localey | None = None,
     ) -> str:
-        return self._upstream.generate(
-            resource, media_type, absolute=absolute, locale=locale
-        )
+        if not self._entity_url_memo_size or not isinstance(resource, Entity):
+            return self._generate(
+                resource, media_type, absolute=absolute, locale=locale
+            )
+        entity_url_key = (type(resource), resource.id, media_type, absolute, locale)
+        with self._entity_urls_lock:
+            try:
+                self._entity_urls.move_to_end(entity_url_key)
+                return self._entity_urls[entity_url_key]
+            except KeyError:
+                pass
+        url = self._generate(resource, media_type, absolute=absolute, locale=locale)
+        with self._entity_urls_lock:
+            self._entity_urls[entity_url_key] = url
+            if len(self._entity_urls) > self._entity_url_memo_size:
+                self._entity_urls.popitem(last=False)
+        return url
+
+    def _generate(
+        self,
+        resource: Any,
+        media_type: MediaType,
+        *,
+        absolute: bool,
+        locale: Localey | None,
+    ) -> str:
+        upstream = self._get_upstream(resource)
+        if upstream is None:
+            raise UnsupportedResource.new(resource)
+        return upstream.generate(resource, media_type, absolute=absolute, locale=locale)
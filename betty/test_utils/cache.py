@@ -28,6 +28,25 @@ class CacheTestBase(Generic[_CacheItemValueT]):
     def _values(self) -> Iterator[_CacheItemValueT]:
         raise NotImplementedError
 
+    async def test_metrics(self) -> None:
+        """
+        Test implementations of :py:meth:`betty.cache.Cache.metrics`.
+        """
+        async with self._new_sut() as sut:
+            sut_with_scope = sut.with_scope("scopey")
+            async with sut_with_scope.get("id"):
+                pass
+            await sut_with_scope.set("id", next(self._values()))
+            async with sut_with_scope.get("id"):
+                pass
+            metrics = sut.metrics()
+            if not metrics:
+                pytest.skip("This cache does not collect metrics.")
+            assert metrics[""].hits == 0
+            assert metrics["scopey"].hits == 1
+            assert metrics["scopey"].misses == 1
+            assert metrics["scopey"].sets == 1
+
     async def test_with_scope(self) -> None:
         """
         Test implementations of :py:meth:`betty.cache.Cache.with_scope`.
@@ -185,3 +204,100 @@ class CacheTestBase(Generic[_CacheItemValueT]):
             await sut.clear()
             async with sut.get("id") as cache_item:
                 assert cache_item is None
+
+    @pytest.mark.parametrize(
+        "scopes",
+        [
+            (),
+            ("scopey", "dopey"),
+        ],
+    )
+    async def test_get_many(self, scopes: Sequence[str]) -> None:
+        """
+        Test implementations of :py:meth:`betty.cache.Cache.get_many`.
+        """
+        for value in self._values():
+            async with self._new_sut(scopes=scopes) as sut:
+                await sut.set("id", value)
+                cache_items = await sut.get_many(["id", "other-id"])
+                assert list(cache_items) == ["id"]
+                assert await cache_items["id"].value() == value
+
+    @pytest.mark.parametrize(
+        "scopes",
+        [
+            (),
+            ("scopey", "dopey"),
+        ],
+    )
+    async def test_set_many(self, scopes: Sequence[str]) -> None:
+        """
+        Test implementations of :py:meth:`betty.cache.Cache.set_many`.
+        """
+        for value in self._values():
+            async with self._new_sut(scopes=scopes) as sut:
+                await sut.set_many({"id": value, "other-id": value})
+                for cache_item_id in ("id", "other-id"):
+                    async with sut.get(cache_item_id) as cache_item:
+                        assert cache_item is not None
+                        assert await cache_item.value() == value
+
+    @pytest.mark.parametrize(
+        "scopes",
+        [
+            (),
+            ("scopey", "dopey"),
+        ],
+    )
+    async def test_set_many_with_modified(self, scopes: Sequence[str]) -> None:
+        """
+        Test implementations of :py:meth:`betty.cache.Cache.set_many`.
+        """
+        modified = 123456789
+        async with self._new_sut(scopes=scopes) as sut:
+            await sut.set_many({"id": next(self._values())}, modified=modified)
+            async with sut.get("id") as cache_item:
+                assert cache_item is not None
+                assert cache_item.modified == modified
+
+    @pytest.mark.parametrize(
+        "scopes",
+        [
+            (),
+            ("scopey", "dopey"),
+        ],
+    )
+    async def test_getset_many(self, scopes: Sequence[str]) -> None:
+        """
+        Test implementations of :py:meth:`betty.cache.Cache.getset_many`.
+        """
+        for value in self._values():
+            async with self._new_sut(scopes=scopes) as sut:
+                await sut.set("id", value)
+                async with sut.getset_many(["id", "other-id"]) as (
+                    cache_items,
+                    setter,
+                ):
+                    assert list(cache_items) == ["id"]
+                    assert await cache_items["id"].value() == value
+                    await setter({"other-id": value})
+                async with sut.get("other-id") as cache_item:
+                    assert cache_item is not None
+                    assert await cache_item.value() == value
+
+    @pytest.mark.parametrize(
+        "scopes",
+        [
+            (),
+            ("scopey", "dopey"),
+        ],
+    )
+    async def test_delete_many(self, scopes: Sequence[str]) -> None:
+        """
+        Test implementations of :py:meth:`betty.cache.Cache.delete_many`.
+        """
+        async with self._new_sut(scopes=scopes) as sut:
+            await sut.set("id", next(self._values()))
+            await sut.set("other-id", next(self._values()))
+            await sut.delete_many(["id", "other-id", "unknown-id"])
+            assert await sut.get_many(["id", "other-id"]) == {}
@@ -163,6 +163,15 @@ class TestPerson(EntityTestBase):
         parent.children = [sut, sibling]
         assert list(sut.siblings) == [sibling]
 
+    async def test___getstate__(self) -> None:
+        sut = Person()
+        parent = Person()
+        sut.parents.add(parent)
+        assert list(sut.ancestors) == [parent]
+        state = sut.__getstate__()
+        assert state["_lineages"] == {}
+        assert state["_lineage_dependents"] == {"parents": {}, "children": {}}
+
     async def test_ancestors_without_parents(self) -> None:
         sut = Person(id="person")
         assert list(sut.ancestors) == []
@@ -175,6 +184,42 @@ class TestPerson(EntityTestBase):
         parent.parents.add(grandparent)
         assert list(sut.ancestors) == [parent, grandparent]
 
+    async def test_ancestors_with_pedigree_collapse(self) -> None:
+        sut = Person()
+        parent1 = Person()
+        parent2 = Person()
+        sut.parents = [parent1, parent2]
+        grandparent = Person()
+        parent1.parents.add(grandparent)
+        parent2.parents.add(grandparent)
+        assert list(sut.ancestors) == [parent1, parent2, grandparent]
+
+    async def test_ancestors_with_cycle(self) -> None:
+        sut = Person()
+        parent = Person()
+        sut.parents.add(parent)
+        parent.parents.add(sut)
+        assert list(sut.ancestors) == [parent]
+
+    async def test_ancestors_by_generation(self) -> None:
+        sut = Person()
+        parent = Person()
+        grandparent = Person()
+        sut.parents.add(parent, grandparent)
+        parent.parents.add(grandparent)
+        assert sut.ancestors_by_generation == [(parent, 1), (grandparent, 1)]
+
+    async def test_ancestors_by_generation_should_be_invalidated(self) -> None:
+        sut = Person()
+        parent = Person()
+        sut.parents.add(parent)
+        assert sut.ancestors_by_generation == [(parent, 1)]
+        grandparent = Person()
+        parent.parents.add(grandparent)
+        assert sut.ancestors_by_generation == [(parent, 1), (grandparent, 2)]
+        grandparent.children.remove(parent)
+        assert sut.ancestors_by_generation == [(parent, 1)]
+
     async def test_descendants_without_parents(self) -> None:
         sut = Person(id="person")
         assert list(sut.descendants) == []
@@ -187,6 +232,54 @@ class TestPerson(EntityTestBase):
         child.children.add(grandchild)
         assert list(sut.descendants) == [child, grandchild]
 
+    async def test_descendants_with_pedigree_collapse(self) -> None:
+        sut = Person()
+        child1 = Person()
+        child2 = Person()
+        sut.children = [child1, child2]
+        grandchild = Person()
+        grandchild.parents = [child1, child2]
+        assert list(sut.descendants) == [child1, child2, grandchild]
+
+    async def test_descendants_by_generation_should_be_invalidated(self) -> None:
+        sut = Person()
+        child = Person()
+        sut.children.add(child)
+        assert sut.descendants_by_generation == [(child, 1)]
+        grandchild = Person()
+        grandchild.parents.add(child)
+        assert sut.descendants_by_generation == [(child, 1), (grandchild, 2)]
+
+    async def test_ancestors_by_generation_should_be_invalidated_for_descendants(
+        self,
+    ) -> None:
+        sut = Person()
+        parent = Person()
+        grandparent = Person()
+        sut.parents.add(parent)
+        parent.parents.add(grandparent)
+        assert sut.ancestors_by_generation == [(parent, 1), (grandparent, 2)]
+        great_grandparent = Person()
+        grandparent.parents.add(great_grandparent)
+        assert sut.ancestors_by_generation == [
+            (parent, 1),
+            (grandparent, 2),
+            (great_grandparent, 3),
+        ]
+        parent.parents.remove(grandparent)
+        assert sut.ancestors_by_generation == [(parent, 1)]
+
+    async def test_ancestors_by_generation_should_not_be_invalidated_by_unrelated_people(
+        self,
+    ) -> None:
+        sut = Person()
+        parent = Person()
+        sut.parents.add(parent)
+        ancestors = sut.ancestors_by_generation
+        unrelated = Person()
+        unrelated.parents.add(Person())
+        assert sut.ancestors_by_generation is ancestors
+
     async def test_dump_linked_data_should_dump_minimal(self) -> None:
         person_id = "the_person"
         person = Person(id=person_id)
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import pickle
+from pathlib import Path
 from typing import Self
 
 from typing_extensions import override
 
-from betty.app import App
+from betty.app import App, _new_persistent_cache
+from betty.app.config import AppConfiguration
 from betty.app.factory import AppDependentFactory
+from betty.cache.no_op import NoOpCache
+from betty.cache.sqlite import SqliteCache
+from betty.fetch.static import StaticFetcher
 from betty.locale import DEFAULT_LOCALE
 
 
@@ -15,6 +21,20 @@ class TestApp:
             assert sut.cache is sut.cache
             assert await sut.fetcher is await sut.fetcher
 
+    async def test___reduce__(self) -> None:
+        fetcher = StaticFetcher()
+        async with App.new_temporary(fetcher=fetcher) as app, app:
+            app.configuration.locale = "nl-NL"
+            async with pickle.loads(pickle.dumps(app)) as sut:
+                assert sut.configuration.locale == "nl-NL"
+                assert sut.cache_directory_path == app.cache_directory_path
+                assert isinstance(sut.cache, NoOpCache)
+                assert isinstance(await sut.fetcher, StaticFetcher)
+
+    async def test_cache_directory_path(self, tmp_path: Path) -> None:
+        sut = App(AppConfiguration(), tmp_path, cache_factory=lambda app: NoOpCache())
+        assert sut.cache_directory_path == tmp_path
+
     async def test_assets(self) -> None:
         async with App.new_temporary() as sut, sut:
             assert sut.assets is sut.assets
@@ -27,6 +47,16 @@ class TestApp:
         async with App.new_temporary() as sut, sut:
             assert sut.cache is sut.cache
 
+    async def test_cache_with_sqlite_cache_backend(self, tmp_path: Path) -> None:
+        async with App(
+            AppConfiguration(cache_backend="sqlite"),
+            tmp_path,
+            cache_factory=_new_persistent_cache,
+        ) as sut:
+            assert isinstance(sut.cache, SqliteCache)
+            await sut.cache.set("id", 123)
+        assert (tmp_path / "cache.sqlite").exists()
+
     async def test_fetcher(self) -> None:
         async with App.new_temporary() as sut, sut:
             assert await sut.fetcher is await sut.fetcher
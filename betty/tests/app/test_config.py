@@ -1,6 +1,9 @@
 from typing import TYPE_CHECKING
 
+import pytest
+
 from betty.app.config import AppConfiguration
+from betty.assertion.error import AssertionFailed
 
 if TYPE_CHECKING:
     from betty.serde.dump import Dump, DumpMapping
@@ -22,6 +25,25 @@ class TestAppConfiguration:
         sut.locale = locale
         assert sut.locale == locale
 
+    def test___init___with_cache_backend(self) -> None:
+        sut = AppConfiguration(cache_backend="sqlite")
+        assert sut.cache_backend == "sqlite"
+
+    def test___init___with_unknown_cache_backend(self) -> None:
+        with pytest.raises(AssertionFailed):
+            AppConfiguration(cache_backend="unknown")
+
+    def test_cache_backend(self) -> None:
+        sut = AppConfiguration()
+        assert sut.cache_backend == "file"
+        sut.cache_backend = "sqlite"
+        assert sut.cache_backend == "sqlite"
+
+    def test_cache_backend_with_unknown_cache_backend(self) -> None:
+        sut = AppConfiguration()
+        with pytest.raises(AssertionFailed):
+            sut.cache_backend = "unknown"
+
     def test_load_minimal(self) -> None:
         sut = AppConfiguration()
         dump: DumpMapping[Dump] = {}
@@ -37,10 +59,27 @@ class TestAppConfiguration:
     def test_dump_minimal(self) -> None:
         sut = AppConfiguration()
         actual = sut.dump()
-        assert actual == {"locale": None}
+        assert actual == {"locale": None, "cache_backend": "file"}
 
     def test_dump_with_locale(self) -> None:
         locale = "nl-NL"
         sut = AppConfiguration(locale=locale)
         actual = sut.dump()
-        assert actual == {"locale": locale}
+        assert actual == {"locale": locale, "cache_backend": "file"}
+
+    def test_load_with_cache_backend(self) -> None:
+        sut = AppConfiguration()
+        dump: DumpMapping[Dump] = {"cache_backend": "sqlite"}
+        sut.load(dump)
+        assert sut.cache_backend == "sqlite"
+
+    def test_load_with_unknown_cache_backend(self) -> None:
+        sut = AppConfiguration()
+        dump: DumpMapping[Dump] = {"cache_backend": "unknown"}
+        with pytest.raises(AssertionFailed):
+            sut.load(dump)
+
+    def test_dump_with_cache_backend(self) -> None:
+        sut = AppConfiguration(cache_backend="sqlite")
+        actual = sut.dump()
+        assert actual == {"locale": None, "cache_backend": "sqlite"}
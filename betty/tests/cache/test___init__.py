@@ -1 +1,67 @@
+from betty.cache import CacheMetrics
 
+
+class TestCacheMetrics:
+    async def test_hits(self) -> None:
+        sut = CacheMetrics()
+        sut.record(hits=2)
+        assert sut.hits == 2
+
+    async def test_misses(self) -> None:
+        sut = CacheMetrics()
+        sut.record(misses=2)
+        assert sut.misses == 2
+
+    async def test_sets(self) -> None:
+        sut = CacheMetrics()
+        sut.record(sets=2)
+        assert sut.sets == 2
+
+    async def test_evictions(self) -> None:
+        sut = CacheMetrics()
+        sut.record(evictions=2)
+        assert sut.evictions == 2
+
+    async def test_bytes_read(self) -> None:
+        sut = CacheMetrics()
+        sut.record(bytes_read=2)
+        assert sut.bytes_read == 2
+
+    async def test_bytes_written(self) -> None:
+        sut = CacheMetrics()
+        sut.record(bytes_written=2)
+        assert sut.bytes_written == 2
+
+    async def test_lock_wait_time(self) -> None:
+        sut = CacheMetrics()
+        sut.record(lock_wait_time=0.5)
+        assert sut.lock_wait_time == 0.5
+
+    async def test_record(self) -> None:
+        sut = CacheMetrics()
+        sut.record(hits=1, misses=2)
+        sut.record(hits=3)
+        assert sut.hits == 4
+        assert sut.misses == 2
+        assert sut.sets == 0
+
+    async def test_dump(self) -> None:
+        sut = CacheMetrics()
+        sut.record(
+            hits=1,
+            misses=2,
+            sets=3,
+            evictions=4,
+            bytes_read=5,
+            bytes_written=6,
+            lock_wait_time=0.5,
+        )
+        assert sut.dump() == {
+            "hits": 1,
+            "misses": 2,
+            "sets": 3,
+            "evictions": 4,
+            "bytes_read": 5,
+            "bytes_written": 6,
+            "lock_wait_time": 0.5,
+        }
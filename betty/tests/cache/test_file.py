@@ -47,6 +47,17 @@ class TestBinaryFileCache(CacheTestBase[bytes]):
     def _values(self) -> Iterator[bytes]:
         yield b"SomeBytes"
 
+    async def test_metrics_should_count_bytes(self) -> None:
+        async with self._new_sut() as sut:
+            await sut.set("id", b"SomeBytes")
+            await sut.set_many({"other-id": b"SomeBytes"})
+            async with sut.get("id") as cache_item:
+                assert cache_item is not None
+                await cache_item.value()
+            metrics = sut.metrics()[""]
+            assert metrics.bytes_written == 18
+            assert metrics.bytes_read == 9
+
     @pytest.mark.parametrize(
         "scopes",
         [
@@ -1,5 +1,7 @@
 from collections.abc import Sequence, AsyncIterator, Iterator
 from contextlib import asynccontextmanager
+from sys import getsizeof
+from time import time
 from typing import Any
 
 from typing_extensions import override
@@ -26,3 +28,65 @@ class TestMemoryCache(CacheTestBase[Any]):
         yield 123.456
         yield []
         yield {}
+
+    async def test_set_should_count_evictions(self) -> None:
+        sut = MemoryCache[Any](max_entries=1)
+        await sut.set("id1", 123)
+        await sut.set("id2", 456)
+        assert sut.metrics()[""].evictions == 1
+
+    async def test_set_with_max_entries_should_evict_least_recently_used(
+        self,
+    ) -> None:
+        sut = MemoryCache[Any](max_entries=2)
+        await sut.set("id1", 123)
+        await sut.set("id2", 456)
+        async with sut.get("id1"):
+            pass
+        await sut.set("id3", 789)
+        async with sut.get("id1") as cache_item:
+            assert cache_item is not None
+        async with sut.get("id2") as cache_item:
+            assert cache_item is None
+        async with sut.get("id3") as cache_item:
+            assert cache_item is not None
+
+    async def test_set_with_max_size_should_evict_least_recently_used(
+        self,
+    ) -> None:
+        value = b"x" * 1000
+        sut = MemoryCache[Any](max_size=getsizeof(value) * 2)
+        await sut.set("id1", value)
+        await sut.set("id2", value)
+        await sut.set("id3", value)
+        async with sut.get("id1") as cache_item:
+            assert cache_item is None
+        async with sut.get("id2") as cache_item:
+            assert cache_item is not None
+        assert sut.metrics()[""].evictions == 1
+
+    async def test_get_with_ttl_should_evict_expired_cache_items(self) -> None:
+        sut = MemoryCache[Any](ttl=60)
+        await sut.set("id1", 123, modified=time() - 120)
+        await sut.set("id2", 456)
+        async with sut.get("id1") as cache_item:
+            assert cache_item is None
+        async with sut.get("id2") as cache_item:
+            assert cache_item is not None
+        assert sut.metrics()[""].evictions == 1
+
+    async def test_with_scope_should_have_own_bounds(self) -> None:
+        sut = MemoryCache[Any](max_entries=1)
+        await sut.set("id", 123)
+        await sut.with_scope("scopey").set("id", 456)
+        async with sut.get("id") as cache_item:
+            assert cache_item is not None
+        assert sut.metrics()[""].evictions == 0
+
+    async def test_clear_should_clear_nested_scopes(self) -> None:
+        sut = MemoryCache[Any]()
+        scoped_sut = sut.with_scope("scopey")
+        await scoped_sut.set("id", 123)
+        await sut.clear()
+        async with scoped_sut.get("id") as cache_item:
+            assert cache_item is None
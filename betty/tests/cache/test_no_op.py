@@ -38,3 +38,25 @@ class TestNoOpCache:
     async def test_clear(self) -> None:
         sut = NoOpCache()
         await sut.clear()
+
+    async def test_get_many(self) -> None:
+        sut = NoOpCache()
+        assert await sut.get_many(["id"]) == {}
+
+    async def test_set_many(self) -> None:
+        sut = NoOpCache()
+        await sut.set_many({"id": 123}, modified=123456789)
+
+    async def test_getset_many(self) -> None:
+        sut = NoOpCache()
+        async with sut.getset_many(["id"]) as (cache_items, setter):
+            assert cache_items == {}
+            await setter({"id": 123})
+
+    async def test_delete_many(self) -> None:
+        sut = NoOpCache()
+        await sut.delete_many(["id"])
+
+    async def test_metrics(self) -> None:
+        sut = NoOpCache()
+        assert sut.metrics() == {}
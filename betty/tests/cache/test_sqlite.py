@@ -0,0 +1,83 @@
+from collections.abc import Sequence, AsyncIterator, Iterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any
+
+from aiofiles.tempfile import TemporaryDirectory
+from typing_extensions import override
+
+from betty.cache.sqlite import SqliteCache
+from betty.test_utils.cache import CacheTestBase
+
+
+class TestSqliteCache(CacheTestBase[Any]):
+    @override
+    @asynccontextmanager
+    async def _new_sut(
+        self,
+        *,
+        scopes: Sequence[str] | None = None,
+    ) -> AsyncIterator[SqliteCache[Any]]:
+        async with TemporaryDirectory() as cache_directory_path_str:
+            sut = SqliteCache[Any](
+                Path(cache_directory_path_str) / "cache.sqlite", scopes=scopes
+            )
+            try:
+                yield sut
+            finally:
+                await sut.shutdown()
+
+    @override
+    def _values(self) -> Iterator[Any]:
+        yield True
+        yield None
+        yield 123
+        yield 123.456
+        yield []
+        yield {}
+
+    async def test_shutdown(self, tmp_path: Path) -> None:
+        database_path = tmp_path / "cache.sqlite"
+        sut = SqliteCache[Any](database_path)
+        await sut.set("id", 123)
+        await sut.shutdown()
+
+        sut = SqliteCache[Any](database_path)
+        async with sut.get("id") as cache_item:
+            assert cache_item is not None
+            assert await cache_item.value() == 123
+        await sut.shutdown()
+
+    async def test_metrics_should_count_bytes(self) -> None:
+        async with self._new_sut() as sut:
+            await sut.set("id", b"SomeBytes")
+            await sut.set_many({"other-id": b"SomeBytes"})
+            await sut.get_many(["id", "other-id"])
+            metrics = sut.metrics()[""]
+            assert metrics.bytes_written > 0
+            assert metrics.bytes_read == metrics.bytes_written
+
+    async def test_with_scope_should_isolate_scopes(self) -> None:
+        async with self._new_sut() as sut:
+            await sut.set("id", 123)
+            async with sut.with_scope("scopey").get("id") as cache_item:
+                assert cache_item is None
+
+    async def test_clear_should_clear_nested_scopes(self) -> None:
+        async with self._new_sut() as sut:
+            scoped_sut = sut.with_scope("scopey")
+            await scoped_sut.with_scope("dopey").set("id", 123)
+            await sut.with_scope("other").set("id", 456)
+            await scoped_sut.clear()
+            async with scoped_sut.with_scope("dopey").get("id") as cache_item:
+                assert cache_item is None
+            async with sut.with_scope("other").get("id") as cache_item:
+                assert cache_item is not None
+
+    async def test_clear_should_not_clear_scopes_with_the_same_prefix(self) -> None:
+        async with self._new_sut() as sut:
+            await sut.with_scope("scopey").set("id", 123)
+            await sut.with_scope("scopeyy").set("id", 456)
+            await sut.with_scope("scopey").clear()
+            async with sut.with_scope("scopeyy").get("id") as cache_item:
+                assert cache_item is not None
@@ -1,4 +1,5 @@
 from betty.app import App
+from betty.jinja2 import BYTECODE_CACHE_SCOPE
 from betty.test_utils.cli import run
 
 
@@ -8,3 +9,14 @@ class TestClearCaches:
         await run(new_temporary_app, "clear-caches")
         async with new_temporary_app.cache.get("KeepMeAroundPlease") as cache_item:
             assert cache_item is None
+
+    async def test_click_command_should_clear_compiled_templates(
+        self, new_temporary_app: App
+    ) -> None:
+        bytecode_cache = new_temporary_app.binary_file_cache.with_scope(
+            BYTECODE_CACHE_SCOPE
+        )
+        await bytecode_cache.set("KeepMeAroundPlease", b"")
+        await run(new_temporary_app, "clear-caches")
+        async with bytecode_cache.get("KeepMeAroundPlease") as cache_item:
+            assert cache_item is None
@@ -1,8 +1,11 @@
+import json
+from pathlib import Path
 from unittest.mock import AsyncMock
 
 from pytest_mock import MockerFixture
 
 from betty.app import App
+from betty.cache import CacheMetrics
 from betty.config import write_configuration_file
 from betty.project import Project
 from betty.test_utils.cli import run
@@ -43,3 +46,77 @@ class TestGenerate:
                 generate_args[0].configuration.configuration_file_path
                 == project.configuration.configuration_file_path.expanduser().resolve()
             )
+
+    async def test_click_command_with_processes(
+        self, mocker: MockerFixture, new_temporary_app: App
+    ) -> None:
+        m_generate = mocker.patch(
+            "betty.project.generate.generate", new_callable=AsyncMock
+        )
+        mocker.patch("betty.project.load.load", new_callable=AsyncMock)
+
+        async with Project.new_temporary(new_temporary_app) as project:
+            await write_configuration_file(
+                project.configuration, project.configuration.configuration_file_path
+            )
+            await run(
+                new_temporary_app,
+                "generate",
+                "-c",
+                str(project.configuration.configuration_file_path),
+                "--processes",
+                "4",
+            )
+
+            m_generate.assert_called_once()
+            _, generate_kwargs = m_generate.call_args
+            assert generate_kwargs["processes"] == 4
+
+    async def test_click_command_with_incremental(
+        self, mocker: MockerFixture, new_temporary_app: App
+    ) -> None:
+        m_generate = mocker.patch(
+            "betty.project.generate.generate", new_callable=AsyncMock
+        )
+        mocker.patch("betty.project.load.load", new_callable=AsyncMock)
+
+        async with Project.new_temporary(new_temporary_app) as project:
+            await write_configuration_file(
+                project.configuration, project.configuration.configuration_file_path
+            )
+            await run(
+                new_temporary_app,
+                "generate",
+                "-c",
+                str(project.configuration.configuration_file_path),
+                "--incremental",
+            )
+
+            m_generate.assert_called_once()
+            _, generate_kwargs = m_generate.call_args
+            assert generate_kwargs["incremental"] is True
+
+    async def test_click_command_with_cache_metrics(
+        self, mocker: MockerFixture, new_temporary_app: App, tmp_path: Path
+    ) -> None:
+        mocker.patch("betty.project.generate.generate", new_callable=AsyncMock)
+        mocker.patch("betty.project.load.load", new_callable=AsyncMock)
+        cache_metrics_file_path = tmp_path / "cache-metrics.json"
+
+        async with Project.new_temporary(new_temporary_app) as project:
+            await write_configuration_file(
+                project.configuration, project.configuration.configuration_file_path
+            )
+            await run(
+                new_temporary_app,
+                "generate",
+                "-c",
+                str(project.configuration.configuration_file_path),
+                "--cache-metrics",
+                str(cache_metrics_file_path),
+            )
+
+            cache_metrics = json.loads(cache_metrics_file_path.read_text())
+            assert isinstance(cache_metrics, dict)
+            assert set(cache_metrics) == {"app", "binary_file", "job"}
+            assert cache_metrics["job"] == {"": CacheMetrics().dump()}
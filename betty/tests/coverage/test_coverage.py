@@ -101,15 +101,11 @@ _BASELINE: Mapping[str, _ModuleIgnore] = {
         "project_option": MissingReason.SHOULD_BE_COVERED,
     },
     "betty/concurrent.py": {
-        "AsynchronizedLock": {
-            "release": MissingReason.SHOULD_BE_COVERED,
-        },
         "Lock": {
             "__aexit__": MissingReason.COVERED_ELSEWHERE,
             "acquire": MissingReason.ABSTRACT,
             "release": MissingReason.ABSTRACT,
         },
-        "Ledger": MissingReason.SHOULD_BE_COVERED,
         "RateLimiter": {
             "__aenter__": MissingReason.SHOULD_BE_COVERED,
             "__aexit__": MissingReason.SHOULD_BE_COVERED,
@@ -5,6 +5,7 @@ import aiofiles
 import pytest
 from aiohttp import ClientSession, ClientError
 from aioresponses import aioresponses
+from yarl import URL
 
 from betty.cache.file import BinaryFileCache
 from betty.cache.memory import MemoryCache
@@ -97,6 +98,158 @@ class TestHttpFetcher:
             assert fetched_twice.text == content
             assert fetched_twice.headers["X-Betty"] == content
 
+    async def test_fetch_should_revalidate_expired_response(
+        self, aioresponses: aioresponses, binary_file_cache: BinaryFileCache
+    ) -> None:
+        async with ClientSession() as http_client:
+            sut = HttpFetcher(
+                http_client,
+                MemoryCache(),
+                binary_file_cache,
+                # A negative TTL ensures every cache item is considered expired a long time ago.
+                -999999999,
+            )
+            url = "https://example.com"
+            content = "The name's Text. Plain Text."
+            aioresponses.get(
+                url,
+                body=content,
+                headers={
+                    "ETag": '"betty"',
+                    "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT",
+                },
+            )
+            await sut.fetch(url)
+
+            aioresponses.get(url, status=304)
+            fetched = await sut.fetch(url)
+            assert fetched.text == content
+
+            _, revalidation_request = aioresponses.requests[("GET", URL(url))]
+            assert revalidation_request.kwargs["headers"] == {
+                "If-None-Match": '"betty"',
+                "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+            }
+
+    async def test_fetch_with_stale_while_revalidate_should_return_stale_response(
+        self, aioresponses: aioresponses, binary_file_cache: BinaryFileCache
+    ) -> None:
+        async with ClientSession() as http_client:
+            sut = HttpFetcher(
+                http_client,
+                MemoryCache(),
+                binary_file_cache,
+                # A negative TTL ensures every cache item is considered expired a long time ago.
+                -999999999,
+                stale_while_revalidate=True,
+            )
+            url = "https://example.com"
+            aioresponses.get(url, body="The name's Text. Plain Text.")
+            await sut.fetch(url)
+
+            aioresponses.get(url, body="The name's Text. Rich Text.")
+            # The stale response must be returned, while it is refreshed in the background.
+            assert (await sut.fetch(url)).text == "The name's Text. Plain Text."
+            await sut.shutdown()
+            assert (await sut.fetch(url)).text == "The name's Text. Rich Text."
+
+    async def test_shutdown(
+        self, aioresponses: aioresponses, binary_file_cache: BinaryFileCache
+    ) -> None:
+        async with ClientSession() as http_client:
+            sut = HttpFetcher(
+                http_client,
+                MemoryCache(),
+                binary_file_cache,
+                # A negative TTL ensures every cache item is considered expired a long time ago.
+                -999999999,
+                stale_while_revalidate=True,
+            )
+            url = "https://example.com"
+            aioresponses.get(url, body="The name's Text. Plain Text.")
+            await sut.fetch(url)
+
+            aioresponses.get(url, body="The name's Text. Plain Text.")
+            await sut.fetch(url)
+            await sut.shutdown()
+            assert len(aioresponses.requests[("GET", URL(url))]) == 2
+
+    async def test_fetch_cached(
+        self, aioresponses: aioresponses, sut: HttpFetcher
+    ) -> None:
+        url = "https://example.com"
+        content = "The name's Text. Plain Text."
+        aioresponses.get(url, body=content)
+
+        # Cold caches must not result in the HTTP client being called.
+        assert await sut.fetch_cached(url) is None
+
+        await sut.fetch(url)
+        fetched = await sut.fetch_cached(url)
+        assert fetched is not None
+        assert fetched.text == content
+
+        # Assert the HTTP client was indeed called only once.
+        aioresponses.assert_called_once()
+
+    async def test_fetch_cached_many(
+        self, aioresponses: aioresponses, sut: HttpFetcher
+    ) -> None:
+        url = "https://example.com"
+        other_url = "https://example.com/other"
+        content = "The name's Text. Plain Text."
+        aioresponses.get(url, body=content)
+
+        # Cold caches must not result in the HTTP client being called.
+        assert await sut.fetch_cached_many([url, other_url]) == {}
+
+        await sut.fetch(url)
+        fetched = await sut.fetch_cached_many([url, other_url])
+        assert list(fetched) == [url]
+        assert fetched[url].text == content
+
+        # Assert the HTTP client was indeed called only once.
+        aioresponses.assert_called_once()
+
+    async def test_fetch_cached_with_expired_cache(
+        self, aioresponses: aioresponses, binary_file_cache: BinaryFileCache
+    ) -> None:
+        async with ClientSession() as http_client:
+            sut = HttpFetcher(
+                http_client,
+                MemoryCache(),
+                binary_file_cache,
+                # A negative TTL ensures every cache item is considered expired a long time ago.
+                -999999999,
+            )
+            url = "https://example.com"
+            aioresponses.get(url, body="The name's Text. Plain Text.")
+            await sut.fetch(url)
+            assert await sut.fetch_cached(url) is None
+
+    async def test_fetch_cached_with_expired_cache_and_stale_while_revalidate(
+        self, aioresponses: aioresponses, binary_file_cache: BinaryFileCache
+    ) -> None:
+        async with ClientSession() as http_client:
+            sut = HttpFetcher(
+                http_client,
+                MemoryCache(),
+                binary_file_cache,
+                # A negative TTL ensures every cache item is considered expired a long time ago.
+                -999999999,
+                stale_while_revalidate=True,
+            )
+            url = "https://example.com"
+            content = "The name's Text. Plain Text."
+            aioresponses.get(url, body=content)
+            aioresponses.get(url, body=content)
+            await sut.fetch(url)
+            fetched = await sut.fetch_cached(url)
+            assert fetched is not None
+            assert fetched.text == content
+            await sut.shutdown()
+            assert len(aioresponses.requests[("GET", URL(url))]) == 2
+
     async def test_fetch_file_should_return(
         self, aioresponses: aioresponses, sut: HttpFetcher
     ) -> None:
@@ -117,6 +270,25 @@ class TestHttpFetcher:
         # Assert the HTTP client was indeed called only once.
         aioresponses.assert_called_once()
 
+    async def test_fetch_file_cached(
+        self, aioresponses: aioresponses, sut: HttpFetcher
+    ) -> None:
+        url = "https://example.com"
+        content = b"The name's Text. Plain Text."
+        aioresponses.get(url, body=content)
+
+        # Cold caches must not result in the HTTP client being called.
+        assert await sut.fetch_file_cached(url) is None
+
+        await sut.fetch_file(url)
+        fetched = await sut.fetch_file_cached(url)
+        assert fetched is not None
+        async with aiofiles.open(fetched, "rb") as f:
+            assert await f.read() == content
+
+        # Assert the HTTP client was indeed called only once.
+        aioresponses.assert_called_once()
+
     @pytest.mark.parametrize(
         "error",
         [
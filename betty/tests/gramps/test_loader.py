@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import gzip
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -41,7 +42,7 @@ if TYPE_CHECKING:
     from betty.ancestry.event_type import EventType
     from betty.ancestry.gender import Gender
     from betty.ancestry.presence_role import PresenceRole
-    from collections.abc import Mapping
+    from collections.abc import Mapping, Callable
 
 
 class TestGrampsLoader:
@@ -156,6 +157,42 @@ class TestGrampsLoader:
                     Path(__file__).parent / "assets" / "minimal.invalid"
                 )
 
+    @pytest.mark.parametrize(
+        "truncate",
+        [
+            # A gzip file whose compressed stream ends prematurely.
+            lambda gramps: gramps[: len(gramps) // 2],
+            # A complete gzip file containing XML that ends prematurely.
+            lambda gramps: gzip.compress(
+                gzip.decompress(gramps)[: len(gzip.decompress(gramps)) * 9 // 10]
+            ),
+        ],
+    )
+    async def test_load_file_with_truncated_gramps_file(
+        self,
+        truncate: Callable[[bytes], bytes],
+        new_temporary_app: App,
+        tmp_path: Path,
+    ) -> None:
+        gramps_file_path = tmp_path / "truncated.gramps"
+        async with aiofiles.open(
+            Path(__file__).parent / "assets" / "minimal.gramps", "rb"
+        ) as f:
+            gramps = await f.read()
+        async with aiofiles.open(gramps_file_path, "wb") as f:
+            await f.write(truncate(gramps))
+        async with Project.new_temporary(new_temporary_app) as project, project:
+            sut = GrampsLoader(
+                project.ancestry,
+                factory=project.new_target,
+                localizer=DEFAULT_LOCALIZER,
+                copyright_notices=project.copyright_notices,
+                licenses=await project.licenses,
+                attribute_prefix_key=self.ATTRIBUTE_PREFIX_KEY,
+            )
+            with pytest.raises(UserFacingGrampsError):
+                await sut.load_file(gramps_file_path)
+
     async def _load(
         self,
         xml: str,
@@ -634,6 +671,32 @@ class TestGrampsLoader:
         for parent in parents:
             assert expected_children == list(parent.children)
 
+    async def test_family_should_set_children_if_listed_before_people(
+        self,
+    ) -> None:
+        ancestry = await self._load_partial(
+            """
+<families>
+    <family handle="_e1dd3b84f9e5d832ffc17baa46c" change="1552127019" id="F0000">
+        <rel type="Unknown"/>
+        <father hlink="_e1dd3bf1f0041d92f586f9d8683"/>
+        <childref hlink="_e1dd36c700f7fa6564d3ac839db" mrel="Unknown" frel="Unknown"/>
+    </family>
+</families>
+<people>
+    <person handle="_e1dd36c700f7fa6564d3ac839db" change="1552127019" id="I0000">
+        <gender>U</gender>
+        <childof hlink="_e1dd3b84f9e5d832ffc17baa46c"/>
+    </person>
+    <person handle="_e1dd3bf1f0041d92f586f9d8683" change="1552126972" id="I0001">
+        <gender>U</gender>
+        <parentin hlink="_e1dd3b84f9e5d832ffc17baa46c"/>
+    </person>
+</people>
+"""
+        )
+        assert list(ancestry[Person]["I0001"].children) == [ancestry[Person]["I0000"]]
+
     async def test_event_should_map_type(self) -> None:
         ancestry = await self._load_partial(
             """
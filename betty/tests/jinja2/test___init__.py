@@ -12,6 +12,7 @@ from betty.jinja2 import (
     Jinja2Provider,
     EntityContexts,
     Environment,
+    BYTECODE_CACHE_SCOPE,
 )
 from betty.job import Context
 from betty.locale.localizer import Localizer
@@ -219,6 +220,45 @@ class TestEnvironment:
             template = await sut.from_file(template_file_path)
             assert await template.render_async() == "true"
 
+    async def test_new_for_project_should_cache_bytecode(
+        self, new_temporary_app: App
+    ) -> None:
+        bytecode_cache_directory_path = new_temporary_app.binary_file_cache.with_scope(
+            BYTECODE_CACHE_SCOPE
+        ).path
+        async with Project.new_temporary(new_temporary_app) as project, project:
+            sut = await Environment.new_for_project(project)
+            sut.get_template("base.html.j2")
+        assert any(
+            path.is_file() for path in bytecode_cache_directory_path.rglob("*.cache")
+        )
+
+    async def test_select_entity_template(self, new_temporary_app: App) -> None:
+        async with Project.new_temporary(new_temporary_app) as project, project:
+            sut = await Environment.new_for_project(project)
+            template = sut.select_entity_template("entity/page", DummyEntity)
+            assert template.name == "entity/page.html.j2"
+            assert sut.select_entity_template("entity/page", DummyEntity) is template
+
+    async def test_select_entity_template_with_entity_type_template(
+        self, new_temporary_app: App, tmp_path: Path
+    ) -> None:
+        async with Project.new_temporary(new_temporary_app) as project:
+            template_file_path = (
+                project.configuration.assets_directory_path
+                / "templates"
+                / "entity"
+                / f"page--{DummyEntity.plugin_id()}.html.j2"
+            )
+            template_file_path.parent.mkdir(parents=True)
+            template_file_path.touch()
+            async with project:
+                sut = await Environment.new_for_project(project)
+                template = sut.select_entity_template("entity/page", DummyEntity)
+                assert (
+                    template.name == f"entity/page--{DummyEntity.plugin_id()}.html.j2"
+                )
+
     async def test_project(self, new_temporary_app: App) -> None:
         async with Project.new_temporary(new_temporary_app) as project, project:
             sut = await Environment.new_for_project(project)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+from shutil import copyfile
 from typing import Any, Iterable, TYPE_CHECKING
 
 import aiofiles
@@ -312,6 +313,43 @@ class TestFilterImageResizeCover(TemplateStringTestBase):
                     project.configuration.www_directory_path / file_path[1:]
                 ).exists()
 
+    async def test_should_reuse_derivatives_of_identical_images(
+        self, tmp_path: Path
+    ) -> None:
+        image_path = tmp_path / "image.png"
+        copied_image_path = tmp_path / "copied-image.png"
+        copyfile(self._IMAGE_PATH, image_path)
+        copyfile(self._IMAGE_PATH, copied_image_path)
+        async with self.assert_template_string(
+            template="{{ file1 | filter_image_resize_cover((99, 99)) }}:{{ file2 | filter_image_resize_cover((99, 99)) }}",
+            data={
+                "file1": File(
+                    id="F1",
+                    path=image_path,
+                    media_type=MediaType("image/png"),
+                ),
+                "file2": File(
+                    id="F2",
+                    path=copied_image_path,
+                    media_type=MediaType("image/png"),
+                ),
+                "job_context": Context(),
+            },
+        ) as (actual, project):
+            assert actual == "/file/F1-99x99.png:/file/F2-99x99.png"
+            for file_path in actual.split(":"):
+                assert (
+                    project.configuration.www_directory_path / file_path[1:]
+                ).exists()
+            assert (
+                len(
+                    list(
+                        project.app.binary_file_cache.with_scope("image").path.iterdir()
+                    )
+                )
+                == 1
+            )
+
     async def test_with_svg(self, tmp_path: Path) -> None:
         image_path = tmp_path / "image.svg"
         async with aiofiles.open(image_path, "w") as f:
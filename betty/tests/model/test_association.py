@@ -95,9 +95,11 @@ class TestAssociationRegistry:
             len(
                 list(
                     filter(
-                        lambda association: association.owner_type is self._OwnerBase
-                        and association.owner_attr_name == "base_associate"
-                        and association.associate_type is self._Associate,
+                        lambda association: (
+                            association.owner_type is self._OwnerBase
+                            and association.owner_attr_name == "base_associate"
+                            and association.associate_type is self._Associate
+                        ),
                         actual,
                     )
                 )
@@ -114,9 +116,11 @@ class TestAssociationRegistry:
             len(
                 list(
                     filter(
-                        lambda association: association.owner_type is self._OwnerBase
-                        and association.owner_attr_name == "base_associate"
-                        and association.associate_type is self._Associate,
+                        lambda association: (
+                            association.owner_type is self._OwnerBase
+                            and association.owner_attr_name == "base_associate"
+                            and association.associate_type is self._Associate
+                        ),
                         actual,
                     )
                 )
@@ -127,9 +131,11 @@ class TestAssociationRegistry:
             len(
                 list(
                     filter(
-                        lambda association: association.owner_type is self._Owner
-                        and association.owner_attr_name == "associate"
-                        and association.associate_type is self._Associate,
+                        lambda association: (
+                            association.owner_type is self._Owner
+                            and association.owner_attr_name == "associate"
+                            and association.associate_type is self._Associate
+                        ),
                         actual,
                     )
                 )
@@ -883,6 +889,19 @@ class TestUnidirectionalToMany:
             assert actual == expected
 
 
+class _ChangeRecordingBidirectionalToMany(
+    BidirectionalToMany[
+        "TestBidirectionalToMany._OwnerWithChanges",
+        "TestBidirectionalToMany._AssociateWithChanges",
+    ]
+):
+    @override
+    def associates_changed(
+        self, owner: TestBidirectionalToMany._OwnerWithChanges
+    ) -> None:
+        owner.changes += 1
+
+
 class TestBidirectionalToMany:
     class _Owner(DummyEntity):
         associates = BidirectionalToMany[
@@ -952,6 +971,26 @@ class TestBidirectionalToMany:
             "associates",
         )
 
+    class _OwnerWithChanges(DummyEntity):
+        changes = 0
+        associates = _ChangeRecordingBidirectionalToMany(
+            "betty.tests.model.test_association:TestBidirectionalToMany._OwnerWithChanges",
+            "associates",
+            "betty.tests.model.test_association:TestBidirectionalToMany._AssociateWithChanges",
+            "owner",
+        )
+
+    class _AssociateWithChanges(DummyEntity):
+        owner = BidirectionalToZeroOrOne[
+            "TestBidirectionalToMany._AssociateWithChanges",
+            "TestBidirectionalToMany._OwnerWithChanges",
+        ](
+            "betty.tests.model.test_association:TestBidirectionalToMany._AssociateWithChanges",
+            "owner",
+            "betty.tests.model.test_association:TestBidirectionalToMany._OwnerWithChanges",
+            "associates",
+        )
+
     def test(self) -> None:
         owner = self._Owner()
         associate = self._Associate()
@@ -960,6 +999,17 @@ class TestBidirectionalToMany:
         assert list(owner.associates) == [associate]
         assert associate.owner is owner
 
+    def test_associates_changed(self) -> None:
+        owner = self._OwnerWithChanges()
+        associate = self._AssociateWithChanges()
+
+        owner.associates.add(associate)
+        assert owner.changes == 1
+        owner.associates.remove(associate)
+        assert owner.changes == 2
+        associate.owner = owner
+        assert owner.changes == 3
+
         del owner.associates
         assert list(owner.associates) == []
         assert associate.owner is None
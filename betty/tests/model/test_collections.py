@@ -172,6 +172,47 @@ class TestSingleTypeEntityCollection:
         with pytest.raises(KeyError):
             sut["4"]
 
+    async def test___getstate__(self) -> None:
+        sut = SingleTypeEntityCollection[Entity](DummyEntity)
+        entity1 = SingleTypeEntityCollectionTestEntity()
+        entity2 = SingleTypeEntityCollectionTestEntity()
+        sut.add(entity1, entity2)
+        assert sut.__getstate__() == (DummyEntity, [entity1, entity2])
+
+    async def test___setstate__(self) -> None:
+        entity1 = SingleTypeEntityCollectionTestEntity("1")
+        entity2 = SingleTypeEntityCollectionTestEntity("2")
+        sut = SingleTypeEntityCollection.__new__(SingleTypeEntityCollection)
+        sut.__setstate__((DummyEntity, [entity1, entity2]))
+        assert list(sut) == [entity1, entity2]
+        assert sut["2"] is entity2
+        assert entity1 in sut
+
+    async def test___getitem___by_index_after_remove(self) -> None:
+        sut = SingleTypeEntityCollection[Entity](DummyEntity)
+        entity1 = SingleTypeEntityCollectionTestEntity()
+        entity2 = SingleTypeEntityCollectionTestEntity()
+        entity3 = SingleTypeEntityCollectionTestEntity()
+        sut.add(entity1, entity2, entity3)
+        assert entity2 is sut[1]
+        sut.remove(entity2)
+        assert entity3 is sut[1]
+        assert entity3 is sut[-1]
+
+    async def test___getitem___by_entity_id_with_duplicate_entity_ids(
+        self,
+    ) -> None:
+        sut = SingleTypeEntityCollection[Entity](DummyEntity)
+        entity1 = SingleTypeEntityCollectionTestEntity("1")
+        entity2 = SingleTypeEntityCollectionTestEntity("1")
+        sut.add(entity1, entity2)
+        assert entity1 is sut["1"]
+        sut.remove(entity1)
+        assert entity2 is sut["1"]
+        sut.remove(entity2)
+        with pytest.raises(KeyError):
+            sut["1"]
+
     async def test___delitem___by_entity(self) -> None:
         sut = SingleTypeEntityCollection[Entity](DummyEntity)
         entity1 = SingleTypeEntityCollectionTestEntity()
@@ -460,6 +460,61 @@ class TestPrivatizer:
         )
         assert expected == person.private
 
+    @pytest.mark.parametrize(("expected", "privacy", "event"), _expand_person(-2))
+    async def test_privatize_person_with_grandparent_and_pedigree_collapse(
+        self,
+        expected: bool,
+        privacy: Privacy,
+        event: Event | None,
+    ) -> None:
+        person = Person(privacy=privacy)
+        parent1 = Person()
+        parent2 = Person()
+        person.parents.add(parent1, parent2)
+        grandparent = Person()
+        if event is not None:
+            Presence(grandparent, Subject(), event)
+        parent1.parents.add(grandparent)
+        parent2.parents.add(grandparent)
+        Privatizer(DEFAULT_LIFETIME_THRESHOLD, localizer=DEFAULT_LOCALIZER).privatize(
+            person
+        )
+        assert expected == person.private
+
+    @pytest.mark.parametrize(("expected", "privacy", "event"), _expand_person(-2))
+    async def test_privatize_person_with_grandparent_and_cycle(
+        self,
+        expected: bool,
+        privacy: Privacy,
+        event: Event | None,
+    ) -> None:
+        person = Person(privacy=privacy)
+        parent = Person()
+        person.parents.add(parent)
+        grandparent = Person()
+        if event is not None:
+            Presence(grandparent, Subject(), event)
+        parent.parents.add(grandparent)
+        grandparent.parents.add(parent)
+        Privatizer(DEFAULT_LIFETIME_THRESHOLD, localizer=DEFAULT_LOCALIZER).privatize(
+            person
+        )
+        assert expected == person.private
+
+    async def test_privatize_people_in_long_lineage(self) -> None:
+        people = [Person() for _ in range(9999)]
+        for child, parent in zip(people, people[1:], strict=False):
+            child.parents.add(parent)
+        Presence(
+            people[-1],
+            Subject(),
+            Event(event_type=Birth(), date=Date(datetime.now().year, 1, 1)),
+        )
+        sut = Privatizer(DEFAULT_LIFETIME_THRESHOLD, localizer=DEFAULT_LOCALIZER)
+        for person in people:
+            sut.privatize(person)
+        assert all(person.private for person in people)
+
     async def test_privatize_event_should_not_privatize_if_public(self) -> None:
         citation = Citation(source=Source())
         event_file = File(path=Path(__file__))
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 from typing import Iterator, TYPE_CHECKING
 
@@ -28,12 +29,14 @@ from betty.ancestry.source import Source
 from betty.date import Datey, Date, DateRange
 from betty.model import GeneratedEntityId
 from betty.privacy import Privacy
-from betty.project import Project
+from betty.project import Project, ProjectContext
 from betty.project.config import DEFAULT_LIFETIME_THRESHOLD
+from betty.project.generate import GenerateSiteEvent
 from betty.project.extension.cotton_candy import (
     person_timeline_events,
     associated_file_references,
     CottonCandy,
+    _generate_search_index,
 )
 from betty.test_utils.model import DummyEntity
 from betty.test_utils.project.extension import ExtensionTestBase
@@ -54,21 +57,19 @@ _BEFORE_REFERENCE_DATE = Date(1900, 1, 1)
 _AFTER_REFERENCE_DATE = Date(2000, 1, 1)
 
 
-def _parameterize_with_associated_events() -> (
-    Iterator[
-        tuple[
-            bool,
-            PresenceRole,
-            str | None,
-            Privacy,
-            EventType,
-            Datey | None,
-            Privacy,
-            EventType,
-            Datey | None,
-        ]
+def _parameterize_with_associated_events() -> Iterator[
+    tuple[
+        bool,
+        PresenceRole,
+        str | None,
+        Privacy,
+        EventType,
+        Datey | None,
+        Privacy,
+        EventType,
+        Datey | None,
     ]
-):
+]:
     ids = (
         (True, "E1"),
         (False, None),
@@ -380,3 +381,29 @@ class TestCottonCandy(
         async with Project.new_temporary(new_temporary_app) as project, project:
             sut = await project.new_target(self.get_sut_class())
             assert len(sut.public_css_paths)
+
+    async def test_generate_search_index(self, new_temporary_app: App) -> None:
+        person = Person(id="P1")
+        PersonName(person=person, individual="Jane")
+        async with Project.new_temporary(new_temporary_app) as project:
+            await project.configuration.extensions.enable(CottonCandy)
+            project.ancestry.add(person)
+            async with project:
+                await _generate_search_index(GenerateSiteEvent(ProjectContext(project)))
+                search_directory_path = (
+                    project.configuration.localize_www_directory_path("en-US")
+                    / "search"
+                )
+                index = json.loads((search_directory_path / "index.json").read_text())
+                assert isinstance(index, dict)
+                assert index["tokenShards"] == {"ja": "6a61"}
+                token_shard = json.loads(
+                    (search_directory_path / "tokens" / "6a61.json").read_text()
+                )
+                assert token_shard == {"jane": [0]}
+                results = json.loads(
+                    (search_directory_path / "results" / "0.json").read_text()
+                )
+                assert isinstance(results, list)
+                assert len(results) == 1
+                assert "/person/P1/index.html" in str(results[0])
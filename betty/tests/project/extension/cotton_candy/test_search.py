@@ -2,6 +2,7 @@ from pathlib import Path
 
 import pytest
 
+from betty.ancestry import Ancestry
 from betty.ancestry.file import File
 from betty.ancestry.name import Name
 from betty.ancestry.person import Person
@@ -13,7 +14,14 @@ from betty.locale.localizer import DEFAULT_LOCALIZER
 from betty.project import Project
 from betty.project.config import LocaleConfiguration
 from betty.project.extension.cotton_candy import CottonCandy
-from betty.project.extension.cotton_candy.search import Index
+from betty.project.extension.cotton_candy.search import (
+    EntityText,
+    Index,
+    InvertedIndex,
+    extract_texts,
+    token_shard_name,
+    _Entry,
+)
 
 
 class TestIndex:
@@ -379,3 +387,100 @@ class TestIndex:
                 ).build()
 
                 assert actual == []
+
+    async def test_build_with_texts(self, new_temporary_app: App) -> None:
+        person = Person(id="P1")
+        async with Project.new_temporary(new_temporary_app) as project:
+            await project.configuration.extensions.enable(CottonCandy)
+            project.ancestry.add(person)
+            async with project:
+                actual = await Index(
+                    project.ancestry,
+                    await project.jinja2_environment,
+                    Context(),
+                    DEFAULT_LOCALIZER,
+                    texts=[EntityText(person, {"jane"})],
+                ).build()
+
+                assert actual[0].text == {"jane"}
+                assert "/person/P1/index.html" in actual[0].result
+
+
+class TestEntityText:
+    async def test_entity(self) -> None:
+        person = Person()
+        sut = EntityText(person, {"jane"})
+        assert sut.entity is person
+
+    async def test_text(self) -> None:
+        sut = EntityText(Person(), {"jane"})
+        assert sut.text == {"jane"}
+
+
+class TestExtractTexts:
+    async def test_without_entities(self) -> None:
+        ancestry = await Ancestry.new()
+        assert extract_texts(ancestry) == []
+
+    async def test_with_entities(self) -> None:
+        person = Person(id="P1")
+        PersonName(person=person, individual="Jane")
+        private_person = Person(id="P2", private=True)
+        PersonName(person=private_person, individual="John")
+        person_without_names = Person(id="P3")
+        place = Place(id="P4", names=[Name("Amsterdam")])
+        ancestry = await Ancestry.new()
+        ancestry.add(person, private_person, person_without_names, place)
+        assert [(text.entity, text.text) for text in extract_texts(ancestry)] == [
+            (person, {"jane"}),
+            (place, {"amsterdam"}),
+        ]
+
+
+class TestInvertedIndex:
+    async def test_token_shards(self) -> None:
+        sut = InvertedIndex(
+            [
+                _Entry({"jane", "doe"}, "result-jane-doe"),
+                _Entry({"john", "doe"}, "result-john-doe"),
+                _Entry({"j"}, "result-j"),
+            ]
+        )
+        assert sut.token_shards == {
+            "ja": {"jane": [0]},
+            "jo": {"john": [1]},
+            "do": {"doe": [0, 1]},
+            "j": {"j": [2]},
+        }
+
+    async def test_token_prefix_length(self) -> None:
+        sut = InvertedIndex([_Entry({"jane"}, "result-jane")])
+        assert {len(prefix) for prefix in sut.token_shards} == {sut.token_prefix_length}
+
+    async def test_results_per_shard(self) -> None:
+        sut = InvertedIndex([_Entry({"jane"}, "result-jane")])
+        assert sut.results_per_shard > 0
+
+    async def test_result_shards(self) -> None:
+        entries = [
+            _Entry({"jane"}, f"result-{ordinal}")
+            for ordinal in range(InvertedIndex([]).results_per_shard + 1)
+        ]
+        sut = InvertedIndex(entries)
+        assert len(sut.result_shards) == 2
+        assert [
+            result for result_shard in sut.result_shards for result in result_shard
+        ] == [entry.result for entry in entries]
+
+
+class TestTokenShardName:
+    @pytest.mark.parametrize(
+        ("expected", "prefix"),
+        [
+            ("6a61", "ja"),
+            ("2f2e", "/."),
+            ("c3a9", "é"),
+        ],
+    )
+    async def test(self, expected: str, prefix: str) -> None:
+        assert token_shard_name(prefix) == expected
@@ -1,7 +1,10 @@
+from collections.abc import AsyncIterator, Coroutine
 from pathlib import Path
 from tempfile import NamedTemporaryFile
+from typing import Any
 
 import aiofiles
+import pytest
 from pytest_mock import MockerFixture
 
 from betty.ancestry.citation import Citation
@@ -10,6 +13,7 @@ from betty.ancestry.event_type.event_types import Birth
 from betty.ancestry.file import File
 from betty.ancestry.name import Name
 from betty.ancestry.person import Person
+from betty.ancestry.person_name import PersonName
 from betty.ancestry.place import Place
 from betty.ancestry.source import Source
 from betty.app import App
@@ -19,7 +23,16 @@ from betty.model import (
 from betty.plugin.static import StaticPluginRepository
 from betty.project import Project, ProjectContext
 from betty.project.config import LocaleConfiguration, EntityTypeConfiguration
-from betty.project.generate import generate, GenerateSiteEvent
+from betty.project.generate import (
+    generate,
+    GenerateSiteEvent,
+    _JobProgress,
+    _count_jobs,
+    _run_entity_jobs,
+    _run_jobs,
+    _run_job_pool,
+)
+from betty.project.generate.file import FileWriter
 from betty.string import camel_case_to_kebab_case, kebab_case_to_lower_camel_case
 from betty.test_utils.jinja2 import assert_betty_html, assert_betty_json
 from betty.test_utils.model import DummyEntity
@@ -328,6 +341,168 @@ class TestGenerate:
                     project, f"/person/{person.id}/index.json", "personEntity"
                 )
 
+    async def test_with_incremental(self) -> None:
+        unchanged_person = Person(id="UNCHANGED")
+        removed_person = Person(id="REMOVED")
+        async with (
+            App.new_temporary() as app,
+            app,
+            Project.new_temporary(app) as project,
+        ):
+            project.ancestry.add(unchanged_person, removed_person)
+            async with project:
+                await generate(project, incremental=True)
+                unchanged_person_html_file_path = await assert_betty_html(
+                    project, f"/person/{unchanged_person.id}/index.html"
+                )
+                removed_person_json_file_path = await assert_betty_json(
+                    project, f"/person/{removed_person.id}/index.json", "personEntity"
+                )
+                async with aiofiles.open(unchanged_person_html_file_path, "w") as f:
+                    await f.write("UNCHANGED")
+
+                project.ancestry.remove(removed_person)
+                added_person = Person(id="ADDED")
+                project.ancestry.add(added_person)
+                await generate(project, incremental=True)
+
+                async with aiofiles.open(unchanged_person_html_file_path) as f:
+                    assert await f.read() == "UNCHANGED"
+                assert not removed_person_json_file_path.exists()
+                assert not removed_person_json_file_path.parent.exists()
+                await assert_betty_html(
+                    project, f"/person/{added_person.id}/index.html"
+                )
+                await assert_betty_html(project, "/person/index.html")
+
+    async def test_with_incremental_and_changed_ancestor(self) -> None:
+        grandparent = Person(id="GRANDPARENT")
+        parent = Person(id="PARENT", parents=[grandparent])
+        person = Person(id="PERSON", parents=[parent])
+        async with (
+            App.new_temporary() as app,
+            app,
+            Project.new_temporary(app) as project,
+        ):
+            project.ancestry.add(grandparent, parent, person)
+            async with project:
+                await generate(project, incremental=True)
+                person_html_file_path = await assert_betty_html(
+                    project, f"/person/{person.id}/index.html"
+                )
+                async with aiofiles.open(person_html_file_path, "w") as f:
+                    await f.write("UNCHANGED")
+
+                PersonName(person=grandparent, individual="Jane", affiliation="Doe")
+                await generate(project, incremental=True)
+
+                async with aiofiles.open(person_html_file_path) as f:
+                    assert await f.read() != "UNCHANGED"
+
+    async def test_with_incremental_and_changed_configuration(self) -> None:
+        person = Person(id="PERSON")
+        async with (
+            App.new_temporary() as app,
+            app,
+            Project.new_temporary(app) as project,
+        ):
+            project.ancestry.add(person)
+            async with project:
+                await generate(project, incremental=True)
+                person_html_file_path = await assert_betty_html(
+                    project, f"/person/{person.id}/index.html"
+                )
+                async with aiofiles.open(person_html_file_path, "w") as f:
+                    await f.write("UNCHANGED")
+
+                project.configuration.title = "My Changed Family Tree"
+                await generate(project, incremental=True)
+
+                async with aiofiles.open(person_html_file_path) as f:
+                    assert await f.read() != "UNCHANGED"
+
+    async def test_with_processes(self) -> None:
+        people = [Person(id=f"PERSON{index}") for index in range(5)]
+        people[1].parents.add(people[0])
+        event = Event(id="EVENT1", event_type=Birth())
+        async with (
+            App.new_temporary() as app,
+            app,
+            Project.new_temporary(app) as project,
+        ):
+            project.configuration.locales["en-US"].alias = "en"
+            project.configuration.locales.append(
+                LocaleConfiguration(
+                    "nl-NL",
+                    alias="nl",
+                )
+            )
+            project.ancestry.add(*people, event)
+            async with project:
+                await generate(project, processes=2)
+                await assert_betty_html(project, "/en/index.html")
+                await assert_betty_html(project, "/nl/person/index.html")
+                await assert_betty_json(
+                    project, "/person/index.json", "personEntityCollectionResponse"
+                )
+                await assert_betty_html(project, f"/nl/event/{event.id}/index.html")
+                for person in people:
+                    for locale in ("en", "nl"):
+                        await assert_betty_html(
+                            project, f"/{locale}/person/{person.id}/index.html"
+                        )
+                    await assert_betty_json(
+                        project, f"/person/{person.id}/index.json", "personEntity"
+                    )
+
+    async def test_with_processes_and_failing_job(self, mocker: MockerFixture) -> None:
+        mocker.patch(
+            "betty.project.generate._generate_sitemap", side_effect=RuntimeError
+        )
+        async with (
+            App.new_temporary() as app,
+            app,
+            Project.new_temporary(app) as project,
+        ):
+            project.ancestry.add(*(Person(id=f"PERSON{index}") for index in range(99)))
+            async with project:
+                with pytest.raises(RuntimeError):
+                    await generate(project, processes=2)
+
+    @pytest.mark.parametrize(
+        "concurrency",
+        [
+            0,
+            -1,
+        ],
+    )
+    async def test_with_invalid_concurrency(self, concurrency: int) -> None:
+        async with (
+            App.new_temporary() as app,
+            app,
+            Project.new_temporary(app) as project,
+            project,
+        ):
+            with pytest.raises(ValueError):  # noqa PT011
+                await generate(project, concurrency=concurrency)
+
+    @pytest.mark.parametrize(
+        "processes",
+        [
+            0,
+            -1,
+        ],
+    )
+    async def test_with_invalid_processes(self, processes: int) -> None:
+        async with (
+            App.new_temporary() as app,
+            app,
+            Project.new_temporary(app) as project,
+            project,
+        ):
+            with pytest.raises(ValueError):  # noqa PT011
+                await generate(project, processes=processes)
+
     async def test_events(self) -> None:
         async with (
             App.new_temporary() as app,
@@ -410,6 +585,119 @@ class TestGenerate:
                 )
 
 
+class TestRunJobPool:
+    @pytest.mark.parametrize(
+        "concurrency",
+        [
+            1,
+            3,
+            999,
+        ],
+    )
+    async def test(self, concurrency: int) -> None:
+        completed = []
+
+        async def _job(job_id: int) -> None:
+            completed.append(job_id)
+
+        async def _jobs() -> AsyncIterator[Coroutine[Any, Any, None]]:
+            for job_id in range(99):
+                yield _job(job_id)
+
+        progress = _JobProgress()
+        await _run_job_pool(_jobs(), progress, concurrency=concurrency)
+        assert sorted(completed) == list(range(99))
+        assert progress.completed == 99
+
+    async def test_with_failing_job(self) -> None:
+        async def _job() -> None:
+            pass
+
+        async def _failing_job() -> None:
+            raise RuntimeError
+
+        async def _jobs() -> AsyncIterator[Coroutine[Any, Any, None]]:
+            yield _job()
+            yield _failing_job()
+            for __ in range(99):
+                yield _job()
+
+        with pytest.raises(RuntimeError):
+            await _run_job_pool(_jobs(), _JobProgress(), concurrency=2)
+
+
+class TestCountJobs:
+    async def test(self) -> None:
+        async with (
+            App.new_temporary() as app,
+            app,
+            Project.new_temporary(app) as project,
+        ):
+            project.configuration.locales["en-US"].alias = "en"
+            project.configuration.locales.append(
+                LocaleConfiguration("nl-NL", alias="nl")
+            )
+            project.ancestry.add(
+                Person(id="PUBLIC", public=True),
+                Person(id="PRIVATE", private=True),
+                Person(),
+            )
+            async with project:
+                job_context = ProjectContext(project)
+                jobs = [job async for job in _run_jobs(job_context, FileWriter())]
+                for job in jobs:
+                    job.close()
+                assert await _count_jobs(project) == len(jobs)
+
+
+class TestJobProgress:
+    async def test_merge(self) -> None:
+        sut = _JobProgress()
+        sut.completed = 1
+        sut.merge(0, 2)
+        sut.merge(1, 4)
+        sut.merge(0, 5)
+        assert sut.overall_completed == 10
+
+
+class TestRunEntityJobs:
+    @pytest.mark.parametrize(
+        "shards",
+        [
+            1,
+            2,
+            3,
+        ],
+    )
+    async def test(self, shards: int) -> None:
+        async with (
+            App.new_temporary() as app,
+            app,
+            Project.new_temporary(app) as project,
+        ):
+            project.ancestry.add(*(Person(id=f"PERSON{index}") for index in range(7)))
+            async with project:
+                job_context = ProjectContext(project)
+                writer = FileWriter()
+                expected = [
+                    self._describe_job(job)
+                    async for job in _run_entity_jobs(job_context, writer)
+                ]
+                actual = [
+                    self._describe_job(job)
+                    for shard in range(shards)
+                    async for job in _run_entity_jobs(
+                        job_context, writer, shard=shard, shards=shards
+                    )
+                ]
+                assert sorted(actual) == sorted(expected)
+
+    def _describe_job(self, job: Coroutine[Any, Any, None]) -> str:
+        description = f"{job.__qualname__}{job.cr_frame.f_locals!r}"  # type: ignore[attr-defined]
+        job.close()
+        return description
+
+
 class TestResourceOverride:
     async def test(self) -> None:
         async with (
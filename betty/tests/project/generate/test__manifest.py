@@ -0,0 +1,292 @@
+import json
+from collections.abc import Mapping
+from pathlib import Path
+
+import aiofiles
+
+from betty.ancestry.enclosure import Enclosure
+from betty.ancestry.event import Event
+from betty.ancestry.event_type.event_types import Birth
+from betty.ancestry.name import Name
+from betty.ancestry.person import Person
+from betty.ancestry.person_name import PersonName
+from betty.ancestry.place import Place
+from betty.ancestry.presence import Presence
+from betty.ancestry.presence_role.presence_roles import Subject
+from betty.app import App
+from betty.model import Entity
+from betty.project import Project
+from betty.project.generate._manifest import Manifest
+
+
+class TestManifest:
+    def _new_sut(
+        self,
+        output_directory_path: Path,
+        *,
+        configuration_digest: str = "configuration",
+        assets_digest: str = "assets",
+        versions_digest: str = "versions",
+    ) -> Manifest:
+        return Manifest(
+            output_directory_path,
+            configuration_digest=configuration_digest,
+            assets_digest=assets_digest,
+            versions_digest=versions_digest,
+        )
+
+    async def _track(
+        self, sut: Manifest, project: Project, previous: Manifest | None = None
+    ) -> Mapping[Entity, bool]:
+        """
+        Track the project's entities, and check which of their pages changed.
+        """
+        if previous is not None:
+            assert sut.continue_from(previous)
+        await sut.track_entities(project)
+        pages_changed = {}
+        for entity in project.ancestry:
+            file_path = (
+                project.configuration.output_directory_path
+                / entity.type.plugin_id()
+                / entity.id
+                / "index.html"
+            )
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.touch()
+            pages_changed[entity] = sut.page_changed(file_path, entity)
+        return pages_changed
+
+    async def test_read_without_manifest(self, tmp_path: Path) -> None:
+        assert await Manifest.read(tmp_path) is None
+
+    async def test_write(self, tmp_path: Path) -> None:
+        file_path = tmp_path / "www" / "index.html"
+        sut = self._new_sut(tmp_path)
+        sut.changed(file_path, "input")
+        await sut.write()
+        manifest = await Manifest.read(tmp_path)
+        assert manifest is not None
+        assert manifest.files == sut.files
+        assert manifest.entities == sut.entities
+
+    async def test_read_with_invalid_manifest(self, tmp_path: Path) -> None:
+        async with aiofiles.open(Manifest.file_path(tmp_path), "w") as f:
+            await f.write(
+                json.dumps(
+                    {
+                        "version": 2,
+                        "configuration": "configuration",
+                        "assets": "assets",
+                        "versions": "versions",
+                        "files": ["www/index.html"],
+                        "entities": {},
+                    }
+                )
+            )
+        assert await Manifest.read(tmp_path) is None
+
+    async def test_read_with_undecodable_manifest(self, tmp_path: Path) -> None:
+        async with aiofiles.open(Manifest.file_path(tmp_path), "wb") as f:
+            await f.write(b"\xff\xfe\xfd")
+        assert await Manifest.read(tmp_path) is None
+
+    async def test_continue_from(self, tmp_path: Path) -> None:
+        previous = self._new_sut(tmp_path)
+        sut = self._new_sut(tmp_path)
+        assert sut.continue_from(previous)
+
+    async def test_continue_from_with_changed_configuration(
+        self, tmp_path: Path
+    ) -> None:
+        previous = self._new_sut(tmp_path)
+        sut = self._new_sut(tmp_path, configuration_digest="changed-configuration")
+        assert not sut.continue_from(previous)
+
+    async def test_continue_from_with_changed_assets(self, tmp_path: Path) -> None:
+        previous = self._new_sut(tmp_path)
+        sut = self._new_sut(tmp_path, assets_digest="changed-assets")
+        assert not sut.continue_from(previous)
+
+    async def test_continue_from_with_changed_versions(self, tmp_path: Path) -> None:
+        previous = self._new_sut(tmp_path)
+        sut = self._new_sut(tmp_path, versions_digest="changed-versions")
+        assert not sut.continue_from(previous)
+
+    async def test_new_for_project_should_digest_translations(self) -> None:
+        async with (
+            App.new_temporary() as app,
+            app,
+            Project.new_temporary(app) as project,
+        ):
+            translation_file_path = (
+                project.configuration.assets_directory_path
+                / "locale"
+                / "nl-NL"
+                / "betty.po"
+            )
+            translation_file_path.parent.mkdir(parents=True)
+            translation_file_path.touch()
+            async with project:
+                previous = await Manifest.new_for_project(project)
+                async with aiofiles.open(translation_file_path, "w") as f:
+                    await f.write('msgid "Hello"\nmsgstr "Hallo"\n')
+                sut = await Manifest.new_for_project(project)
+                assert not sut.continue_from(previous)
+
+    async def test_changed(self, tmp_path: Path) -> None:
+        file_path = tmp_path / "www" / "index.html"
+        file_path.parent.mkdir()
+        file_path.touch()
+        previous = self._new_sut(tmp_path)
+        assert previous.changed(file_path, "input")
+
+        sut = self._new_sut(tmp_path)
+        sut.continue_from(previous)
+        assert not sut.changed(file_path, "input")
+        assert sut.changed(file_path, "changed-input")
+
+    async def test_changed_without_file(self, tmp_path: Path) -> None:
+        file_path = tmp_path / "www" / "index.html"
+        previous = self._new_sut(tmp_path)
+        previous.changed(file_path, "input")
+
+        sut = self._new_sut(tmp_path)
+        sut.continue_from(previous)
+        assert sut.changed(file_path, "input")
+
+    async def test_changed_after_tracking_entities(self) -> None:
+        async with (
+            App.new_temporary() as app,
+            app,
+            Project.new_temporary(app) as project,
+            project,
+        ):
+            output_directory_path = project.configuration.output_directory_path
+            kept_file_path = output_directory_path / "www" / "kept" / "index.html"
+            removed_file_path = output_directory_path / "www" / "removed" / "index.html"
+            for file_path in (kept_file_path, removed_file_path):
+                file_path.parent.mkdir(parents=True)
+                file_path.touch()
+            previous = self._new_sut(output_directory_path)
+            previous.changed(kept_file_path, "input")
+            previous.changed(removed_file_path, "input")
+            removed_file_path.unlink()
+
+            sut = self._new_sut(output_directory_path)
+            sut.continue_from(previous)
+            await sut.track_entities(project)
+            assert not sut.changed(kept_file_path, "input")
+            assert sut.changed(removed_file_path, "input")
+
+    async def test_prune(self, tmp_path: Path) -> None:
+        kept_file_path = tmp_path / "www" / "person" / "KEPT" / "index.html"
+        pruned_file_path = tmp_path / "www" / "person" / "PRUNED" / "index.html"
+        for file_path in (kept_file_path, pruned_file_path):
+            file_path.parent.mkdir(parents=True)
+            file_path.touch()
+        previous = self._new_sut(tmp_path)
+        previous.changed(kept_file_path, "input")
+        previous.changed(pruned_file_path, "input")
+
+        sut = self._new_sut(tmp_path)
+        sut.continue_from(previous)
+        sut.changed(kept_file_path, "input")
+        sut.prune()
+
+        assert kept_file_path.exists()
+        assert not pruned_file_path.exists()
+        assert not pruned_file_path.parent.exists()
+        assert tmp_path.exists()
+
+    async def test_entity_digest_should_ignore_generated_entity_ids(self) -> None:
+        async with (
+            App.new_temporary() as app,
+            app,
+            Project.new_temporary(app) as project,
+            project,
+        ):
+            person1 = Person(id="PERSON")
+            PersonName(person=person1, individual="Jane")
+            person2 = Person(id="PERSON")
+            PersonName(person=person2, individual="Jane")
+            sut = await Manifest.new_for_project(project)
+            assert await sut.entity_digest(project, person1) == await sut.entity_digest(
+                project, person2
+            )
+
+    async def test_track_entities_without_changes(self, tmp_path: Path) -> None:
+        person = Person(id="PERSON")
+        PersonName(person=person, individual="Jane")
+        async with (
+            App.new_temporary() as app,
+            app,
+            Project.new_temporary(app) as project,
+        ):
+            project.ancestry.add(person)
+            async with project:
+                previous = self._new_sut(project.configuration.output_directory_path)
+                await self._track(previous, project)
+                sut = self._new_sut(project.configuration.output_directory_path)
+                pages_changed = await self._track(sut, project, previous)
+                assert not any(pages_changed.values())
+
+    async def test_track_entities_with_changed_lineage(self, tmp_path: Path) -> None:
+        grandparent = Person(id="GRANDPARENT")
+        grandparent_name = PersonName(person=grandparent, affiliation="Doe")
+        parent = Person(id="PARENT", parents=[grandparent])
+        person = Person(id="PERSON", parents=[parent])
+        sibling = Person(id="SIBLING", parents=[parent])
+        grandchild = Person(id="GRANDCHILD", parents=[person])
+        unrelated = Person(id="UNRELATED")
+        async with (
+            App.new_temporary() as app,
+            app,
+            Project.new_temporary(app) as project,
+        ):
+            project.ancestry.add(
+                grandparent,
+                grandparent_name,
+                parent,
+                person,
+                sibling,
+                grandchild,
+                unrelated,
+            )
+            async with project:
+                previous = self._new_sut(project.configuration.output_directory_path)
+                await self._track(previous, project)
+
+                PersonName(person=grandparent, affiliation="Doh")
+                sut = self._new_sut(project.configuration.output_directory_path)
+                pages_changed = await self._track(sut, project, previous)
+                for relative in (grandparent, parent, person, sibling, grandchild):
+                    assert pages_changed[relative]
+                assert not pages_changed[unrelated]
+
+    async def test_track_entities_with_changed_encloser(self, tmp_path: Path) -> None:
+        country = Place(id="COUNTRY", names=[Name("The Netherlands")])
+        city = Place(id="CITY", names=[Name("Amsterdam")])
+        enclosure = Enclosure(enclosee=city, encloser=country)
+        event = Event(id="EVENT", event_type=Birth(), place=city)
+        person = Person(id="PERSON")
+        presence = Presence(person, Subject(), event)
+        other_place = Place(id="OTHER_PLACE", names=[Name("Elsewhere")])
+        async with (
+            App.new_temporary() as app,
+            app,
+            Project.new_temporary(app) as project,
+        ):
+            project.ancestry.add(
+                country, city, enclosure, event, person, presence, other_place
+            )
+            async with project:
+                previous = self._new_sut(project.configuration.output_directory_path)
+                await self._track(previous, project)
+
+                country.names.append(Name("Nederland"))
+                sut = self._new_sut(project.configuration.output_directory_path)
+                pages_changed = await self._track(sut, project, previous)
+                for entity in (country, city, event, person):
+                    assert pages_changed[entity]
+                assert not pages_changed[other_place]
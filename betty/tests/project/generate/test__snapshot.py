@@ -0,0 +1,57 @@
+from betty.ancestry import Ancestry
+from betty.ancestry.event import Event
+from betty.ancestry.event_type.event_types import Birth
+from betty.ancestry.person import Person
+from betty.ancestry.person_name import PersonName
+from betty.ancestry.presence import Presence
+from betty.ancestry.presence_role.presence_roles import Subject
+from betty.project.generate._snapshot import dump_ancestry, load_ancestry
+
+
+class TestDumpAncestry:
+    async def test_with_deeply_associated_entities(self) -> None:
+        ancestry = await Ancestry.new()
+        parent = None
+        for index in range(9999):
+            person = Person(id=f"PERSON{index}")
+            if parent is not None:
+                person.parents.add(parent)
+            ancestry.add(person)
+            parent = person
+        loaded_ancestry = await load_ancestry(dump_ancestry(ancestry))
+        assert len(loaded_ancestry) == len(ancestry)
+
+
+class TestLoadAncestry:
+    async def test(self) -> None:
+        parent = Person(id="PARENT")
+        person = Person(id="PERSON", parents=[parent])
+        PersonName(person=person, individual="Jane")
+        Presence(person, Subject(), Event(id="EVENT", event_type=Birth()))
+        ancestry = await Ancestry.new()
+        ancestry.add(parent, person)
+
+        loaded_ancestry = await load_ancestry(dump_ancestry(ancestry))
+
+        assert len(loaded_ancestry) == len(ancestry)
+        loaded_person = loaded_ancestry[Person]["PERSON"]
+        loaded_parent = loaded_ancestry[Person]["PARENT"]
+        assert loaded_person is not person
+        assert list(loaded_person.parents) == [loaded_parent]
+        assert list(loaded_parent.children) == [loaded_person]
+        assert loaded_person.names[0].individual == "Jane"
+        assert loaded_person.names[0].person is loaded_person
+        loaded_event = loaded_ancestry[Event]["EVENT"]
+        assert loaded_person.presences[0].event is loaded_event
+        assert loaded_event.presences[0].person is loaded_person
+
+    async def test_should_keep_associations_bidirectional(self) -> None:
+        parent = Person(id="PARENT")
+        person = Person(id="PERSON", parents=[parent])
+        ancestry = await Ancestry.new()
+        ancestry.add(parent, person)
+        loaded_ancestry = await load_ancestry(dump_ancestry(ancestry))
+        loaded_person = loaded_ancestry[Person]["PERSON"]
+        loaded_parent = loaded_ancestry[Person]["PARENT"]
+        loaded_parent.children.remove(loaded_person)
+        assert list(loaded_person.parents) == []
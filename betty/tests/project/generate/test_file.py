@@ -1,3 +1,5 @@
+import os
+import sys
 from collections.abc import Sequence
 from pathlib import Path
 
@@ -8,6 +10,8 @@ from betty.project.generate.file import (
     create_file,
     create_html_resource,
     create_json_resource,
+    FileWriter,
+    set_permissions,
 )
 
 
@@ -49,3 +53,146 @@ class TestCreateJsonResource:
         file_path = resource_path / "index.json"
         async with aiofiles.open(file_path) as f:
             assert await f.read() == content
+
+
+class TestFileWriter:
+    @pytest.mark.parametrize(
+        "path_segments",
+        [
+            ["file"],
+            ["directory", "file"],
+            ["directory", "another-directory", "file"],
+        ],
+    )
+    async def test_write(self, tmp_path: Path, path_segments: Sequence[str]) -> None:
+        file_path = tmp_path.joinpath(*path_segments)
+        content = "Hello, world!"
+        async with FileWriter() as sut:
+            await sut.write(file_path, content)
+        async with aiofiles.open(file_path) as f:
+            assert await f.read() == content
+
+    async def test___aenter__(self) -> None:
+        sut = FileWriter()
+        assert await sut.__aenter__() is sut
+        await sut.__aexit__(None, None, None)
+
+    async def test___aexit__(self, tmp_path: Path) -> None:
+        file_path = tmp_path / "file"
+        sut = FileWriter(queue_size=1)
+        await sut.__aenter__()
+        await sut.write(file_path, "Hello, world!")
+        await sut.__aexit__(None, None, None)
+        assert file_path.read_text() == "Hello, world!"
+
+    async def test_write_should_overwrite(self, tmp_path: Path) -> None:
+        file_path = tmp_path / "file"
+        file_path.write_text("Goodbye, world! Goodbye, world!")
+        content = "Hello, world!"
+        async with FileWriter() as sut:
+            await sut.write(file_path, content)
+        async with aiofiles.open(file_path) as f:
+            assert await f.read() == content
+
+    async def test_write_with_many_files(self, tmp_path: Path) -> None:
+        async with FileWriter(batch_size=3, queue_size=5) as sut:
+            for index in range(32):
+                await sut.write(tmp_path / str(index) / "file", str(index))
+        for index in range(32):
+            async with aiofiles.open(tmp_path / str(index) / "file") as f:
+                assert await f.read() == str(index)
+
+    async def test_write_should_raise_errors(self, tmp_path: Path) -> None:
+        file_path = tmp_path / "file"
+        file_path.touch()
+        with pytest.raises(OSError):
+            async with FileWriter() as sut:
+                await sut.write(file_path / "file", "Hello, world!")
+
+    async def test_write_should_raise_errors_once(self, tmp_path: Path) -> None:
+        file_path = tmp_path / "file"
+        file_path.touch()
+        sut = FileWriter()
+        await sut.__aenter__()
+        await sut.write(file_path / "file", "Hello, world!")
+        with pytest.raises(OSError):
+            await sut.__aexit__(None, None, None)
+        # The error was raised already.
+        await sut.write(file_path / "file", "Hello, world!")
+
+    async def test___aexit___should_not_replace_errors(self, tmp_path: Path) -> None:
+        file_path = tmp_path / "file"
+        file_path.touch()
+
+        class _Error(Exception):
+            pass
+
+        with pytest.raises(_Error):
+            async with FileWriter() as sut:
+                await sut.write(file_path / "file", "Hello, world!")
+                raise _Error
+
+    @pytest.mark.skipif(
+        sys.platform.startswith("win32"),
+        reason="Windows does not support POSIX file permissions.",
+    )
+    async def test_write_should_set_permissions(self, tmp_path: Path) -> None:
+        file_path = tmp_path / "directory" / "file"
+        umask = os.umask(0o022)
+        try:
+            async with FileWriter() as sut:
+                await sut.write(file_path, "Hello, world!")
+        finally:
+            os.umask(umask)
+        assert file_path.stat().st_mode & 0o777 == 0o644
+        assert file_path.parent.stat().st_mode & 0o777 == 0o755
+
+    async def test_write_html_resource(self, tmp_path: Path) -> None:
+        resource_path = tmp_path / "resource"
+        content = "Hello, world!"
+        async with FileWriter() as sut:
+            await sut.write_html_resource(resource_path, content)
+        async with aiofiles.open(resource_path / "index.html") as f:
+            assert await f.read() == content
+
+    async def test_write_json_resource(self, tmp_path: Path) -> None:
+        resource_path = tmp_path / "resource"
+        content = "Hello, world!"
+        async with FileWriter() as sut:
+            await sut.write_json_resource(resource_path, content)
+        async with aiofiles.open(resource_path / "index.json") as f:
+            assert await f.read() == content
+
+
+class TestSetPermissions:
+    @pytest.mark.skipif(
+        sys.platform.startswith("win32"),
+        reason="Windows does not support POSIX file permissions.",
+    )
+    async def test(self, tmp_path: Path) -> None:
+        file_paths = [
+            tmp_path / "file",
+            tmp_path / "directory" / "file",
+            tmp_path
+            / "directory"
+            / "another-directory"
+            / "yet-another-directory"
+            / "file",
+        ]
+        for file_path in file_paths:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.touch(0o600)
+            file_path.chmod(0o600)
+        directory_paths = [
+            tmp_path,
+            tmp_path / "directory",
+            tmp_path / "directory" / "another-directory",
+            tmp_path / "directory" / "another-directory" / "yet-another-directory",
+        ]
+        for directory_path in reversed(directory_paths):
+            directory_path.chmod(0o700)
+        await set_permissions(tmp_path)
+        for file_path in file_paths:
+            assert file_path.stat().st_mode & 0o777 == 0o644
+        for directory_path in directory_paths:
+            assert directory_path.stat().st_mode & 0o777 == 0o755
@@ -1,5 +1,6 @@
 import pytest
 from multidict import CIMultiDict
+from pytest_mock import MockerFixture
 
 from betty.ancestry.link import Link, HasLinks
 from betty.app import App
@@ -181,3 +182,92 @@ class TestLoad:
                 link.description.localize(DEFAULT_LOCALIZER)
                 == link_page_meta_description
             )
+
+    async def test_should_fetch_link_label_once_for_duplicate_links(self) -> None:
+        link_url = "https://example.com"
+        link_page_title = "Hello, world!"
+        link_page_html = (
+            f"<html><head><title>{link_page_title}</title></head><body></body></html>"
+        )
+        links = [Link(link_url), Link(link_url)]
+        fetcher = StaticFetcher(
+            fetch_map={
+                link_url: FetchResponse(
+                    CIMultiDict({"Content-Type": "text/html"}),
+                    link_page_html.encode("utf-8"),
+                    "utf-8",
+                )
+            }
+        )
+        async with (
+            App.new_temporary(fetcher=fetcher) as app,
+            app,
+            Project.new_temporary(app) as project,
+        ):
+            project.ancestry.add(
+                DummyHasLinks(links=[links[0]]), DummyHasLinks(links=[links[1]])
+            )
+            async with project:
+                await load(project)
+
+            for link in links:
+                assert link.label.localize(DEFAULT_LOCALIZER) == link_page_title
+
+    async def test_should_fetch_link_label_from_html_head_only(self) -> None:
+        link_url = "https://example.com"
+        link_page_html = '<html><head><title>Hello &amp; goodbye</title></head><body><svg><title>Not the title</title></svg><meta name="description" content="Not the description"></body></html>'
+        link = Link(link_url)
+        fetcher = StaticFetcher(
+            fetch_map={
+                link_url: FetchResponse(
+                    CIMultiDict({"Content-Type": "text/html"}),
+                    link_page_html.encode("utf-8"),
+                    "utf-8",
+                )
+            }
+        )
+        async with (
+            App.new_temporary(fetcher=fetcher) as app,
+            app,
+            Project.new_temporary(app) as project,
+        ):
+            project.ancestry.add(DummyHasLinks(links=[link]))
+            async with project:
+                await load(project)
+
+            assert link.label.localize(DEFAULT_LOCALIZER) == "Hello & goodbye"
+            assert not link.description
+
+    async def test_should_fetch_link_label_from_cache_in_bulk(
+        self, mocker: MockerFixture
+    ) -> None:
+        link_url = "https://example.com"
+        link_page_title = "Hello, world!"
+        link_page_html = (
+            f"<html><head><title>{link_page_title}</title></head><body></body></html>"
+        )
+        link = Link(link_url)
+        fetcher = StaticFetcher()
+        m_fetch = mocker.patch.object(fetcher, "fetch")
+        mocker.patch.object(
+            fetcher,
+            "fetch_cached_many",
+            return_value={
+                link_url: FetchResponse(
+                    CIMultiDict({"Content-Type": "text/html"}),
+                    link_page_html.encode("utf-8"),
+                    "utf-8",
+                )
+            },
+        )
+        async with (
+            App.new_temporary(fetcher=fetcher) as app,
+            app,
+            Project.new_temporary(app) as project,
+        ):
+            project.ancestry.add(DummyHasLinks(links=[link]))
+            async with project:
+                await load(project)
+
+            assert link.label.localize(DEFAULT_LOCALIZER) == link_page_title
+            m_fetch.assert_not_called()
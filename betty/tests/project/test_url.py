@@ -13,6 +13,10 @@ from betty.project import Project
 from betty.project.config import LocaleConfiguration
 from betty.project.url import StaticUrlGenerator, LocalizedUrlGenerator
 from betty.test_utils.model import DummyEntity
+from betty.url import (
+    LocalizedUrlGenerator as StdLocalizedUrlGenerator,
+    UnsupportedResource,
+)
 
 
 class TestLocalizedUrlGenerator:
@@ -167,6 +171,57 @@ class TestLocalizedUrlGenerator:
                     == expected
                 )
 
+    async def test_generate_should_memoize_entity_urls(
+        self, mocker: MockerFixture
+    ) -> None:
+        upstream = mocker.Mock(spec=StdLocalizedUrlGenerator)
+        upstream.supports.return_value = True
+        upstream.generate.return_value = "/dummy-entity/my-first-entity/index.html"
+        sut = LocalizedUrlGenerator(upstream)
+        entity = DummyEntity(id="my-first-entity")
+        for _ in range(2):
+            assert (
+                sut.generate(entity, HTML) == "/dummy-entity/my-first-entity/index.html"
+            )
+        upstream.supports.assert_called_once()
+        upstream.generate.assert_called_once()
+
+    async def test_generate_without_memoization(self, mocker: MockerFixture) -> None:
+        upstream = mocker.Mock(spec=StdLocalizedUrlGenerator)
+        upstream.supports.return_value = True
+        upstream.generate.return_value = "/dummy-entity/my-first-entity/index.html"
+        sut = LocalizedUrlGenerator(upstream, entity_url_memo_size=0)
+        entity = DummyEntity(id="my-first-entity")
+        for _ in range(2):
+            sut.generate(entity, HTML)
+        # Upstreams are still looked up by resource type.
+        upstream.supports.assert_called_once()
+        assert upstream.generate.call_count == 2
+
+    async def test_generate_should_dispatch_entity_types_and_entities_separately(
+        self, new_temporary_app: App, mocker: MockerFixture
+    ) -> None:
+        mocker.patch(
+            "betty.model.ENTITY_TYPE_REPOSITORY",
+            new=StaticPluginRepository(DummyEntity),
+        )
+        async with Project.new_temporary(new_temporary_app) as project, project:
+            sut = await LocalizedUrlGenerator.new_for_project(project)
+            assert sut.generate(DummyEntity, HTML) == "/dummy-entity/index.html"
+            assert (
+                sut.generate(DummyEntity(id="my-first-entity"), HTML)
+                == "/dummy-entity/my-first-entity/index.html"
+            )
+
+    async def test_generate_with_unsupported_resource(
+        self, mocker: MockerFixture
+    ) -> None:
+        upstream = mocker.Mock(spec=StdLocalizedUrlGenerator)
+        upstream.supports.return_value = False
+        sut = LocalizedUrlGenerator(upstream)
+        with pytest.raises(UnsupportedResource):
+            sut.generate(DummyEntity(), HTML)
+
 
 class TestStaticUrlGenerator:
     @pytest.mark.parametrize(
@@ -6,7 +6,13 @@ from asyncio import create_task, sleep, wait_for, gather
 import pytest
 from typing_extensions import override
 
-from betty.concurrent import RateLimiter, asynchronize_acquire, AsynchronizedLock, Lock
+from betty.concurrent import (
+    RateLimiter,
+    asynchronize_acquire,
+    AsynchronizedLock,
+    Lock,
+    Ledger,
+)
 
 
 class _LockTestDummyLock(Lock):
@@ -83,6 +89,51 @@ class TestAsynchronizedLock:
         assert not await sut.acquire(wait=False)
         lock.release()
 
+    async def test_release(self) -> None:
+        sut = AsynchronizedLock.threading()
+        await sut.acquire()
+        task = create_task(sut.acquire())
+        await sleep(0)
+        await sut.release()
+        assert await wait_for(task, 1)
+
+    async def test_release_should_wake_waiters_one_at_a_time(self) -> None:
+        sut = AsynchronizedLock.threading()
+        await sut.acquire()
+        acquired = []
+
+        async def _acquire(index: int) -> None:
+            await sut.acquire()
+            acquired.append(index)
+
+        tasks = [create_task(_acquire(index)) for index in range(3)]
+        await sleep(0)
+        for expected in ([0], [0, 1], [0, 1, 2]):
+            await sut.release()
+            await sleep(0.01)
+            assert acquired == expected
+        await gather(*tasks)
+
+    async def test_release_from_another_thread(self) -> None:
+        sut = AsynchronizedLock.threading()
+        await sut.acquire()
+        task = create_task(sut.acquire())
+        await sleep(0)
+        thread = threading.Thread(target=asyncio.run, args=(sut.release(),))
+        thread.start()
+        thread.join()
+        assert await wait_for(task, 1)
+
+    async def test_release_with_cancelled_waiter(self) -> None:
+        sut = AsynchronizedLock.threading()
+        await sut.acquire()
+        cancelled_task = create_task(sut.acquire())
+        task = create_task(sut.acquire())
+        await sleep(0)
+        await sut.release()
+        cancelled_task.cancel()
+        assert await wait_for(task, 1)
+
 
 class TestRateLimiter:
     @pytest.mark.parametrize(
@@ -105,3 +156,66 @@ class TestRateLimiter:
         end = time.time()
         duration = end - start
         assert expected == round(duration)
+
+
+class TestLedger:
+    async def test_ledger(self) -> None:
+        sut = Ledger(AsynchronizedLock.threading())
+        transaction = sut.ledger("transaction")
+        assert await transaction.acquire()
+        assert not await sut.ledger("transaction").acquire(wait=False)
+        assert await sut.ledger("other-transaction").acquire(wait=False)
+        task = create_task(sut.ledger("transaction").acquire())
+        await sleep(0)
+        assert not task.done()
+        await transaction.release()
+        assert await wait_for(task, 1)
+
+    async def test_ledger_many(self) -> None:
+        sut = Ledger(AsynchronizedLock.threading())
+        transaction = sut.ledger_many(["transaction", "other-transaction"])
+        assert await transaction.acquire()
+        assert not await sut.ledger("transaction").acquire(wait=False)
+        assert not await sut.ledger("other-transaction").acquire(wait=False)
+        assert await sut.ledger("another-transaction").acquire(wait=False)
+        await transaction.release()
+        assert await sut.ledger("other-transaction").acquire(wait=False)
+
+    async def test_ledger_many_should_acquire_all_or_nothing(self) -> None:
+        sut = Ledger(AsynchronizedLock.threading())
+        transaction = sut.ledger("other-transaction")
+        assert await transaction.acquire()
+        assert not await sut.ledger_many(["transaction", "other-transaction"]).acquire(
+            wait=False
+        )
+        # The transaction that was free must not have been acquired.
+        assert await sut.ledger("transaction").acquire(wait=False)
+
+    async def test_ledger_many_should_wait_for_all(self) -> None:
+        sut = Ledger(AsynchronizedLock.threading())
+        transaction = sut.ledger("transaction")
+        other_transaction = sut.ledger("other-transaction")
+        assert await transaction.acquire()
+        assert await other_transaction.acquire()
+        task = create_task(
+            sut.ledger_many(["transaction", "other-transaction"]).acquire()
+        )
+        await sleep(0)
+        await transaction.release()
+        await sleep(0)
+        assert not task.done()
+        await other_transaction.release()
+        assert await wait_for(task, 1)
+
+    async def test_ledger_should_forget_released_transactions(self) -> None:
+        sut = Ledger(AsynchronizedLock.threading())
+        transaction = sut.ledger("transaction")
+        assert await transaction.acquire()
+        other_transaction = sut.ledger("transaction")
+        task = create_task(other_transaction.acquire())
+        await sleep(0)
+        await transaction.release()
+        assert await wait_for(task, 1)
+        await other_transaction.release()
+        assert not sut._ledger
+        assert not sut._waiters
@@ -836,3 +836,38 @@ class TestDeriver:
 
         assert len(added) == 0
         assert [*person.presences] == [presence]
+
+    async def test_derive_multiple_people_and_event_types(self) -> None:
+        before_person = Person(id="P0")
+        Presence(
+            before_person,
+            Subject(),
+            Event(event_type=ComesBeforeReference(), date=Date(1970, 1, 1)),
+        )
+        after_person = Person(id="P1")
+        Presence(
+            after_person,
+            Subject(),
+            Event(event_type=ComesAfterReference(), date=Date(1970, 1, 1)),
+        )
+        ancestry = await Ancestry.new()
+        ancestry.add(before_person, after_person)
+
+        await Deriver(
+            ancestry,
+            DEFAULT_LIFETIME_THRESHOLD,
+            self._EVENT_TYPE_REPOSITORY,
+            {ComesBeforeCreatableDerivable, ComesAfterCreatableDerivable},
+            localizer=DEFAULT_LOCALIZER,
+        ).derive()
+
+        assert [
+            presence.event.date
+            for presence in before_person.presences
+            if isinstance(presence.event.event_type, ComesBeforeCreatableDerivable)
+        ] == [DateRange(None, Date(1970, 1, 1), end_is_boundary=True)]
+        assert [
+            presence.event.date
+            for presence in after_person.presences
+            if isinstance(presence.event.event_type, ComesAfterCreatableDerivable)
+        ] == [DateRange(Date(1970, 1, 1), start_is_boundary=True)]
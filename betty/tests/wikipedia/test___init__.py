@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from asyncio import gather
 from json import dumps
 from pathlib import Path
 from typing import Any, TYPE_CHECKING
@@ -36,6 +37,9 @@ if TYPE_CHECKING:
     from pytest_mock import MockerFixture
 
 
+_PAGE_QUERY_API_PARAMETERS = "&prop=langlinks|pageimages|coordinates&lllimit=max&piprop=name&pilicense=free&pilimit=max&coprimary=primary&colimit=max&format=json&formatversion=2"
+
+
 def _new_json_fetch_response(json_data: Any) -> FetchResponse:
     return FetchResponse(CIMultiDict(), dumps(json_data).encode("utf-8"), "utf-8")
 
@@ -150,7 +154,7 @@ class TestRetriever:
         mocker.patch("sys.stderr")
         page_language = "en"
         page_name = "Amsterdam & Omstreken"
-        fetch_url = "https://en.wikipedia.org/w/api.php?action=query&titles=Amsterdam%20%26%20Omstreken&prop=langlinks|pageimages|coordinates&lllimit=500&piprop=name&pilicense=free&pilimit=1&coprimary=primary&format=json&formatversion=2"
+        fetch_url = "https://en.wikipedia.org/w/api.php?action=query&titles=Amsterdam%20%26%20Omstreken&prop=langlinks|pageimages|coordinates&lllimit=max&piprop=name&pilicense=free&pilimit=max&coprimary=primary&colimit=max&format=json&formatversion=2"
         fetcher = StaticFetcher(
             fetch_map={fetch_url: _new_json_fetch_response(fetch_json)}
         )
@@ -159,6 +163,190 @@ class TestRetriever:
         )
         assert expected == translations
 
+    async def test_get_translations_should_batch_concurrent_pages(
+        self,
+        mocker: MockerFixture,
+        binary_file_cache: BinaryFileCache,
+    ) -> None:
+        mocker.patch("sys.stderr")
+        fetch_url = f"https://en.wikipedia.org/w/api.php?action=query&titles=Amsterdam|amsterdam%20%26%20Omstreken{_PAGE_QUERY_API_PARAMETERS}"
+        fetcher = StaticFetcher(
+            fetch_map={
+                fetch_url: _new_json_fetch_response(
+                    {
+                        "query": {
+                            "normalized": [
+                                {
+                                    "from": "amsterdam & Omstreken",
+                                    "to": "Amsterdam & Omstreken",
+                                },
+                            ],
+                            "pages": [
+                                {
+                                    "title": "Amsterdam",
+                                    "langlinks": [
+                                        {"lang": "nl", "title": "Amsterdam"},
+                                    ],
+                                },
+                                {
+                                    "title": "Amsterdam & Omstreken",
+                                    "langlinks": [
+                                        {
+                                            "lang": "nl",
+                                            "title": "Amsterdam & Omstreken",
+                                        },
+                                    ],
+                                },
+                            ],
+                        },
+                    }
+                )
+            }
+        )
+        sut = _Retriever(fetcher)
+        translations, other_translations = await gather(
+            sut.get_translations("en", "amsterdam & Omstreken"),
+            sut.get_translations("en", "Amsterdam"),
+        )
+        assert translations == {"nl": "Amsterdam & Omstreken"}
+        assert other_translations == {"nl": "Amsterdam"}
+
+    async def test_get_translations_should_follow_continuations(
+        self,
+        mocker: MockerFixture,
+        binary_file_cache: BinaryFileCache,
+    ) -> None:
+        mocker.patch("sys.stderr")
+        fetch_url = f"https://en.wikipedia.org/w/api.php?action=query&titles=Amsterdam{_PAGE_QUERY_API_PARAMETERS}"
+        fetcher = StaticFetcher(
+            fetch_map={
+                fetch_url: _new_json_fetch_response(
+                    {
+                        "continue": {"llcontinue": "123|nl", "continue": "||"},
+                        "query": {
+                            "pages": [
+                                {
+                                    "title": "Amsterdam",
+                                    "langlinks": [
+                                        {"lang": "de", "title": "Amsterdam"},
+                                    ],
+                                },
+                            ],
+                        },
+                    }
+                ),
+                f"{fetch_url}&llcontinue=123%7Cnl&continue=%7C%7C": _new_json_fetch_response(
+                    {
+                        "query": {
+                            "pages": [
+                                {
+                                    "title": "Amsterdam",
+                                    "langlinks": [
+                                        {"lang": "nl", "title": "Amsterdam"},
+                                    ],
+                                },
+                            ],
+                        },
+                    }
+                ),
+            }
+        )
+        actual = await _Retriever(fetcher).get_translations("en", "Amsterdam")
+        assert actual == {"de": "Amsterdam", "nl": "Amsterdam"}
+
+    async def test_prefetch_pages(
+        self,
+        mocker: MockerFixture,
+        binary_file_cache: BinaryFileCache,
+    ) -> None:
+        mocker.patch("sys.stderr")
+        fetch_url = f"https://en.wikipedia.org/w/api.php?action=query&titles=Amsterdam|Utrecht{_PAGE_QUERY_API_PARAMETERS}"
+        fetch_map = {
+            fetch_url: _new_json_fetch_response(
+                {
+                    "query": {
+                        "pages": [
+                            {
+                                "title": "Amsterdam",
+                                "coordinates": [
+                                    {"lat": 52.37, "lon": 4.89, "globe": "earth"}
+                                ],
+                            },
+                            {
+                                "title": "Utrecht",
+                                "coordinates": [
+                                    {"lat": 52.09, "lon": 5.12, "globe": "earth"}
+                                ],
+                            },
+                        ],
+                    },
+                }
+            )
+        }
+        sut = _Retriever(StaticFetcher(fetch_map=fetch_map))
+        await sut.prefetch_pages([("en", "Utrecht"), ("en", "Amsterdam")])
+        # Prefetched pages must not be fetched again.
+        fetch_map.clear()
+        assert await sut.get_place_coordinates("en", "Utrecht") == Point(52.09, 5.12)
+        assert await sut.get_place_coordinates("en", "Amsterdam") == Point(52.37, 4.89)
+
+    async def test_get_translations_should_not_rate_limit_cached_responses(
+        self,
+        mocker: MockerFixture,
+        binary_file_cache: BinaryFileCache,
+    ) -> None:
+        mocker.patch("sys.stderr")
+        fetch_url = f"https://en.wikipedia.org/w/api.php?action=query&titles=Amsterdam{_PAGE_QUERY_API_PARAMETERS}"
+        response = _new_json_fetch_response(
+            {
+                "query": {
+                    "pages": [
+                        {
+                            "langlinks": [
+                                {"lang": "nl", "title": "Amsterdam"},
+                            ],
+                        },
+                    ],
+                },
+            }
+        )
+        fetcher = StaticFetcher()
+        m_fetch_cached = mocker.patch.object(
+            fetcher, "fetch_cached", return_value=response
+        )
+        sut = _Retriever(fetcher)
+        m_rate_limiter = mocker.patch.object(sut, "_rate_limiter")
+        actual = await sut.get_translations("en", "Amsterdam")
+        assert actual == {"nl": "Amsterdam"}
+        m_fetch_cached.assert_awaited_once_with(fetch_url)
+        m_rate_limiter.__aenter__.assert_not_called()
+
+    async def test_get_translations_should_retry_failed_pages(
+        self,
+        mocker: MockerFixture,
+        binary_file_cache: BinaryFileCache,
+    ) -> None:
+        mocker.patch("sys.stderr")
+        response = _new_json_fetch_response(
+            {
+                "query": {
+                    "pages": [
+                        {
+                            "langlinks": [
+                                {"lang": "nl", "title": "Amsterdam"},
+                            ],
+                        },
+                    ],
+                },
+            }
+        )
+        fetcher = StaticFetcher()
+        mocker.patch.object(fetcher, "fetch_cached", side_effect=[OSError(), response])
+        sut = _Retriever(fetcher)
+        with pytest.raises(OSError):  # noqa PT011
+            await sut.get_translations("en", "Amsterdam")
+        assert await sut.get_translations("en", "Amsterdam") == {"nl": "Amsterdam"}
+
     async def test_get_translations_with_invalid_json_response_should_return_none(
         self,
         mocker: MockerFixture,
@@ -167,7 +355,7 @@ class TestRetriever:
         mocker.patch("sys.stderr")
         page_language = "en"
         page_name = "Amsterdam & Omstreken"
-        fetch_url = "https://en.wikipedia.org/w/api.php?action=query&titles=Amsterdam%20%26%20Omstreken&prop=langlinks&lllimit=500&format=json&formatversion=2"
+        fetch_url = "https://en.wikipedia.org/w/api.php?action=query&titles=Amsterdam%20%26%20Omstreken&prop=langlinks|pageimages|coordinates&lllimit=max&piprop=name&pilicense=free&pilimit=max&coprimary=primary&colimit=max&format=json&formatversion=2"
         fetcher = StaticFetcher(
             fetch_map={
                 fetch_url: FetchResponse(
@@ -198,7 +386,7 @@ class TestRetriever:
         mocker.patch("sys.stderr")
         page_language = "en"
         page_name = "Amsterdam & Omstreken"
-        fetch_url = "https://en.wikipedia.org/w/api.php?action=query&titles=Amsterdam%20%26%20Omstrekens&prop=langlinks&lllimit=500&format=json&formatversion=2"
+        fetch_url = "https://en.wikipedia.org/w/api.php?action=query&titles=Amsterdam%20%26%20Omstreken&prop=langlinks|pageimages|coordinates&lllimit=max&piprop=name&pilicense=free&pilimit=max&coprimary=primary&colimit=max&format=json&formatversion=2"
         fetcher = StaticFetcher(
             fetch_map={fetch_url: _new_json_fetch_response(response_json)}
         )
@@ -424,7 +612,7 @@ class TestRetriever:
         mocker.patch("sys.stderr")
         page_language = "en"
         page_name = "Amsterdam & Omstreken"
-        fetch_url = "https://en.wikipedia.org/w/api.php?action=query&titles=Amsterdam%20%26%20Omstreken&prop=langlinks|pageimages|coordinates&lllimit=500&piprop=name&pilicense=free&pilimit=1&coprimary=primary&format=json&formatversion=2"
+        fetch_url = "https://en.wikipedia.org/w/api.php?action=query&titles=Amsterdam%20%26%20Omstreken&prop=langlinks|pageimages|coordinates&lllimit=max&piprop=name&pilicense=free&pilimit=max&coprimary=primary&colimit=max&format=json&formatversion=2"
         fetcher = StaticFetcher(
             fetch_map={fetch_url: _new_json_fetch_response(fetch_json)}
         )
@@ -574,7 +762,7 @@ class TestRetriever:
 
         page_language = "en"
         page_name = "Amsterdam & Omstreken"
-        page_fetch_url = "https://en.wikipedia.org/w/api.php?action=query&titles=Amsterdam%20%26%20Omstreken&prop=langlinks|pageimages|coordinates&lllimit=500&piprop=name&pilicense=free&pilimit=1&coprimary=primary&format=json&formatversion=2"
+        page_fetch_url = "https://en.wikipedia.org/w/api.php?action=query&titles=Amsterdam%20%26%20Omstreken&prop=langlinks|pageimages|coordinates&lllimit=max&piprop=name&pilicense=free&pilimit=max&coprimary=primary&colimit=max&format=json&formatversion=2"
         file_fetch_url = "https://en.wikipedia.org/w/api.php?action=query&prop=imageinfo&titles=File:Amsterdam%20%26%20Omstreken&iiprop=url|mime|canonicaltitle&format=json&formatversion=2"
 
         fetch_map = {page_fetch_url: _new_json_fetch_response(page_fetch_json)}
@@ -754,7 +942,9 @@ class TestPopulator:
     async def test_populate_should_ignore_resource_without_link_support(
         self, mocker: MockerFixture, tmp_path: Path
     ) -> None:
-        m_retriever = mocker.patch("betty.wikipedia._Retriever")
+        m_retriever = mocker.patch(
+            "betty.wikipedia._Retriever", spec=_Retriever, new_callable=AsyncMock
+        )
         source = Source("The Source")
         resource = Citation(
             id="the_citation",
@@ -773,7 +963,9 @@ class TestPopulator:
     async def test_populate_should_ignore_resource_without_links(
         self, mocker: MockerFixture, tmp_path: Path
     ) -> None:
-        m_retriever = mocker.patch("betty.wikipedia._Retriever")
+        m_retriever = mocker.patch(
+            "betty.wikipedia._Retriever", spec=_Retriever, new_callable=AsyncMock
+        )
         resource = Source(
             id="the_source",
             name="The Source",
@@ -792,7 +984,9 @@ class TestPopulator:
     async def test_populate_should_ignore_non_wikipedia_links(
         self, mocker: MockerFixture, tmp_path: Path
     ) -> None:
-        m_retriever = mocker.patch("betty.wikipedia._Retriever")
+        m_retriever = mocker.patch(
+            "betty.wikipedia._Retriever", spec=_Retriever, new_callable=AsyncMock
+        )
         link = Link("https://example.com")
         resource = Source(
             id="the_source",
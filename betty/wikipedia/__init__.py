@@ -6,7 +6,7 @@ from __future__ import annotations
 
 import logging
 import re
-from asyncio import gather
+from asyncio import gather, get_running_loop, create_task, sleep, CancelledError
 from collections import defaultdict
 from collections.abc import Mapping
 from contextlib import suppress, contextmanager
@@ -14,7 +14,7 @@ from dataclasses import dataclass
 from json import JSONDecodeError
 from pathlib import Path
 from typing import cast, Any, TYPE_CHECKING, final
-from urllib.parse import quote, urlparse
+from urllib.parse import quote, urlparse, urlencode
 
 from geopy import Point
 
@@ -42,8 +42,15 @@ from betty.wikipedia.copyright_notice import WikipediaContributors
 if TYPE_CHECKING:
     from betty.ancestry import Ancestry
     from betty.locale.localizer import LocalizerRepository
-    from betty.fetch import Fetcher
-    from collections.abc import Sequence, MutableSequence, MutableMapping, Iterator
+    from betty.fetch import Fetcher, FetchResponse
+    from asyncio import Future, Task
+    from collections.abc import (
+        Sequence,
+        MutableSequence,
+        MutableMapping,
+        Iterator,
+        Iterable,
+    )
 
 
 class NotAPageError(ValueError):
@@ -101,6 +108,9 @@ class Image:
 class _Retriever:
     _WIKIPEDIA_RATE_LIMIT = 200
 
+    # The maximum number of titles the MediaWiki query API accepts per request.
+    _QUERY_API_TITLES_LIMIT = 50
+
     def __init__(
         self,
         fetcher: Fetcher,
@@ -108,6 +118,9 @@ class _Retriever:
         self._fetcher = fetcher
         self._images: MutableMapping[str, Image | None] = {}
         self._rate_limiter = RateLimiter(self._WIKIPEDIA_RATE_LIMIT)
+        self._pages: MutableMapping[tuple[str, str], Future[Mapping[str, Any]]] = {}
+        self._pending_pages: MutableMapping[str, list[str]] = defaultdict(list)
+        self._page_batches: MutableMapping[str, Task[None]] = {}
 
     @contextmanager
     def _catch_exceptions(self) -> Iterator[None]:
@@ -116,9 +129,23 @@ class _Retriever:
         except FetchError as error:
             logging.getLogger(__name__).warning(str(error))
 
+    async def _fetch(self, url: str) -> FetchResponse:
+        # Cached responses require no network requests, and therefore need not be rate-limited.
+        response = await self._fetcher.fetch_cached(url)
+        if response is None:
+            async with self._rate_limiter:
+                response = await self._fetcher.fetch(url)
+        return response
+
+    async def _fetch_file(self, url: str) -> Path:
+        file_path = await self._fetcher.fetch_file_cached(url)
+        if file_path is None:
+            async with self._rate_limiter:
+                file_path = await self._fetcher.fetch_file(url)
+        return file_path
+
     async def _fetch_json(self, url: str, *selectors: str | int) -> Any:
-        async with self._rate_limiter:
-            response = await self._fetcher.fetch(url)
+        response = await self._fetch(url)
         try:
             data = response.json
         except JSONDecodeError as error:
@@ -140,13 +167,141 @@ class _Retriever:
     async def _get_query_api_data(self, url: str) -> Mapping[str, Any]:
         return cast(Mapping[str, Any], await self._fetch_json(url, "query", "pages", 0))
 
+    async def prefetch_pages(self, pages: Iterable[tuple[str, str]]) -> None:
+        """
+        Fetch the query API data for many pages at once.
+
+        Requesting all pages at the same time lets them be fetched in as few, and as predictable batches as possible,
+        which helps the batch responses to be cached.
+        """
+        await gather(
+            *(
+                self._get_page_query_api_data(page_language, page_name)
+                for page_language, page_name in pages
+            ),
+            return_exceptions=True,
+        )
+
     async def _get_page_query_api_data(
         self, page_language: str, page_name: str
     ) -> Mapping[str, Any]:
-        return await self._get_query_api_data(
-            f"https://{page_language}.wikipedia.org/w/api.php?action=query&titles={quote(page_name)}&prop=langlinks|pageimages|coordinates&lllimit=500&piprop=name&pilicense=free&pilimit=1&coprimary=primary&format=json&formatversion=2"
+        # Pages requested concurrently are coalesced into batches per language.
+        try:
+            page = self._pages[(page_language, page_name)]
+        except KeyError:
+            page = self._pages[(page_language, page_name)] = (
+                get_running_loop().create_future()
+            )
+            self._pending_pages[page_language].append(page_name)
+            if page_language not in self._page_batches:
+                self._page_batches[page_language] = create_task(
+                    self._fetch_page_batches(page_language)
+                )
+        return await page
+
+    async def _fetch_page_batches(self, page_language: str) -> None:
+        # Give other concurrent lookups the chance to join the batches.
+        try:
+            await sleep(0)
+        except BaseException as error:
+            self._fail_pages(
+                page_language, self._take_pending_pages(page_language), error
+            )
+            raise
+        page_names = self._take_pending_pages(page_language)
+        await gather(
+            *(
+                self._fetch_page_batch(
+                    page_language,
+                    page_names[offset : offset + self._QUERY_API_TITLES_LIMIT],
+                )
+                for offset in range(0, len(page_names), self._QUERY_API_TITLES_LIMIT)
+            )
         )
 
+    async def _fetch_page_batch(
+        self, page_language: str, page_names: Sequence[str]
+    ) -> None:
+        try:
+            pages = dict(
+                zip(
+                    page_names,
+                    await self._fetch_page_batch_data(page_language, page_names),
+                    strict=True,
+                )
+            )
+        except BaseException as error:
+            self._fail_pages(page_language, page_names, error)
+            # The pages' lookups raise their errors, so only propagate cancellations and the like.
+            if not isinstance(error, Exception):
+                raise
+        else:
+            for page_name, page_data in pages.items():
+                self._pages[(page_language, page_name)].set_result(page_data)
+
+    def _take_pending_pages(self, page_language: str) -> Sequence[str]:
+        del self._page_batches[page_language]
+        return sorted(self._pending_pages.pop(page_language))
+
+    def _fail_pages(
+        self, page_language: str, page_names: Iterable[str], error: BaseException
+    ) -> None:
+        # Forget failed pages, so later lookups retry them.
+        for page_name in page_names:
+            page = self._pages.pop((page_language, page_name))
+            if isinstance(error, CancelledError):
+                page.cancel()
+            else:
+                page.set_exception(error)
+
+    async def _fetch_page_batch_data(
+        self, page_language: str, page_names: Sequence[str]
+    ) -> Sequence[Mapping[str, Any]]:
+        titles = "|".join(quote(page_name) for page_name in page_names)
+        url = f"https://{page_language}.wikipedia.org/w/api.php?action=query&titles={titles}&prop=langlinks|pageimages|coordinates&lllimit=max&piprop=name&pilicense=free&pilimit=max&coprimary=primary&colimit=max&format=json&formatversion=2"
+        pages: MutableMapping[str | int, MutableMapping[str, Any]] = {}
+        normalized_titles: MutableMapping[str, str] = {}
+        continue_url = url
+        while True:
+            data = await self._fetch_json(continue_url)
+            try:
+                query_data = data["query"]
+                for normalized_title in query_data.get("normalized", ()):
+                    normalized_titles[normalized_title["from"]] = normalized_title["to"]
+                for index, page_data in enumerate(query_data["pages"]):
+                    # Data for the same page may be spread over several continued responses.
+                    page = pages.setdefault(page_data.get("title", index), {})
+                    for key, value in page_data.items():
+                        if isinstance(value, list) and key in page:
+                            page[key] = [*page[key], *value]
+                        else:
+                            page.setdefault(key, value)
+                continue_data = data.get("continue")
+            except (LookupError, TypeError, AttributeError) as error:
+                raise FetchError(
+                    plain(
+                        f"Could not successfully parse the JSON format returned by {continue_url}: {error}"
+                    )
+                ) from error
+            if not continue_data:
+                break
+            continue_url = f"{url}&{urlencode(continue_data)}"
+
+        if len(page_names) == 1:
+            try:
+                return [next(iter(pages.values()))]
+            except StopIteration:
+                raise FetchError(plain(f"No page data returned by {url}.")) from None
+        try:
+            return [
+                pages[normalized_titles.get(page_name, page_name)]
+                for page_name in page_names
+            ]
+        except LookupError as error:
+            raise FetchError(
+                plain(f"No page data returned by {url} for {error}.")
+            ) from error
+
     async def get_translations(
         self, page_language: str, page_name: str
     ) -> Mapping[str, str]:
@@ -211,8 +366,7 @@ class _Retriever:
                         f"Could not successfully parse the JSON content returned by {url}: {error}"
                     )
                 ) from error
-            async with self._rate_limiter:
-                image_path = await self._fetcher.fetch_file(image_info["url"])
+            image_path = await self._fetch_file(image_info["url"])
             image = Image(
                 image_path,
                 MediaType(image_info["mime"]),
@@ -264,6 +418,7 @@ class _Populator:
         )
 
     async def populate(self) -> None:
+        await self._retriever.prefetch_pages(set(self._get_pages()))
         await gather(
             *(
                 self._populate_entity(entity, self._locales)
@@ -272,6 +427,13 @@ class _Populator:
             )
         )
 
+    def _get_pages(self) -> Iterator[tuple[str, str]]:
+        for entity in self._ancestry:
+            if isinstance(entity, HasLinks):
+                for link in entity.links:
+                    with suppress(NotAPageError):
+                        yield _parse_url(link.url)
+
     async def _populate_entity(self, entity: HasLinks, locales: Sequence[str]) -> None:
         populations = [self._populate_has_links(entity, locales)]
         if isinstance(entity, HasFileReferences):